@@ -0,0 +1,42 @@
+# benchmarks/_entorno.py
+"""
+Utilidades comunes para los scripts de benchmark.
+Los scripts se ejecutan desde la raíz del proyecto:
+
+    python -m benchmarks.bench_busqueda --help
+"""
+import os
+import statistics
+import time
+
+import django
+
+from utilidad.metricas import percentil
+
+
+def configurar_django():
+    """Inicializa Django usando DJANGO_SETTINGS_MODULE (por defecto obstetric_care.settings)"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'obstetric_care.settings')
+    django.setup()
+
+
+def medir(funcion, repeticiones):
+    """Ejecuta `funcion` n veces y retorna la lista de latencias en milisegundos"""
+    latencias = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return latencias
+
+
+def resumen(nombre, latencias):
+    """Línea de resumen con p50/p95/p99/max en milisegundos"""
+    return (
+        f"{nombre:<30} n={len(latencias):<6} "
+        f"p50={percentil(latencias, 50):7.2f}ms "
+        f"p95={percentil(latencias, 95):7.2f}ms "
+        f"p99={percentil(latencias, 99):7.2f}ms "
+        f"max={max(latencias):7.2f}ms "
+        f"media={statistics.fmean(latencias):7.2f}ms"
+    )
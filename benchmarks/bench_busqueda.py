@@ -0,0 +1,94 @@
+# benchmarks/bench_busqueda.py
+"""
+Benchmark del motor de búsqueda de pacientes (gestionApp.busqueda).
+
+Uso:
+    python -m benchmarks.bench_busqueda --sembrar 500000
+    python -m benchmarks.bench_busqueda --consultas 500 --limite-p95 10
+
+--sembrar inserta personas/pacientes sintéticos (RUT desde 30.000.000 en adelante)
+usando bulk_create, para no interferir con datos reales.
+"""
+import argparse
+import random
+import sys
+from datetime import date
+
+from benchmarks._entorno import configurar_django, medir, percentil, resumen
+
+configurar_django()
+
+from django.db import transaction  # noqa: E402
+from gestionApp.models import Persona, Paciente, PersonaToken  # noqa: E402
+from gestionApp.busqueda import buscar_pacientes, compactar_rut, construir_tokens  # noqa: E402
+from utilidad.rut_validator import calcular_dv  # noqa: E402
+
+RUT_BASE = 30_000_000
+NOMBRES = ['Ana', 'María', 'Carolina', 'Daniela', 'Valentina', 'Javiera', 'Constanza',
+           'Camila', 'Fernanda', 'Catalina', 'Josefa', 'Antonia', 'Francisca', 'Isidora']
+APELLIDOS = ['González', 'Muñoz', 'Rojas', 'Díaz', 'Pérez', 'Soto', 'Contreras', 'Silva',
+             'Martínez', 'Sepúlveda', 'Morales', 'Rodríguez', 'López', 'Fuentes', 'Hernández',
+             'Torres', 'Araya', 'Flores', 'Espinoza', 'Valenzuela', 'Castillo', 'Tapia']
+
+
+def sembrar(cantidad, lote=5000):
+    rng = random.Random(42)
+    inicio = Persona.objects.filter(Rut__regex=r'^3[0-9]{7}-').count()
+    for desde in range(inicio, cantidad, lote):
+        personas = []
+        for i in range(desde, min(desde + lote, cantidad)):
+            cuerpo = str(RUT_BASE + i)
+            rut = f"{cuerpo}-{calcular_dv(cuerpo)}"
+            personas.append(Persona(
+                Rut=rut,
+                Rut_busqueda=compactar_rut(rut),
+                Nombre=rng.choice(NOMBRES),
+                Apellido_Paterno=rng.choice(APELLIDOS),
+                Apellido_Materno=rng.choice(APELLIDOS),
+                Fecha_nacimiento=date(1985 + rng.randint(0, 20), rng.randint(1, 12), rng.randint(1, 28)),
+                Sexo='Femenino',
+            ))
+        with transaction.atomic():
+            personas = Persona.objects.bulk_create(personas, batch_size=lote)
+            PersonaToken.objects.bulk_create(construir_tokens(personas), batch_size=lote)
+            Paciente.objects.bulk_create(
+                [Paciente(persona=p, Estado_civil='SOLTERA', Previcion='FONASA_A') for p in personas],
+                batch_size=lote,
+            )
+        print(f"  sembradas {min(desde + lote, cantidad)} / {cantidad}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sembrar', type=int, default=0, help='Cantidad total de personas sintéticas a asegurar')
+    parser.add_argument('--consultas', type=int, default=200, help='Consultas por escenario')
+    parser.add_argument('--limite-p95', type=float, default=None, help='Falla (exit 1) si algún p95 supera este valor en ms')
+    args = parser.parse_args(argv)
+
+    if args.sembrar:
+        sembrar(args.sembrar)
+
+    total = Persona.objects.count()
+    rng = random.Random(7)
+    print(f"\nPersonas en BD: {total}")
+
+    escenarios = {
+        'rut prefijo (5 dígitos)': lambda: str(RUT_BASE + rng.randint(0, max(total - 1, 0)))[:5],
+        'rut completo': lambda: str(RUT_BASE + rng.randint(0, max(total - 1, 0))),
+        'apellido': lambda: rng.choice(APELLIDOS),
+        'nombre + apellidos': lambda: f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}",
+        'prefijo de nombre (3 letras)': lambda: rng.choice(NOMBRES)[:3],
+    }
+
+    fallo = False
+    for nombre, generar in escenarios.items():
+        latencias = medir(lambda: list(buscar_pacientes(generar(), limite=20)), args.consultas)
+        print(resumen(nombre, latencias))
+        if args.limite_p95 is not None and percentil(latencias, 95) > args.limite_p95:
+            fallo = True
+
+    return 1 if fallo else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+# benchmarks/bench_conexiones.py
+"""
+Benchmark de carga: requests/seg con y sin pool de conexiones MySQL.
+
+Por cada modo (settings.MODO_CONEXION_BD) lanza un subproceso con
+OBSTETRIC_MODO_CONEXION=<modo>; dentro, varios hilos hacen requests con el
+test Client durante --duracion segundos. Al terminar cada request Django
+cierra (o devuelve al pool) las conexiones, igual que en producción.
+
+La URL por defecto (/salud/bd/?sondeo=1) ejecuta un SELECT 1 en default y en
+legacy, así el costo medido es casi solo el de obtener las conexiones.
+
+Uso:
+    python -m benchmarks.bench_conexiones --hilos 16 --duracion 15
+    python -m benchmarks.bench_conexiones --modos pool ninguno --url /matrona/pacientes/
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks._entorno import configurar_django, percentil
+
+
+MODOS = ('pool', 'persistente', 'ninguno')
+
+
+def _medir_modo(url, hilos, duracion):
+    """Corre dentro del subproceso: retorna requests, errores y latencias (ms)"""
+    configurar_django()
+    from django.conf import settings
+    from django.test import Client
+
+    latencias, errores = [], [0]
+    candado = threading.Lock()
+    fin = time.perf_counter() + duracion
+
+    def trabajar():
+        cliente = Client(HTTP_HOST='localhost')
+        propias, fallidas = [], 0
+        while time.perf_counter() < fin:
+            inicio = time.perf_counter()
+            try:
+                ok = cliente.get(url).status_code < 500
+            except Exception:
+                ok = False
+            propias.append((time.perf_counter() - inicio) * 1000)
+            fallidas += not ok
+        with candado:
+            latencias.extend(propias)
+            errores[0] += fallidas
+
+    trabajadores = [threading.Thread(target=trabajar) for _ in range(hilos)]
+    for hilo in trabajadores:
+        hilo.start()
+    for hilo in trabajadores:
+        hilo.join()
+
+    return {
+        'modo': settings.MODO_CONEXION_BD,
+        'motor': settings.DATABASES['default']['ENGINE'],
+        'requests': len(latencias),
+        'errores': errores[0],
+        'rps': len(latencias) / duracion,
+        'p50': percentil(latencias, 50),
+        'p95': percentil(latencias, 95),
+        'p99': percentil(latencias, 99),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modos', nargs='+', choices=MODOS, default=['pool', 'ninguno'])
+    parser.add_argument('--url', default='/salud/bd/?sondeo=1')
+    parser.add_argument('--hilos', type=int, default=8)
+    parser.add_argument('--duracion', type=float, default=10, help='Segundos por modo')
+    parser.add_argument('--_subproceso', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args._subproceso:
+        print(json.dumps(_medir_modo(args.url, args.hilos, args.duracion)))
+        return 0
+
+    resultados = []
+    for modo in args.modos:
+        salida = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_conexiones', '--_subproceso',
+             '--url', args.url, '--hilos', str(args.hilos), '--duracion', str(args.duracion)],
+            env={**os.environ, 'OBSTETRIC_MODO_CONEXION': modo},
+            capture_output=True, text=True, check=True,
+        )
+        resultados.append(json.loads(salida.stdout.strip().splitlines()[-1]))
+
+    if 'mysql' not in resultados[0]['motor']:
+        print(f"⚠️  ENGINE={resultados[0]['motor']}: los modos de conexión solo aplican a MySQL")
+    print(f"url={args.url} hilos={args.hilos} duracion={args.duracion}s")
+    base = resultados[-1]['rps'] or 1
+    for r in resultados:
+        print(
+            f"{r['modo']:<12} {r['rps']:8.1f} req/s  x{r['rps'] / base:4.2f}  "
+            f"p50={r['p50']:7.2f}ms p95={r['p95']:7.2f}ms p99={r['p99']:7.2f}ms  "
+            f"requests={r['requests']} errores={r['errores']}"
+        )
+    return 1 if any(r['errores'] for r in resultados) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# benchmarks/bench_escrituras.py
+"""
+Benchmark de ediciones: consultas y bytes enviados a la BD por cada save()
+con SeguimientoCambiosMixin (utilidad/cambios.py) frente a reescribir la fila.
+
+Para cada escenario se cargan --ediciones registros, se modifica un campo y se
+guarda de dos formas:
+    fila completa   full_clean() (si el modelo validaba en save) + Model.save()
+                    sin update_fields (+ reindexar tokens en Persona), como
+                    antes del seguimiento de cambios
+    solo cambios    save() del modelo (update_fields y validación automáticos)
+
+Todo corre en una transacción que se revierte al final: no modifica los datos.
+
+Uso:
+    python -m benchmarks.bench_escrituras --ediciones 200
+"""
+import argparse
+import statistics
+import sys
+import time
+from contextlib import ExitStack
+
+from benchmarks._entorno import configurar_django
+
+configurar_django()
+
+from django.db import connections, models, transaction  # noqa: E402
+from gestionApp.busqueda import indexar_persona  # noqa: E402
+from gestionApp.models import Persona, Paciente  # noqa: E402
+from matronaApp.models import FichaObstetrica  # noqa: E402
+from partosApp.models import RegistroParto  # noqa: E402
+
+
+class _Revertir(Exception):
+    pass
+
+
+class ContadorEscritura:
+    """execute_wrapper: consultas y bytes (SQL + parámetros) enviados a la BD"""
+
+    def __init__(self):
+        self.consultas = 0
+        self.bytes = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.consultas += 1
+        self.bytes += len(sql.encode()) + sum(len(str(p).encode()) for p in (params or ()))
+        return execute(sql, params, many, context)
+
+
+def _alternar(campo):
+    def editar(objeto):
+        setattr(objeto, campo, not getattr(objeto, campo))
+    return editar
+
+
+def _texto(campo, valor):
+    def editar(objeto):
+        setattr(objeto, campo, f'{valor} {objeto.pk}')
+    return editar
+
+
+ESCENARIOS = [
+    # (nombre, modelo, edición, validaba en save())
+    ('persona: teléfono', Persona, _texto('Telefono', '+56 9'), True),
+    ('persona: nombre (reindexa)', Persona, _texto('Nombre', 'Nombre'), True),
+    ('paciente: acompañante', Paciente, _texto('Acompañante', 'Acompañante'), True),
+    ('ficha: desactivar', FichaObstetrica, _alternar('activa'), False),
+    ('parto: observaciones', RegistroParto, _texto('observaciones', 'Obs.'), False),
+]
+
+
+def _medir(objetos, editar, guardar):
+    contador = ContadorEscritura()
+    latencias = []
+    with ExitStack() as pila:
+        for alias in connections:
+            pila.enter_context(connections[alias].execute_wrapper(contador))
+        for objeto in objetos:
+            editar(objeto)
+            inicio = time.perf_counter()
+            guardar(objeto)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+    n = len(objetos) or 1
+    return contador.consultas / n, contador.bytes / n, statistics.fmean(latencias) if latencias else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ediciones', type=int, default=200, help='Registros editados por escenario')
+    args = parser.parse_args(argv)
+
+    print(f"{'escenario':<28} {'modo':<14} {'consultas':>9} {'bytes':>9} {'ms':>8}")
+    try:
+        with transaction.atomic():
+            for nombre, modelo, editar, validaba in ESCENARIOS:
+                pks = list(modelo.objects.order_by('pk').values_list('pk', flat=True)[:args.ediciones * 2])
+                if len(pks) < 2:
+                    print(f"{nombre:<28} (sin datos: use generar_datos_sinteticos)")
+                    continue
+                mitad = len(pks) // 2
+
+                def fila_completa(objeto, validaba=validaba):
+                    if validaba:
+                        objeto.full_clean()
+                    models.Model.save(objeto)
+                    if isinstance(objeto, Persona):
+                        indexar_persona(objeto)
+
+                modos = [
+                    ('fila completa', pks[:mitad], fila_completa),
+                    ('solo cambios', pks[mitad:], lambda objeto: objeto.save()),
+                ]
+                for modo, grupo, guardar in modos:
+                    objetos = list(modelo.objects.filter(pk__in=grupo))
+                    consultas, bytes_, ms = _medir(objetos, editar, guardar)
+                    print(f"{nombre:<28} {modo:<14} {consultas:9.2f} {bytes_:9.0f} {ms:8.3f}")
+            raise _Revertir
+    except _Revertir:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,422 @@
+# benchmarks/bench_flujos.py
+"""
+Benchmark de carga de los flujos clínicos completos.
+
+Cada hilo simula a una matrona/TENS con su propio test Client (su propia sesión)
+y repite, durante --duracion segundos, flujos elegidos según --mezcla:
+
+    busqueda        búsqueda por apellido (matrona y TENS) + API por RUT
+    ficha           creación de ficha obstétrica
+    parto           asistente de parto, pasos 1 a 6 (misma sesión)
+    signos          TENS: buscar paciente por RUT + registrar signos vitales
+    administracion  TENS: registrar medicamento aplicado desde la ficha
+
+Por flujo informa flujos/s, latencia p50/p95/p99 del flujo completo y consultas
+SQL por flujo (por alias). La línea base se guarda en JSON para comparar corridas:
+falla (exit 1) si el p95 o el throughput empeoran más que --tolerancia (%) o si
+un flujo hace más consultas que en la base.
+
+Corre contra la BD configurada (MySQL, o SQLite como sustituto local; en SQLite
+las escrituras concurrentes se serializan y conviene --hilos 1 para comparar).
+Los datos se pueden sembrar con el generador sintético.
+
+Uso:
+    python -m benchmarks.bench_flujos --sembrar 5000
+    python -m benchmarks.bench_flujos --hilos 8 --duracion 30 --guardar-base base_flujos.json
+    python -m benchmarks.bench_flujos --hilos 8 --duracion 30 --comparar base_flujos.json
+    python -m benchmarks.bench_flujos --mezcla parto=1 --hilos 4
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from datetime import timedelta
+
+from benchmarks._entorno import configurar_django, percentil
+
+
+MEZCLA_DEFECTO = {'busqueda': 40, 'signos': 25, 'administracion': 20, 'ficha': 10, 'parto': 5}
+
+# Vía de la prescripción (MedicamentoFicha) -> vía del tratamiento aplicado (Tratamiento_aplicado)
+VIAS_TRATAMIENTO = {'oral': 'VO', 'endovenosa': 'IV', 'intramuscular': 'IM', 'topica': 'TP'}
+
+
+class FlujoFallido(Exception):
+    """Un paso del flujo respondió con un código inesperado"""
+
+
+# ============================================
+# DATOS DE TRABAJO
+# ============================================
+
+class DatosFlujos:
+    """Pacientes, fichas activas, medicamentos y personal sobre los que se eligen los flujos"""
+
+    def __init__(self):
+        from django.db.models import Count
+        from gestionApp.models import Paciente, Matrona, Tens
+        from matronaApp.models import FichaObstetrica, MedicamentoFicha
+
+        self.pacientes = list(
+            Paciente.objects.filter(activo=True)
+            .values_list('pk', 'persona__Rut', 'persona__Apellido_Paterno')
+        )
+        self.fichas = list(
+            FichaObstetrica.objects.filter(activa=True)
+            .values_list('id', 'paciente__persona__Rut')
+        )
+        self.medicamentos = list(
+            MedicamentoFicha.objects.filter(activo=True, ficha__activa=True)
+            .values_list('id', 'ficha_id', 'nombre_medicamento', 'dosis', 'via_administracion')
+        )
+        self.matronas = list(Matrona.objects.filter(Activo=True).values_list('id', flat=True))
+        self.tens = list(Tens.objects.filter(Activo=True).values_list('id', flat=True))
+        # El registro de signos busca la ficha por RUT: solo pacientes con una única ficha
+        unicas = set(
+            FichaObstetrica.objects.values('paciente_id').annotate(total=Count('id'))
+            .filter(total=1).values_list('paciente_id', flat=True)
+        )
+        fichas_paciente = dict(
+            FichaObstetrica.objects.filter(activa=True, paciente_id__in=unicas)
+            .values_list('paciente__persona__Rut', 'id')
+        )
+        self.fichas_signos = list(fichas_paciente.items())
+
+    def faltantes(self):
+        requeridos = {
+            'pacientes activos': self.pacientes, 'fichas activas': self.fichas,
+            'medicamentos activos': self.medicamentos, 'matronas': self.matronas, 'TENS': self.tens,
+            'pacientes con una sola ficha activa': self.fichas_signos,
+        }
+        return [nombre for nombre, lista in requeridos.items() if not lista]
+
+
+# ============================================
+# FLUJOS
+# ============================================
+
+def _pedir(cliente, metodo, url, datos=None, esperado=(200, 302)):
+    respuesta = getattr(cliente, metodo)(url, datos or {})
+    if respuesta.status_code not in esperado:
+        raise FlujoFallido(f'{metodo.upper()} {url} -> HTTP {respuesta.status_code}')
+    return respuesta
+
+
+def flujo_busqueda(cliente, datos, rnd):
+    from django.urls import reverse
+
+    _, rut, apellido = rnd.choice(datos.pacientes)
+    _pedir(cliente, 'get', reverse('matrona:buscar_paciente'), {'q': apellido[:4]}, esperado=(200,))
+    _pedir(cliente, 'get', reverse('tens:buscar_paciente'), {'q': rut[:5]}, esperado=(200,))
+    _pedir(cliente, 'get', reverse('tens:api_buscar_paciente'), {'rut': rut}, esperado=(200,))
+
+
+def flujo_ficha(cliente, datos, rnd):
+    from django.urls import reverse
+
+    paciente_id, _, _ = rnd.choice(datos.pacientes)
+    gestas = rnd.randint(1, 4)
+    _pedir(cliente, 'post', reverse('matrona:crear_ficha', args=[paciente_id]), {
+        'paciente_id': paciente_id,
+        'matrona_responsable': rnd.choice(datos.matronas),
+        'numero_gestas': gestas,
+        'numero_partos': gestas - 1,
+        'partos_vaginales': gestas - 1,
+        'partos_cesareas': 0,
+        'numero_abortos': 0,
+        'nacidos_vivos': gestas - 1,
+        'edad_gestacional_semanas': rnd.randint(30, 40),
+        'edad_gestacional_dias': rnd.randint(0, 6),
+        'patologias_criticas': 'NINGUNA',
+    }, esperado=(302,))
+
+
+def flujo_parto(cliente, datos, rnd):
+    from django.urls import reverse
+    from django.utils import timezone
+
+    ficha_id, _ = rnd.choice(datos.fichas)
+    ahora = timezone.localtime()
+    pasos = [
+        (reverse('partos:registrar_parto_paso1', args=[ficha_id]), {
+            'ficha': ficha_id,
+            'fecha_hora_admision': ahora.strftime('%Y-%m-%dT%H:%M'),
+        }),
+        (reverse('partos:registrar_parto_paso2'), {
+            'vih_tomado_sala': 'NO', 'edad_gestacional_semanas': 39, 'edad_gestacional_dias': 2,
+            'numero_tactos_vaginales': 3, 'rotura_membrana': 'ESPONTANEA', 'monitor_ttc': 'on',
+        }),
+        (reverse('partos:registrar_parto_paso3'), {
+            'tipo_regimen': 'LIQUIDO', 'tipo_parto': 'EUTOCICO',
+            'clasificacion_robson': 'GRUPO_1', 'posicion_materna_parto': 'SEMISENTADA',
+        }),
+        (reverse('partos:registrar_parto_paso4'), {'estado_perine': 'INDEMNE'}),
+        (reverse('partos:registrar_parto_paso5'), {'analgesia_no_farmacologica': 'on'}),
+        (reverse('partos:registrar_parto_paso6'), {'profesional_responsable': 'Matrona de turno'}),
+    ]
+    for url, formulario in pasos:
+        _pedir(cliente, 'post', url, formulario, esperado=(302,))
+
+
+def flujo_signos(cliente, datos, rnd):
+    from django.urls import reverse
+    from django.utils import timezone
+
+    rut, ficha_id = rnd.choice(datos.fichas_signos)
+    url = reverse('tens:parametros_tens')
+    _pedir(cliente, 'post', url, {'buscar_paciente': '1', 'rut': rut}, esperado=(200,))
+    _pedir(cliente, 'post', url, {
+        'guardar_registro': '1',
+        'ficha': ficha_id,
+        'tens_responsable': rnd.choice(datos.tens),
+        'fecha': timezone.localdate().isoformat(),
+        'turno': rnd.choice(['manana', 'tarde']),
+        'temperatura': f'{rnd.gauss(36.8, 0.3):.1f}',
+        'frecuencia_cardiaca': int(rnd.gauss(82, 8)),
+        'presion_arterial': f'{int(rnd.gauss(115, 8))}/{int(rnd.gauss(72, 6))}',
+        'frecuencia_respiratoria': int(rnd.gauss(16, 2)),
+        'saturacion_oxigeno': rnd.randint(95, 100),
+    }, esperado=(302,))
+
+
+def flujo_administracion(cliente, datos, rnd):
+    from django.urls import reverse
+    from django.utils import timezone
+
+    medicamento_id, ficha_id, nombre, dosis, via = rnd.choice(datos.medicamentos)
+    ahora = timezone.localtime() - timedelta(minutes=1)
+    _pedir(cliente, 'post', reverse('tens:registrar_tratamiento_ficha', args=[ficha_id]), {
+        'nombre_medicamento': nombre,
+        'dosis': dosis,
+        'via_administracion': VIAS_TRATAMIENTO.get(via, 'OT'),
+        'fecha_aplicacion': ahora.strftime('%Y-%m-%dT%H:%M'),
+        'hora_aplicacion': ahora.strftime('%H:%M'),
+        'medicamento_ficha': medicamento_id,
+    }, esperado=(302,))
+
+
+FLUJOS = {
+    'busqueda': flujo_busqueda,
+    'ficha': flujo_ficha,
+    'parto': flujo_parto,
+    'signos': flujo_signos,
+    'administracion': flujo_administracion,
+}
+
+
+# ============================================
+# MEDICIÓN
+# ============================================
+
+class ResultadoFlujo:
+    def __init__(self):
+        self.latencias = []
+        self.errores = Counter()
+        self.consultas = Counter()
+        self.segundos_sql = 0.0
+
+    def agregar(self, otro):
+        self.latencias.extend(otro.latencias)
+        self.errores.update(otro.errores)
+        self.consultas.update(otro.consultas)
+        self.segundos_sql += otro.segundos_sql
+
+    def resumen(self, duracion):
+        exitosos = len(self.latencias)
+        return {
+            'flujos': exitosos,
+            'errores': sum(self.errores.values()),
+            'por_segundo': round(exitosos / duracion, 2),
+            'p50': round(percentil(self.latencias, 50), 2),
+            'p95': round(percentil(self.latencias, 95), 2),
+            'p99': round(percentil(self.latencias, 99), 2),
+            'consultas': round(sum(self.consultas.values()) / exitosos, 2) if exitosos else 0,
+            'consultas_por_alias': {
+                alias: round(total / exitosos, 2) for alias, total in self.consultas.items()
+            } if exitosos else {},
+            'sql_ms': round(self.segundos_sql * 1000 / exitosos, 2) if exitosos else 0,
+        }
+
+
+def ejecutar_flujo(nombre, cliente, datos, rnd, resultado):
+    """Corre un flujo midiendo latencia y consultas (todas las conexiones del hilo)"""
+    from django.db import connections
+    from obstetric_care.instrumentacion import ContadorConsultas, MedicionRequest
+
+    medicion = MedicionRequest()
+    try:
+        with ExitStack() as pila:
+            for alias in connections:
+                pila.enter_context(connections[alias].execute_wrapper(ContadorConsultas(alias, medicion)))
+            FLUJOS[nombre](cliente, datos, rnd)
+    except Exception as error:
+        resultado.errores[f'{type(error).__name__}: {error}'] += 1
+        return False
+    resultado.latencias.append((time.perf_counter() - medicion.inicio) * 1000)
+    resultado.consultas.update(medicion.consultas)
+    resultado.segundos_sql += medicion.segundos_sql
+    return True
+
+
+def medir_flujos(datos, mezcla, hilos, duracion, semilla=0):
+    """Lanza `hilos` usuarios durante `duracion` segundos; retorna {flujo: ResultadoFlujo}"""
+    from django.db import connections
+    from django.test import Client
+
+    nombres = list(mezcla)
+    pesos = [mezcla[nombre] for nombre in nombres]
+    totales = {nombre: ResultadoFlujo() for nombre in nombres}
+    candado = threading.Lock()
+    fin = time.perf_counter() + duracion
+
+    def usuario(numero):
+        rnd = random.Random(semilla * 1000 + numero)
+        cliente = Client(HTTP_HOST='localhost')
+        propios = {nombre: ResultadoFlujo() for nombre in nombres}
+        try:
+            while time.perf_counter() < fin:
+                nombre = rnd.choices(nombres, pesos)[0]
+                ejecutar_flujo(nombre, cliente, datos, rnd, propios[nombre])
+        finally:
+            connections.close_all()
+        with candado:
+            for nombre, resultado in propios.items():
+                totales[nombre].agregar(resultado)
+
+    trabajadores = [threading.Thread(target=usuario, args=(i,)) for i in range(hilos)]
+    for hilo in trabajadores:
+        hilo.start()
+    for hilo in trabajadores:
+        hilo.join()
+    return totales
+
+
+# ============================================
+# LÍNEA BASE
+# ============================================
+
+def comparar(resultados, base, tolerancia):
+    """Lista de regresiones de `resultados` respecto de la línea base"""
+    regresiones = []
+    factor = 1 + tolerancia / 100
+    for nombre, actual in resultados['flujos'].items():
+        anterior = base['flujos'].get(nombre)
+        if not anterior or not actual['flujos']:
+            continue
+        if actual['p95'] > anterior['p95'] * factor:
+            regresiones.append(f"{nombre}: p95 {anterior['p95']}ms -> {actual['p95']}ms")
+        if actual['por_segundo'] * factor < anterior['por_segundo']:
+            regresiones.append(f"{nombre}: {anterior['por_segundo']}/s -> {actual['por_segundo']}/s")
+        if actual['consultas'] > anterior['consultas'] + 0.5:
+            regresiones.append(f"{nombre}: {anterior['consultas']} -> {actual['consultas']} consultas por flujo")
+    for nombre, error in resultados['rotos'].items():
+        if nombre in base['flujos']:
+            regresiones.append(f"{nombre}: dejó de funcionar ({error})")
+    return regresiones
+
+
+def _mezcla(valores):
+    if not valores:
+        return dict(MEZCLA_DEFECTO)
+    mezcla = {}
+    for valor in valores:
+        nombre, _, peso = valor.partition('=')
+        if nombre not in FLUJOS:
+            raise argparse.ArgumentTypeError(f'Flujo desconocido: {nombre} (opciones: {", ".join(FLUJOS)})')
+        mezcla[nombre] = float(peso or 1)
+    return mezcla
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hilos', type=int, default=4, help='Usuarios concurrentes')
+    parser.add_argument('--duracion', type=float, default=20, help='Segundos de medición')
+    parser.add_argument('--mezcla', nargs='+', metavar='FLUJO=PESO',
+                        help=f'Flujos y pesos (default: {" ".join(f"{k}={v}" for k, v in MEZCLA_DEFECTO.items())})')
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--sembrar', type=int, default=0, help='Generar N pacientes sintéticos antes de medir')
+    parser.add_argument('--guardar-base', metavar='ARCHIVO', help='Guardar los resultados como línea base (JSON)')
+    parser.add_argument('--comparar', metavar='ARCHIVO', help='Comparar con una línea base guardada')
+    parser.add_argument('--tolerancia', type=float, default=20, help='Empeoramiento permitido en %% (default: 20)')
+    args = parser.parse_args(argv)
+
+    configurar_django()
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test import Client
+
+    try:
+        mezcla = _mezcla(args.mezcla)
+    except argparse.ArgumentTypeError as error:
+        parser.error(str(error))
+
+    if args.sembrar:
+        call_command('generar_datos_sinteticos', pacientes=args.sembrar, semilla=args.semilla)
+
+    datos = DatosFlujos()
+    faltantes = datos.faltantes()
+    if faltantes:
+        print(f"❌ Faltan datos ({', '.join(faltantes)}): use --sembrar N")
+        return 1
+
+    # Una pasada de cada flujo antes de medir: calienta cachés y excluye los flujos rotos
+    cliente_prueba = Client(HTTP_HOST='localhost')
+    rotos = {}
+    for nombre in list(mezcla):
+        prueba = ResultadoFlujo()
+        if not ejecutar_flujo(nombre, cliente_prueba, datos, random.Random(args.semilla), prueba):
+            rotos[nombre] = next(iter(prueba.errores))
+            del mezcla[nombre]
+            print(f"❌ {nombre}: {rotos[nombre]} (no se mide)")
+    if not mezcla:
+        return 1
+
+    totales = medir_flujos(datos, mezcla, args.hilos, args.duracion, args.semilla)
+    resultados = {
+        'motor': settings.DATABASES['default']['ENGINE'],
+        'hilos': args.hilos,
+        'duracion': args.duracion,
+        'pacientes': len(datos.pacientes),
+        'fichas_activas': len(datos.fichas),
+        'flujos': {nombre: resultado.resumen(args.duracion) for nombre, resultado in totales.items()},
+        'rotos': rotos,
+    }
+
+    print(f"\nmotor={resultados['motor']} hilos={args.hilos} duracion={args.duracion}s "
+          f"pacientes={resultados['pacientes']} fichas activas={resultados['fichas_activas']}")
+    for nombre, r in resultados['flujos'].items():
+        print(
+            f"{nombre:<15} {r['por_segundo']:7.2f}/s  n={r['flujos']:<6} err={r['errores']:<4} "
+            f"p50={r['p50']:8.2f}ms p95={r['p95']:8.2f}ms p99={r['p99']:8.2f}ms  "
+            f"consultas={r['consultas']:6.2f} sql={r['sql_ms']:7.2f}ms"
+        )
+        for error, veces in totales[nombre].errores.most_common(3):
+            print(f"    ⚠️  {veces}x {error}")
+
+    if args.guardar_base:
+        with open(args.guardar_base, 'w', encoding='utf-8') as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+        print(f"\n💾 Línea base guardada en {args.guardar_base}")
+
+    codigo = 1 if rotos or any(r['errores'] for r in resultados['flujos'].values()) else 0
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            base = json.load(archivo)
+        if (base['motor'], base['hilos']) != (resultados['motor'], resultados['hilos']):
+            print(f"⚠️  La base se midió con {base['motor']} y {base['hilos']} hilos: la comparación no es directa")
+        regresiones = comparar(resultados, base, args.tolerancia)
+        for regresion in regresiones:
+            print(f"❌ {regresion}")
+        if regresiones:
+            codigo = 1
+        else:
+            print(f"\n✅ Sin regresiones respecto de {args.comparar} (tolerancia {args.tolerancia}%)")
+    return codigo
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# benchmarks/bench_rut.py
+"""
+Micro-benchmark de validación de RUT (utilidad.rut_validator), en RUT/seg.
+
+Compara, sobre el mismo lote (formatos mixtos, ~5% inválidos):
+    anterior        regex + bucle por carácter, un valor a la vez con excepción
+    validar_rut     validación individual actual (tablas de sumas ponderadas)
+    validar_ruts    API por lotes, con y sin detección de duplicados
+
+Uso:
+    python -m benchmarks.bench_rut --cantidad 1000000
+"""
+import argparse
+import random
+import re
+import sys
+import time
+
+from benchmarks._entorno import configurar_django
+
+configurar_django()
+
+from django.core.exceptions import ValidationError  # noqa: E402
+from utilidad.rut_validator import calcular_dv, validar_rut, validar_ruts  # noqa: E402
+
+
+def _validar_rut_anterior(value):
+    """Implementación previa a la consolidación, como referencia"""
+    rut = value.replace(".", "").replace(" ", "").upper()
+    if not re.match(r"^\d{7,8}-[\dkK]$", rut):
+        raise ValidationError("Formato RUT inválido. Ej: 12345678-9")
+    cuerpo, dv = rut.split("-")
+    suma, mult = 0, 2
+    for c in reversed(cuerpo):
+        suma += int(c) * mult
+        mult = 2 if mult == 7 else mult + 1
+    res = 11 - (suma % 11)
+    if dv != ("0" if res == 11 else "K" if res == 10 else str(res)):
+        raise ValidationError("Dígito verificador incorrecto.")
+    return rut
+
+
+def generar_ruts(cantidad, semilla=1):
+    azar = random.Random(semilla)
+    ruts = []
+    for _ in range(cantidad):
+        cuerpo = str(azar.randint(1_000_000, 29_999_999))
+        dv = calcular_dv(cuerpo)
+        if azar.random() < 0.05:
+            dv = "X" if dv == "0" else "0"
+        if azar.random() < 0.5:
+            ruts.append(f"{int(cuerpo):,}".replace(",", ".") + f"-{dv.lower()}")
+        else:
+            ruts.append(f"{cuerpo}-{dv}")
+    return ruts
+
+
+def _uno_a_uno(validar):
+    def medir(ruts):
+        validos = 0
+        for rut in ruts:
+            try:
+                validar(rut)
+                validos += 1
+            except ValidationError:
+                pass
+        return validos
+    return medir
+
+
+CASOS = [
+    ('anterior', _uno_a_uno(_validar_rut_anterior)),
+    ('validar_rut', _uno_a_uno(validar_rut)),
+    ('validar_ruts', lambda ruts: validar_ruts(ruts).errores.count(None)),
+    ('validar_ruts+duplicados', lambda ruts: validar_ruts(ruts, detectar_duplicados=True).errores.count(None)),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cantidad', type=int, default=1_000_000, help='RUT por medición')
+    parser.add_argument('--repeticiones', type=int, default=3, help='Se informa la mejor')
+    args = parser.parse_args(argv)
+
+    ruts = generar_ruts(args.cantidad)
+    validar_ruts(ruts[:1])  # construye las tablas fuera de la medición
+
+    print(f"{'caso':<26} {'válidos':>9} {'segundos':>9} {'RUT/seg':>12}")
+    for nombre, medir in CASOS:
+        mejor = None
+        for _ in range(args.repeticiones):
+            inicio = time.perf_counter()
+            validos = medir(ruts)
+            segundos = time.perf_counter() - inicio
+            mejor = segundos if mejor is None else min(mejor, segundos)
+        print(f"{nombre:<26} {validos:>9} {mejor:>9.3f} {args.cantidad / mejor:>12,.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# benchmarks/bench_secuencias.py
+"""
+Benchmark de inserción concurrente con el asignador de secuencias (gestionApp.secuencias).
+
+Lanza varios procesos que crean IngresoPaciente en paralelo (cada uno con su propia
+conexión, como los workers de gunicorn) y verifica que no haya numero_ficha duplicados.
+
+Uso:
+    python -m benchmarks.bench_secuencias --procesos 8 --inserciones 200 --bloque 20
+    python -m benchmarks.bench_secuencias --bloque 1      # bloqueo de fila en cada save()
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+
+from benchmarks._entorno import configurar_django
+
+
+def _trabajador(args):
+    paciente_pk, cantidad, bloque = args
+    configurar_django()
+    from django.conf import settings
+    from django.db import connection
+    from matronaApp.models import IngresoPaciente
+    from gestionApp.secuencias import reiniciar_bloques
+
+    settings.SECUENCIAS_TAMANO_BLOQUE = bloque
+    reiniciar_bloques()
+    numeros = []
+    try:
+        for _ in range(cantidad):
+            ingreso = IngresoPaciente.objects.create(paciente_id=paciente_pk, motivo_consulta='benchmark')
+            numeros.append(ingreso.numero_ficha)
+    finally:
+        connection.close()
+    return numeros
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--procesos', type=int, default=8)
+    parser.add_argument('--inserciones', type=int, default=200, help='Inserciones por proceso')
+    parser.add_argument('--bloque', type=int, default=20, help='SECUENCIAS_TAMANO_BLOQUE para la corrida')
+    parser.add_argument('--paciente', type=int, default=None, help='pk del Paciente a usar (por defecto el primero activo)')
+    args = parser.parse_args(argv)
+
+    configurar_django()
+    from django.db import connection
+    from gestionApp.models import Paciente
+    from matronaApp.models import IngresoPaciente
+
+    paciente_pk = args.paciente or Paciente.objects.filter(activo=True).values_list('pk', flat=True).first()
+    if paciente_pk is None:
+        print('No hay pacientes: ejecute cargar_pacientes o benchmarks.bench_busqueda --sembrar primero.')
+        return 1
+    connection.close()
+
+    inicio = time.perf_counter()
+    with multiprocessing.get_context('spawn').Pool(args.procesos) as pool:
+        resultados = pool.map(_trabajador, [(paciente_pk, args.inserciones, args.bloque)] * args.procesos)
+    duracion = time.perf_counter() - inicio
+
+    numeros = [n for lote in resultados for n in lote]
+    duplicados = len(numeros) - len(set(numeros))
+    print(f"procesos={args.procesos} inserciones={len(numeros)} bloque={args.bloque}")
+    print(f"tiempo={duracion:.2f}s  throughput={len(numeros) / duracion:.0f} inserciones/s  duplicados={duplicados}")
+
+    IngresoPaciente.objects.filter(numero_ficha__in=numeros).delete()
+    return 1 if duplicados else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GestionappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gestionApp'
+
+    def ready(self):
+        """Registra las señales que invalidan el caché de autocompletado"""
+        from gestionApp import signals  # noqa: F401
@@ -0,0 +1,199 @@
+# gestionApp/busqueda.py
+"""
+Motor de búsqueda de personas/pacientes
+Reemplaza los filtros icontains (full scan) por:
+    - RUT compacto indexado (búsqueda por prefijo)
+    - Tabla de tokens normalizados de nombre y apellidos (PersonaToken)
+"""
+import re
+import unicodedata
+
+from django.db.models import OuterRef, Exists
+
+from gestionApp.models import Persona, Paciente, PersonaToken
+from utilidad.paginacion import filtro_despues_de
+
+
+LIMITE_RESULTADOS = 50
+MAX_TOKENS_CONSULTA = 5
+FACTOR_VENTANA = 2
+# Orden del recorrido de tokens, en el formato de utilidad.paginacion (nombre, descendente, campo)
+_ORDEN_TOKENS = (('token', False, None), ('persona_id', False, None))
+
+_RE_CONSULTA_RUT = re.compile(r'^[\d.\s-]*\d[\d.\s-]*[kK]?$')
+_RE_NO_ALFANUMERICO = re.compile(r'[^a-z0-9]+')
+
+
+# ============================================
+# NORMALIZACIÓN
+# ============================================
+
+def normalizar_texto(texto):
+    """
+    Quita tildes, pasa a minúsculas y reemplaza símbolos por espacios.
+    Ej: 'Muñoz-Díaz' -> 'munoz diaz'
+    """
+    if not texto:
+        return ''
+    descompuesto = unicodedata.normalize('NFKD', str(texto))
+    sin_tildes = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return _RE_NO_ALFANUMERICO.sub(' ', sin_tildes.lower()).strip()
+
+
+def tokenizar(texto):
+    """Lista de tokens únicos (en orden de aparición) de un texto normalizado"""
+    tokens = []
+    for token in normalizar_texto(texto).split():
+        token = token[:PersonaToken._meta.get_field('token').max_length]
+        if token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+def compactar_rut(rut):
+    """
+    Deja solo dígitos y K del RUT, para búsqueda por prefijo.
+    Ej: '16.293.109-1' -> '162931091'
+    """
+    return re.sub(r'[^0-9K]', '', (rut or '').upper())
+
+
+def es_consulta_rut(query):
+    """True si la consulta parece un RUT (completo o parcial)"""
+    return bool(_RE_CONSULTA_RUT.match(query.strip()))
+
+
+def filtro_prefijo(campo, prefijo):
+    """
+    Filtro por prefijo expresado como rango [prefijo, siguiente) para que
+    cualquier motor (MySQL, SQLite) resuelva con un range scan del índice.
+    Ej: ('token', 'ana') -> {'token__gte': 'ana', 'token__lt': 'anb'}
+    """
+    siguiente = prefijo[:-1] + chr(ord(prefijo[-1]) + 1)
+    return {f'{campo}__gte': prefijo, f'{campo}__lt': siguiente}
+
+
+# ============================================
+# INDEXACIÓN
+# ============================================
+
+def tokens_persona(persona):
+    """Tokens de búsqueda para nombre y apellidos de una persona"""
+    return tokenizar(' '.join(
+        getattr(persona, campo) or '' for campo in persona.CAMPOS_BUSQUEDA
+    ))
+
+
+def construir_tokens(personas):
+    """
+    Instancias PersonaToken (sin guardar) para un lote de personas ya guardadas.
+    Pensado para cargas masivas con bulk_create.
+    """
+    return [
+        PersonaToken(persona_id=persona.pk, token=token)
+        for persona in personas
+        for token in tokens_persona(persona)
+    ]
+
+
+def indexar_persona(persona):
+    """Reconstruye los tokens de búsqueda de una persona"""
+    PersonaToken.objects.filter(persona_id=persona.pk).delete()
+    PersonaToken.objects.bulk_create(construir_tokens([persona]))
+
+
+# ============================================
+# BÚSQUEDA
+# ============================================
+
+def _candidatos_por_tokens(tokens, cantidad, permitidos=None):
+    """
+    Ids de persona cuyos tokens contienen como prefijo a todos los tokens buscados.
+    Se recorre el índice (token, persona) del token más largo (el más selectivo),
+    por lo que el orden del índice ya es el ranking: coincidencias exactas primero
+    ('ana' < 'anabel') y luego prefijos en orden alfabético. No hay ORDER BY
+    sobre el total de coincidencias: el motor se detiene al completar la ventana.
+
+    `permitidos` (subconsulta correlacionada con OuterRef('persona_id')) aplica la
+    restricción del llamador dentro de la misma consulta: con nombres comunes los
+    primeros tokens pueden ser todos de personas que el llamador descarta. Una
+    persona aparece una vez por cada token que coincide, así que se piden
+    ventanas sucesivas (keyset sobre (token, persona)) hasta juntar `cantidad`
+    personas distintas o agotar los tokens.
+    """
+    principal = max(tokens, key=len)
+    candidatos = PersonaToken.objects.filter(**filtro_prefijo('token', principal))
+    for token in tokens:
+        if token == principal:
+            continue
+        candidatos = candidatos.filter(Exists(
+            PersonaToken.objects.filter(persona_id=OuterRef('persona_id'), **filtro_prefijo('token', token))
+        ))
+    if permitidos is not None:
+        candidatos = candidatos.filter(Exists(permitidos))
+
+    filas = candidatos.order_by('token', 'persona_id').values_list('token', 'persona_id')
+    ventana = cantidad * FACTOR_VENTANA
+    ids = {}
+    ultima = None
+    while len(ids) < cantidad:
+        pendientes = filas if ultima is None else filas.filter(filtro_despues_de(_ORDEN_TOKENS, ultima))
+        lote = list(pendientes[:ventana])
+        for _, persona_id in lote:
+            ids.setdefault(persona_id)
+        if len(lote) < ventana:
+            break
+        ultima = lote[-1]
+    return list(ids)[:cantidad]
+
+
+def filtrar_por_busqueda(queryset, query, prefijo='persona__', limite=LIMITE_RESULTADOS):
+    """
+    Filtra y ordena por relevancia un queryset de Persona (prefijo='')
+    o de un modelo relacionado (prefijo='persona__').
+
+    - Consultas tipo RUT: prefijo del RUT compacto (coincidencia exacta primero).
+    - Consultas de texto: cada token debe ser prefijo de algún token de la
+      persona; los tokens que coinciden exactamente se muestran primero.
+
+    Retorna una lista ordenada de a lo más `limite` objetos. Las anotaciones
+    (Count, etc.) y filtros del queryset recibido se conservan. `prefijo`
+    admite un solo nivel de relación ('persona__').
+    """
+    query = (query or '').strip()
+    campo_id = f'{prefijo}id'
+
+    if query and es_consulta_rut(query):
+        campo_rut = f'{prefijo}Rut_busqueda'
+        return list(queryset.filter(
+            **filtro_prefijo(campo_rut, compactar_rut(query))
+        ).order_by(campo_rut)[:limite])
+
+    tokens = tokenizar(query)[:MAX_TOKENS_CONSULTA]
+    if not tokens:
+        return []
+
+    # Los filtros del llamador (ej. pacientes activos) se aplican al elegir candidatos
+    permitidos = queryset.filter(**{campo_id: OuterRef('persona_id')})
+    ids = _candidatos_por_tokens(tokens, cantidad=limite, permitidos=permitidos)
+    if not ids:
+        return []
+
+    posicion = {persona_id: i for i, persona_id in enumerate(ids)}
+    atributo_id = f'{prefijo[:-2]}_id' if prefijo else 'id'
+    resultados = queryset.filter(**{f'{campo_id}__in': ids})
+    return sorted(resultados, key=lambda obj: posicion[getattr(obj, atributo_id)])
+
+
+def buscar_pacientes(query, queryset=None, limite=LIMITE_RESULTADOS):
+    """Busca pacientes activos por RUT o nombre"""
+    if queryset is None:
+        queryset = Paciente.objects.filter(activo=True).select_related('persona')
+    return filtrar_por_busqueda(queryset, query, prefijo='persona__', limite=limite)
+
+
+def buscar_personas(query, queryset=None, limite=LIMITE_RESULTADOS):
+    """Busca personas activas por RUT o nombre"""
+    if queryset is None:
+        queryset = Persona.objects.filter(Activo=True)
+    return filtrar_por_busqueda(queryset, query, prefijo='', limite=limite)
@@ -5,7 +5,7 @@ from django import forms
 from django.core.exceptions import ValidationError
 from gestionApp.models import Persona, Tens
 from utilidad.rut_validator import normalizar_rut, validar_rut, validar_rut_chileno
-from tensApp.models import RegistroTens
+from tensApp.models import RegistroTens, parsear_presion, formatear_presion
 
 from django.utils import timezone
 from tensApp.models import Tratamiento_aplicado
@@ -187,6 +187,21 @@ class RegistroTensForm(forms.ModelForm):
         # Personalizar el display de los TENS
         self.fields['tens_responsable'].label_from_instance = lambda obj: f"{obj.persona.Nombre} {obj.persona.Apellido_Paterno} - {obj.persona.Rut}"
 
+    def clean_presion_arterial(self):
+        """Exige el formato sistólica/diastólica (ej. 120/80) y lo normaliza"""
+        presion = self.cleaned_data.get('presion_arterial')
+        if not presion:
+            return presion
+        valores = parsear_presion(presion)
+        if not valores:
+            raise ValidationError('Formato inválido. Use sistólica/diastólica, ej: 120/80')
+        sistolica, diastolica = valores
+        if not (50 <= sistolica <= 260 and 30 <= diastolica <= 160):
+            raise ValidationError('Valores de presión fuera de rango')
+        if sistolica <= diastolica:
+            raise ValidationError('La presión sistólica debe ser mayor que la diastólica')
+        return formatear_presion(sistolica, diastolica)
+
 
 
 
@@ -0,0 +1,79 @@
+# ============================================
+# UBICACIÓN: gestionApp/management/commands/generar_datos_sinteticos.py
+# ============================================
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from gestionApp.sinteticos import GeneradorSintetico, TAMANO_LOTE
+from utilidad.carga_masiva import Medidor
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera datos sintéticos deterministas (personas, pacientes, personal, fichas, medicamentos, '
+        'administraciones, signos vitales, partos y RN) con bulk_create, para pruebas de carga'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pacientes', type=int, default=1000, help='Pacientes a generar (default: 1000)')
+        parser.add_argument('--semilla', type=int, default=0, help='Semilla del generador (default: 0)')
+        parser.add_argument('--dias', type=int, default=365, help='Días de historia hacia atrás (default: 365)')
+        parser.add_argument('--activas', type=float, default=0.02,
+                            help='Fracción de pacientes con ficha activa hoy (default: 0.02)')
+        parser.add_argument('--fecha-referencia', type=date.fromisoformat,
+                            help='"Hoy" de los datos (YYYY-MM-DD, default: hoy)')
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE,
+                            help=f'Pacientes por transacción (default: {TAMANO_LOTE})')
+        parser.add_argument('--sin-personal', action='store_true',
+                            help='No generar personal: repartir entre las matronas y TENS existentes')
+
+    def handle(self, *args, **options):
+        pacientes = options['pacientes']
+        if pacientes < 1 or options['lote'] < 1:
+            raise CommandError('--pacientes y --lote deben ser mayores que cero')
+        if not 0 <= options['activas'] <= 1:
+            raise CommandError('--activas debe estar entre 0 y 1')
+
+        generador = GeneradorSintetico(
+            semilla=options['semilla'],
+            dias=options['dias'],
+            proporcion_activas=options['activas'],
+            tamano_lote=options['lote'],
+            fecha_referencia=options['fecha_referencia'],
+        )
+        medidor = Medidor()
+
+        self.stdout.write(self.style.WARNING(f'\n📋 Generando {pacientes} pacientes (semilla {options["semilla"]})...'))
+        generador.preparar_catalogo()
+        try:
+            if options['sin_personal']:
+                generador.cargar_personal()
+            else:
+                # Dotación aproximada de una maternidad: 1 matrona cada 150 pacientes/año, etc.
+                generador.generar_personal(
+                    matronas=max(3, pacientes // 150),
+                    tens=max(3, pacientes // 100),
+                    medicos=max(2, pacientes // 300),
+                )
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        def progreso(generadas):
+            medidor.filas = sum(generador.filas.values())
+            self.stdout.write(
+                f'  ✅ {generadas}/{pacientes} pacientes · {medidor.filas} filas '
+                f'({medidor.filas_por_segundo:,.0f} filas/s)'
+            )
+
+        generador.generar_pacientes(pacientes, progreso=progreso)
+
+        self.stdout.write('  ⏳ Reconstruyendo estados MEOWS y estadísticas de partos...')
+        estados, dias = generador.finalizar()
+
+        for modelo, filas in sorted(generador.filas.items()):
+            self.stdout.write(f'    {modelo}: {filas}')
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ COMPLETADO: {sum(generador.filas.values())} filas en {medidor.segundos:.1f} s '
+            f'({estados} estados MEOWS, {dias} días de estadística)'
+        ))
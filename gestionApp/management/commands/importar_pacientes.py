@@ -0,0 +1,235 @@
+# ============================================
+# UBICACIÓN: gestionApp/management/commands/importar_pacientes.py
+# Importación masiva de pacientes (listas de derivación CESFAM) desde CSV / JSONL
+# ============================================
+
+import csv
+import os
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+
+from gestionApp.busqueda import compactar_rut, construir_tokens
+from gestionApp.models import Persona, PersonaToken, Paciente
+from utilidad.carga_masiva import FORMATOS, leer_registros, en_lotes, Checkpoint, Medidor
+from utilidad.rut_validator import MENSAJES_ERROR_RUT, validar_ruts
+
+
+def _cargables(modelo):
+    return [campo for campo in modelo._meta.concrete_fields if campo.editable and not campo.primary_key]
+
+
+# Rut se valida aparte (por lote); Rut_busqueda se calcula
+CAMPOS_PERSONA = [campo for campo in _cargables(Persona) if campo.name != 'Rut']
+CAMPOS_PACIENTE = _cargables(Paciente)
+
+# Encabezado del archivo -> campo del modelo (sin distinguir mayúsculas)
+COLUMNAS = {campo.name.lower(): campo.name for campo in CAMPOS_PERSONA + CAMPOS_PACIENTE}
+COLUMNAS.update({'rut': 'Rut', 'prevision': 'Previcion', 'previsión': 'Previcion'})
+
+VERDADEROS = {'si', 'sí', 's', 'true', 't', '1', 'x'}
+FALSOS = {'no', 'n', 'false', 'f', '0'}
+FORMATOS_FECHA = ('%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y')
+
+
+def normalizar_registro(registro):
+    """{campo del modelo: texto} de un registro leído; ignora columnas desconocidas"""
+    if registro is None:
+        return None
+    datos = {}
+    for columna, valor in registro.items():
+        campo = COLUMNAS.get((columna or '').strip().lower())
+        if campo:
+            datos[campo] = None if valor is None else str(valor).strip()
+    return datos
+
+
+def convertir(campo, texto):
+    """Valor Python de un campo a partir del texto del archivo"""
+    if texto in ('', None):
+        if campo.has_default():
+            return campo.get_default()
+        if campo.null:
+            return None
+        if campo.blank:
+            return ''
+        raise ValidationError(f'{campo.name}: campo obligatorio')
+
+    if isinstance(campo, models.BooleanField):
+        if texto.lower() in VERDADEROS:
+            return True
+        if texto.lower() in FALSOS:
+            return False
+        raise ValidationError(f'{campo.name}: use Si / No')
+
+    if isinstance(campo, models.DateField) and not isinstance(campo, models.DateTimeField):
+        for formato in FORMATOS_FECHA:
+            try:
+                return datetime.strptime(texto, formato).date()
+            except ValueError:
+                pass
+        raise ValidationError(f'{campo.name}: fecha inválida (AAAA-MM-DD o DD-MM-AAAA)')
+
+    try:
+        return campo.clean(texto, None)
+    except ValidationError as e:
+        raise ValidationError(f"{campo.name}: {'; '.join(e.messages)}")
+
+
+def construir_paciente(datos, rut):
+    """
+    Persona y Paciente sin guardar para un registro normalizado y su RUT ya validado.
+    Aplica las mismas reglas de clean() que el registro individual (sin consultas).
+    Lanza ValidationError con el motivo si algún valor no es válido.
+    """
+    persona = Persona(
+        Rut=rut,
+        Rut_busqueda=compactar_rut(rut),
+        **{campo.name: convertir(campo, datos.get(campo.name)) for campo in CAMPOS_PERSONA},
+    )
+    paciente = Paciente(
+        persona=persona,
+        **{campo.name: convertir(campo, datos.get(campo.name)) for campo in CAMPOS_PACIENTE},
+    )
+    for instancia in (persona, paciente):
+        try:
+            instancia.clean()
+        except ValidationError as e:
+            raise ValidationError('; '.join(e.messages))
+    return persona, paciente
+
+
+class Command(BaseCommand):
+    help = (
+        'Importa pacientes (Persona + Paciente) desde listas de derivación CESFAM: CSV con encabezado '
+        'o JSONL (admite .gz), por lotes con bulk_create y checkpoint reanudable'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Archivo CSV / JSONL (.gz opcional)')
+        parser.add_argument('--formato', choices=FORMATOS, help='Default: según la extensión')
+        parser.add_argument('--lote', type=int, default=1000, help='Registros por transacción (default: 1000)')
+        parser.add_argument('--checkpoint', help='Archivo de checkpoint (default: <archivo>.checkpoint.json)')
+        parser.add_argument('--errores', help='CSV de registros rechazados (default: <archivo>.errores.csv)')
+        parser.add_argument('--reiniciar', action='store_true', help='Ignora el checkpoint e importa desde el inicio')
+
+    def handle(self, *args, **options):
+        archivo = options['archivo']
+        if not os.path.exists(archivo):
+            raise CommandError(f'No existe el archivo {archivo}')
+        if options['lote'] < 1:
+            raise CommandError('--lote debe ser mayor a 0')
+
+        checkpoint = Checkpoint(options['checkpoint'] or f'{archivo}.checkpoint.json', archivo)
+        if options['reiniciar']:
+            checkpoint.eliminar()
+        try:
+            procesados = checkpoint.cargar()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        insertados = checkpoint.datos['insertados']
+        rechazados = checkpoint.datos['rechazados']
+        vinculados = checkpoint.datos.get('vinculados', 0)
+        if procesados:
+            self.stdout.write(self.style.WARNING(f'  ↪️  Reanudando desde el registro {procesados + 1}'))
+
+        ruta_errores = options['errores'] or f'{archivo}.errores.csv'
+        self.stdout.write(self.style.WARNING('\n📋 Importando pacientes...'))
+
+        medidor = Medidor()
+        with open(ruta_errores, 'a' if procesados else 'w', encoding='utf-8', newline='') as salida_errores:
+            errores = csv.writer(salida_errores)
+            if not procesados:
+                errores.writerow(['registro', 'rut', 'motivo'])
+
+            registros = leer_registros(archivo, options['formato'], omitir=procesados)
+            for lote in en_lotes(registros, options['lote']):
+                personas, pacientes, rechazos = self.validar_lote(lote)
+                with transaction.atomic():
+                    self.insertar(personas, pacientes)
+                errores.writerows(rechazos)
+                salida_errores.flush()
+
+                procesados = lote[-1][0]
+                insertados += len(pacientes)
+                vinculados += len(pacientes) - len(personas)
+                rechazados += len(rechazos)
+                medidor.sumar(len(lote))
+                checkpoint.guardar(
+                    procesados=procesados, insertados=insertados, rechazados=rechazados, vinculados=vinculados,
+                )
+                self.stdout.write(
+                    f'  ✅ {procesados} registros ({insertados} pacientes, {rechazados} rechazados) '
+                    f'- {medidor.filas_por_segundo:,.0f} filas/seg'
+                )
+
+        checkpoint.eliminar()
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ COMPLETADO: {insertados} pacientes ({vinculados} con persona ya existente), '
+            f'{rechazados} rechazados en {medidor.segundos:.1f}s ({medidor.filas_por_segundo:,.0f} filas/seg)'
+        ))
+        if rechazados:
+            self.stdout.write(self.style.WARNING(f'  ⚠️  Detalle de rechazos en {ruta_errores}'))
+
+    def validar_lote(self, lote):
+        """
+        Valida un lote [(numero, registro), ...]: RUT con validar_ruts() (incluye
+        repetidos dentro del lote) y una sola consulta IN contra los RUT existentes.
+
+        Returns:
+            tuple: (personas nuevas, pacientes, [(numero, rut, motivo), ...] rechazados)
+        """
+        datos = [normalizar_registro(registro) for _, registro in lote]
+        ruts = [(registro or {}).get('Rut') for registro in datos]
+        resultado = validar_ruts(ruts, detectar_duplicados=True)
+
+        # RUT -> (persona_id, paciente_id o None)
+        existentes = {
+            rut: (persona_pk, paciente_pk)
+            for rut, persona_pk, paciente_pk in Persona.objects.filter(
+                Rut__in=resultado.validos(),
+            ).values_list('Rut', 'pk', 'paciente')
+        }
+
+        personas, pacientes, rechazos = [], [], []
+        for (numero, _), registro, original, rut, error_rut in zip(
+            lote, datos, ruts, resultado.ruts, resultado.errores,
+        ):
+            try:
+                if registro is None:
+                    raise ValidationError('Registro ilegible')
+                if error_rut:
+                    raise ValidationError(f'Rut: {MENSAJES_ERROR_RUT[error_rut]}')
+                persona_pk, paciente_pk = existentes.get(rut, (None, None))
+                if paciente_pk is not None:
+                    raise ValidationError('Rut: la persona ya está registrada como paciente')
+                persona, paciente = construir_paciente(registro, rut)
+            except ValidationError as e:
+                rechazos.append((numero, original or '', '; '.join(e.messages)))
+                continue
+
+            if persona_pk is None:
+                personas.append(persona)
+            else:
+                # Persona ya registrada (ej. como personal): solo se agrega el rol de paciente
+                persona.pk = persona_pk
+            pacientes.append(paciente)
+        return personas, pacientes, rechazos
+
+    def insertar(self, personas, pacientes):
+        if personas:
+            Persona.objects.bulk_create(personas)
+            if personas[0].pk is None:
+                # MySQL no devuelve las claves de bulk_create: se recuperan por RUT
+                claves = dict(Persona.objects.filter(
+                    Rut__in=[persona.Rut for persona in personas],
+                ).values_list('Rut', 'pk'))
+                for persona in personas:
+                    persona.pk = claves[persona.Rut]
+            PersonaToken.objects.bulk_create(construir_tokens(personas))
+        if pacientes:
+            # persona_id se toma de la instancia Persona al insertar
+            Paciente.objects.bulk_create(pacientes)
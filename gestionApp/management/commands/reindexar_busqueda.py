@@ -0,0 +1,44 @@
+# ============================================
+# UBICACIÓN: gestionApp/management/commands/reindexar_busqueda.py
+# ============================================
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from gestionApp.models import Persona, PersonaToken
+from gestionApp.busqueda import compactar_rut, construir_tokens
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de búsqueda (RUT compacto y tokens de nombre) de todas las personas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=2000, help='Personas por lote (default: 2000)')
+
+    def handle(self, *args, **options):
+        lote = options['lote']
+        total = 0
+        ultimo_id = 0
+
+        self.stdout.write(self.style.WARNING('\n📋 Reindexando búsqueda de personas...'))
+
+        while True:
+            personas = list(
+                Persona.objects.filter(id__gt=ultimo_id)
+                .order_by('id')
+                .only('id', 'Rut', *Persona.CAMPOS_BUSQUEDA)[:lote]
+            )
+            if not personas:
+                break
+
+            with transaction.atomic():
+                for persona in personas:
+                    persona.Rut_busqueda = compactar_rut(persona.Rut)
+                Persona.objects.bulk_update(personas, ['Rut_busqueda'], batch_size=lote)
+                PersonaToken.objects.filter(persona_id__in=[p.id for p in personas]).delete()
+                PersonaToken.objects.bulk_create(construir_tokens(personas), batch_size=lote)
+
+            total += len(personas)
+            ultimo_id = personas[-1].id
+            self.stdout.write(f'  ✅ {total} personas indexadas')
+
+        self.stdout.write(self.style.SUCCESS(f'\n✅ COMPLETADO: {total} personas reindexadas'))
@@ -2,6 +2,7 @@ from django.db import models
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from utilidad.rut_validator import validar_rut, normalizar_rut, validar_rut_chileno
+from utilidad.cambios import SeguimientoCambiosMixin
 from datetime import date
 from django.utils import timezone
 
@@ -9,7 +10,7 @@ from django.utils import timezone
 # ============================================
 # MODELO BASE: PERSONA
 # ============================================
-class Persona(models.Model):
+class Persona(SeguimientoCambiosMixin, models.Model):
     SEXO_CHOICES = [
         ('Masculino', 'Masculino'),
         ('Femenino', 'Femenino'),
@@ -71,6 +72,10 @@ class Persona(models.Model):
     Direccion = models.CharField(max_length=100, verbose_name="Direccion", blank=True)
     Email = models.CharField(max_length=100, verbose_name="Email", blank=True)
     Activo = models.BooleanField(default=True, verbose_name="Activo")
+    Rut_busqueda = models.CharField(max_length=20, blank=True, editable=False, db_index=True, verbose_name="RUT compacto (búsqueda)")
+    
+    CAMPOS_BUSQUEDA = ('Nombre', 'Apellido_Paterno', 'Apellido_Materno')
+    CAMPOS_CLEAN = ('Discapacidad', 'Tipo_de_Discapacidad', 'Fecha_nacimiento')
     
     def calcular_edad(self):
         """Calcula la edad actual basada en la fecha de nacimiento"""
@@ -93,20 +98,72 @@ class Persona(models.Model):
                 raise ValidationError({'Fecha_nacimiento': 'La fecha de nacimiento no puede ser futura.'})
     
     def save(self, *args, **kwargs):
+        from gestionApp.busqueda import compactar_rut, indexar_persona
         if self.Rut:
             self.Rut = normalizar_rut(self.Rut)
             validar_rut_chileno(self.Rut)
-        self.full_clean()
+            self.Rut_busqueda = compactar_rut(self.Rut)
+        self.validar_cambios()
+        update_fields = kwargs['update_fields'] = self.campos_a_guardar(kwargs.get('update_fields'))
         super().save(*args, **kwargs)
+        # Mantener sincronizado el índice de tokens de búsqueda
+        if update_fields is None or set(update_fields) & set(self.CAMPOS_BUSQUEDA):
+            indexar_persona(self)
     
     def __str__(self):
         return f"{self.Nombre} {self.Apellido_Paterno} {self.Apellido_Materno} - {self.Rut}"
+    
+    class Meta:
+        indexes = [
+            # Listado de personas (gestionApp.views.PersonaListView): filtro + orden
+            models.Index(fields=['Activo', '-id']),
+            models.Index(fields=['Activo', 'Nacionalidad', '-id']),
+            models.Index(fields=['Activo', 'Apellido_Paterno', 'Apellido_Materno', 'Nombre', 'id']),
+        ]
+
+
+# ============================================
+# ÍNDICE DE BÚSQUEDA DE PERSONAS
+# ============================================
+class PersonaToken(models.Model):
+    """Token normalizado (sin tildes, minúsculas) de nombre/apellidos de una persona"""
+    persona = models.ForeignKey(Persona, on_delete=models.CASCADE, related_name='tokens_busqueda')
+    token = models.CharField(max_length=100)
+    
+    def __str__(self):
+        return f"{self.token} ({self.persona_id})"
+    
+    class Meta:
+        verbose_name = "Token de búsqueda"
+        verbose_name_plural = "Tokens de búsqueda"
+        indexes = [
+            models.Index(fields=['token', 'persona']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['persona', 'token'], name='persona_token_unico'),
+        ]
+
+
+# ============================================
+# SECUENCIAS (NUMERACIÓN DE FICHAS Y REGISTROS)
+# ============================================
+class Secuencia(models.Model):
+    """Contador con bloqueo de fila para numero_ficha / numero_registro"""
+    nombre = models.CharField(max_length=50, unique=True, verbose_name="Nombre")
+    valor = models.BigIntegerField(default=0, verbose_name="Último valor entregado")
+    
+    def __str__(self):
+        return f"{self.nombre}: {self.valor}"
+    
+    class Meta:
+        verbose_name = "Secuencia"
+        verbose_name_plural = "Secuencias"
 
 
 # ============================================
 # MODELO PACIENTE
 # ============================================
-class Paciente(models.Model):
+class Paciente(SeguimientoCambiosMixin, models.Model):
     """Rol de Paciente vinculado a Persona"""
     ESTADO_CIVIL_CHOICES = [
         ('SOLTERA', 'Soltera'),
@@ -160,6 +217,8 @@ class Paciente(models.Model):
     Fecha_y_Hora_Ingreso = models.DateTimeField(default=timezone.now, verbose_name="Fecha y Hora de Ingreso")
     activo = models.BooleanField(default=True, verbose_name="Activo")
     
+    CAMPOS_CLEAN = ('persona', 'IMC')
+    
     @property
     def edad(self):
         """Property para obtener la edad de la persona"""
@@ -182,12 +241,12 @@ class Paciente(models.Model):
         edad_actual = self.edad
         if edad_actual and (edad_actual < 12 or edad_actual > 60):
             raise ValidationError({'persona': f'La edad de la paciente ({edad_actual} años) debe estar entre 12 y 60 años.'})
-        if self.imc:
-            if self.imc < 10 or self.imc > 60:
-                raise ValidationError({'imc': 'El IMC debe estar entre 10 y 60.'})
+        if self.IMC:
+            if self.IMC < 10 or self.IMC > 60:
+                raise ValidationError({'IMC': 'El IMC debe estar entre 10 y 60.'})
     
     def save(self, *args, **kwargs):
-        self.full_clean()
+        self.validar_cambios()
         super().save(*args, **kwargs)
     
     def __str__(self):
@@ -196,6 +255,12 @@ class Paciente(models.Model):
     class Meta:
         verbose_name = "Paciente"
         verbose_name_plural = "Pacientes"
+        indexes = [
+            # Listado de pacientes (matronaApp.views.PacienteListView): filtro + orden
+            models.Index(fields=['activo', '-Fecha_y_Hora_Ingreso', '-persona']),
+            models.Index(fields=['activo', 'Previcion', '-Fecha_y_Hora_Ingreso', '-persona']),
+            models.Index(fields=['activo', 'Consultorio', '-Fecha_y_Hora_Ingreso', '-persona']),
+        ]
 
 
 # ============================================
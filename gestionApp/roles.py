@@ -0,0 +1,90 @@
+# gestionApp/roles.py
+"""
+Resolución de roles de Persona (Paciente, Médico, Matrona, TENS) en una sola consulta
+Cada rol es una relación uno a uno inversa: hasattr(persona, 'medico') hace una
+consulta por rol y persona (y captura la excepción cuando no existe).
+
+- con_roles(): LEFT JOIN a las cuatro tablas de rol en la misma consulta de
+  personas, anotando es_paciente / es_medico / es_matrona / es_tens (listas)
+  o cargando además las filas de rol (detalle, gestión de roles).
+- roles_persona() / tiene_rol(): leen esas anotaciones o la caché de
+  select_related, sin consultas; si la persona no vino de con_roles() resuelven
+  los cuatro roles en una consulta.
+"""
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.shortcuts import get_object_or_404
+
+from gestionApp.models import Persona
+
+
+# Relación inversa -> nombre para mostrar
+ROLES = {
+    'paciente': 'Paciente',
+    'medico': 'Médico',
+    'matrona': 'Matrona',
+    'tens': 'TENS',
+}
+
+
+def _anotacion(rol):
+    return f'es_{rol}'
+
+
+def con_roles(queryset=None, cargar=False):
+    """
+    Personas con sus roles resueltos en la misma consulta.
+
+    Args:
+        queryset: QuerySet de Persona (default: todas)
+        cargar (bool): Además de las anotaciones, trae las filas de rol
+            (persona.medico.Especialidad, etc.) con select_related
+
+    Returns:
+        QuerySet: cada persona con es_paciente, es_medico, es_matrona, es_tens
+    """
+    queryset = Persona.objects.all() if queryset is None else queryset
+    if cargar:
+        # Los mismos LEFT JOIN; los booleanos salen de la caché de select_related
+        return queryset.select_related(*ROLES)
+    return queryset.annotate(**{
+        _anotacion(rol): ExpressionWrapper(Q(**{f'{rol}__isnull': False}), output_field=BooleanField())
+        for rol in ROLES
+    })
+
+
+def obtener_persona_con_roles(pk, cargar=False, **filtros):
+    """get_object_or_404 de Persona con sus roles resueltos (ver con_roles)"""
+    return get_object_or_404(con_roles(cargar=cargar), pk=pk, **filtros)
+
+
+def _resuelto(persona, rol):
+    """True/False si el rol ya se conoce sin consultar, None si no"""
+    if _anotacion(rol) in persona.__dict__:
+        return persona.__dict__[_anotacion(rol)]
+    descriptor = getattr(Persona, rol)
+    if descriptor.is_cached(persona):
+        return descriptor.related.get_cached_value(persona) is not None
+    return None
+
+
+def roles_persona(persona):
+    """
+    Returns:
+        dict: {'es_paciente': bool, 'es_medico': bool, 'es_matrona': bool, 'es_tens': bool}
+    """
+    roles = {_anotacion(rol): _resuelto(persona, rol) for rol in ROLES}
+    if None in roles.values():
+        roles = con_roles(Persona.objects.filter(pk=persona.pk)).values(*roles).get()
+        persona.__dict__.update(roles)
+    return roles
+
+
+def tiene_rol(persona, rol):
+    """Reemplazo de hasattr(persona, rol) que no consulta si la persona viene de con_roles()"""
+    return roles_persona(persona)[_anotacion(rol)]
+
+
+def nombres_roles(persona):
+    """Nombres para mostrar de los roles de la persona, ej. ['Paciente', 'Matrona']"""
+    roles = roles_persona(persona)
+    return [nombre for rol, nombre in ROLES.items() if roles[_anotacion(rol)]]
@@ -0,0 +1,112 @@
+# gestionApp/secuencias.py
+"""
+Asignador de números correlativos (ING-, FO-, PARTO-)
+Reemplaza el patrón `objects.order_by('-id').first()` + parseo del sufijo,
+que cuesta una consulta extra por inserción y colisiona con ingresos concurrentes.
+
+- Un contador por nombre en la tabla Secuencia, actualizado con bloqueo de fila
+  (SELECT ... FOR UPDATE).
+- Cada proceso reserva bloques de SECUENCIAS_TAMANO_BLOQUE números y los entrega
+  desde memoria, así la mayoría de los save() no tocan la tabla de contadores.
+- Dentro de una transacción externa no se reservan bloques: si esa transacción
+  se revierte, el contador también, y un bloque en memoria quedaría duplicado.
+"""
+import threading
+
+from django.conf import settings
+from django.db import transaction, connections, router
+
+from gestionApp.models import Secuencia
+
+
+TAMANO_BLOQUE_DEFECTO = 20
+
+_bloques = {}            # (alias, nombre) -> [siguiente, ultimo]
+_candado = threading.Lock()
+
+
+def tamano_bloque(nombre):
+    """Tamaño de bloque configurado (int global o dict por nombre de secuencia)"""
+    configuracion = getattr(settings, 'SECUENCIAS_TAMANO_BLOQUE', TAMANO_BLOQUE_DEFECTO)
+    if isinstance(configuracion, dict):
+        return max(1, configuracion.get(nombre, TAMANO_BLOQUE_DEFECTO))
+    return max(1, configuracion)
+
+
+def ultimo_sufijo(modelo, campo):
+    """
+    Último número usado en `campo` (formato PREFIJO-00001) según el registro más reciente.
+    Solo se usa para inicializar una secuencia nueva sobre datos existentes.
+    """
+    ultimo = modelo.objects.order_by('-id').values_list(campo, flat=True).first()
+    if not ultimo:
+        return 0
+    try:
+        return int(ultimo.split('-')[1])
+    except (IndexError, ValueError):
+        return 0
+
+
+def _reservar(nombre, cantidad, inicial, alias):
+    """Incrementa el contador en `cantidad` con bloqueo de fila; retorna el nuevo valor"""
+    with transaction.atomic(using=alias):
+        secuencia = Secuencia.objects.using(alias).select_for_update().filter(nombre=nombre).first()
+        if secuencia is None:
+            secuencia, _ = Secuencia.objects.using(alias).get_or_create(
+                nombre=nombre,
+                defaults={'valor': inicial() if inicial else 0},
+            )
+            secuencia = Secuencia.objects.using(alias).select_for_update().get(pk=secuencia.pk)
+        secuencia.valor += cantidad
+        secuencia.save(using=alias, update_fields=['valor'])
+        return secuencia.valor
+
+
+def siguiente_valor(nombre, inicial=None):
+    """
+    Entrega el siguiente número de la secuencia `nombre`.
+
+    Args:
+        nombre (str): Identificador de la secuencia (ej. 'ficha_obstetrica')
+        inicial (callable): Retorna el valor de partida si la secuencia aún no existe
+
+    Returns:
+        int: Número único (puede haber saltos entre procesos, nunca duplicados)
+    """
+    alias = router.db_for_write(Secuencia) or 'default'
+
+    if connections[alias].in_atomic_block:
+        return _reservar(nombre, 1, inicial, alias)
+
+    clave = (alias, nombre)
+    with _candado:
+        bloque = _bloques.get(clave)
+        if bloque is None or bloque[0] > bloque[1]:
+            cantidad = tamano_bloque(nombre)
+            ultimo = _reservar(nombre, cantidad, inicial, alias)
+            bloque = _bloques[clave] = [ultimo - cantidad + 1, ultimo]
+        valor = bloque[0]
+        bloque[0] += 1
+        return valor
+
+
+def reservar_rango(nombre, cantidad, inicial=None):
+    """
+    Reserva `cantidad` números consecutivos para cargas masivas (bulk_create no llama a save()).
+
+    Returns:
+        int: Primer número del rango; el rango es [primero, primero + cantidad)
+    """
+    alias = router.db_for_write(Secuencia) or 'default'
+    return _reservar(nombre, cantidad, inicial, alias) - cantidad + 1
+
+
+def siguiente_codigo(nombre, prefijo, digitos, inicial=None):
+    """Código formateado, ej. siguiente_codigo('ficha_obstetrica', 'FO', 5) -> 'FO-00013'"""
+    return f"{prefijo}-{siguiente_valor(nombre, inicial):0{digitos}d}"
+
+
+def reiniciar_bloques():
+    """Descarta los bloques reservados en memoria (tests / después de un fork)"""
+    with _candado:
+        _bloques.clear()
@@ -0,0 +1,21 @@
+# gestionApp/signals.py
+"""
+Señales de gestionApp
+- Invalidan el caché de autocompletado (utilidad.autocompletar) cuando cambian
+  personas, pacientes o fichas, que son lo que devuelven esas APIs.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from gestionApp.models import Persona, Paciente
+from matronaApp.models import FichaObstetrica
+from utilidad.autocompletar import invalidar_autocompletado
+
+
+@receiver([post_save, post_delete], sender=Persona)
+@receiver([post_save, post_delete], sender=Paciente)
+@receiver([post_save, post_delete], sender=FichaObstetrica)
+def invalidar_busquedas(sender, raw=False, **kwargs):
+    if raw:
+        return
+    invalidar_autocompletado()
@@ -0,0 +1,505 @@
+# gestionApp/sinteticos.py
+"""
+Generador de datos sintéticos para pruebas de carga
+Crea personas (RUT válidos), pacientes, personal clínico, fichas con patologías,
+medicamentos, administraciones, signos vitales TENS, partos y recién nacidos con
+distribuciones aproximadas a las de una maternidad pública chilena.
+
+- Determinista: mismo `semilla`, misma `fecha_referencia` y misma BD de partida
+  producen los mismos datos.
+- Todo se inserta con bulk_create por lotes de pacientes (una transacción por
+  lote). Los ids se asignan en Python desde max(id) + 1 para que las relaciones
+  funcionen también en MySQL, donde bulk_create no devuelve las claves; por eso
+  el generador no debe correr en paralelo con otras escrituras.
+- Lo que normalmente calcula save() o las señales se reproduce en bloque: RUT
+  compacto y tokens de búsqueda, numeración FO-/PARTO- (reservando rangos de la
+  Secuencia), presión numérica y MEOWS, estados MEOWS de las fichas generadas y la
+  estadística diaria de partos.
+"""
+import random
+from collections import Counter
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from gestionApp.busqueda import compactar_rut, construir_tokens
+from gestionApp.models import Persona, PersonaToken, Paciente, Medico, Matrona, Tens
+from gestionApp.secuencias import reservar_rango, ultimo_sufijo
+from matronaApp.models import FichaObstetrica, MedicamentoFicha, AdministracionMedicamento
+from medicoApp.models import Patologias
+from partosApp.estadisticas import invalidar_resumen_menu, recalcular_dia
+from partosApp.models import RegistroParto, RegistroRecienNacido
+from tensApp.alertas import reconstruir_estados
+from tensApp.dosis import HORARIOS_FRECUENCIA, invalidar_cola_dosis
+from tensApp.meows import calcular_meows
+from tensApp.models import RegistroTens, formatear_presion
+from utilidad.rut_validator import calcular_dv
+
+
+TAMANO_LOTE = 2000
+
+# Los RUT sintéticos usan cuerpos de 8 dígitos desde 50.000.000 (fuera del rango real actual)
+CUERPO_RUT_INICIAL = 50_000_000
+CUERPO_RUT_MAXIMO = 99_999_999
+
+NOMBRES_MUJER = [
+    'María', 'Camila', 'Valentina', 'Javiera', 'Constanza', 'Catalina', 'Francisca', 'Fernanda',
+    'Daniela', 'Carolina', 'Paula', 'Antonia', 'Isidora', 'Sofía', 'Josefa', 'Martina',
+    'Bárbara', 'Nicole', 'Macarena', 'Alejandra', 'Karina', 'Paola', 'Andrea', 'Romina',
+]
+NOMBRES_HOMBRE = [
+    'José', 'Juan', 'Luis', 'Carlos', 'Jorge', 'Cristián', 'Felipe', 'Matías',
+    'Sebastián', 'Diego', 'Nicolás', 'Francisco', 'Rodrigo', 'Pablo', 'Andrés', 'Tomás',
+]
+APELLIDOS = [
+    'González', 'Muñoz', 'Rojas', 'Díaz', 'Pérez', 'Soto', 'Contreras', 'Silva', 'Martínez',
+    'Sepúlveda', 'Morales', 'Rodríguez', 'López', 'Fuentes', 'Hernández', 'Torres', 'Araya',
+    'Flores', 'Espinoza', 'Valenzuela', 'Castillo', 'Tapia', 'Reyes', 'Gutiérrez', 'Castro',
+    'Pizarro', 'Álvarez', 'Vásquez', 'Sánchez', 'Fernández', 'Ramírez', 'Carrasco', 'Gómez',
+    'Cortés', 'Herrera', 'Núñez', 'Jara', 'Vergara', 'Rivera', 'Figueroa', 'Riquelme', 'Bravo',
+]
+
+# (valor, peso) para random.choices
+NACIONALIDADES = [
+    ('Chile', 88), ('Venezuela', 4), ('Peru', 3), ('Colombia', 2), ('Bolivia', 2), ('Argentina', 1),
+]
+PREVISIONES = [
+    ('FONASA_A', 25), ('FONASA_B', 30), ('FONASA_C', 15), ('FONASA_D', 10), ('ISAPRE', 15), ('PARTICULAR', 5),
+]
+ESTADOS_CIVILES = [('SOLTERA', 45), ('CASADA', 25), ('CONVIVIENTE', 25), ('DIVORCIADA', 4), ('VIUDA', 1)]
+TIPOS_PARTO = [('EUTOCICO', 55), ('DISTOCICO', 7), ('CESAREA_URGENCIA', 20), ('CESAREA_ELECTIVA', 18)]
+PATOLOGIAS_CRITICAS = [
+    ('NINGUNA', 95), ('PREECLAMPSIA_SEVERA', 3), ('SEPSIS', 1), ('CORIOAMNIONITIS', 0.7), ('ECLAMPSIA', 0.3),
+]
+NUMERO_PATOLOGIAS = [(0, 60), (1, 28), (2, 9), (3, 3)]
+NUMERO_MEDICAMENTOS = [(0, 20), (1, 30), (2, 30), (3, 15), (4, 5)]
+DIAS_ESTADIA = [(1, 20), (2, 35), (3, 30), (4, 10), (5, 5)]
+POSICIONES_PARTO = [('SEMISENTADA', 60), ('LITOTOMIA', 15), ('LATERAL', 10), ('CUCLILLAS', 5), ('DE_PIE', 5), ('CUADRUPEDA', 5)]
+PERINES = [('INDEMNE', 40), ('DESGARRO_G1', 30), ('DESGARRO_G2', 20), ('EPISIOTOMIA', 8), ('DESGARRO_G3A', 2)]
+MEDICAMENTOS = [
+    ('Paracetamol', '1 g', 'oral', '3_veces_dia'),
+    ('Ketoprofeno', '100 mg', 'endovenosa', 'Cada_8_horas'),
+    ('Cefazolina', '1 g', 'endovenosa', 'Cada_8_horas'),
+    ('Nifedipino', '10 mg', 'oral', 'Cada_8_horas'),
+    ('Sulfato ferroso', '200 mg', 'oral', '1_vez_dia'),
+    ('Labetalol', '100 mg', 'oral', 'Cada_12_horas'),
+    ('Sulfato de magnesio', '1 g/h', 'endovenosa', 'Cada_12_horas'),
+    ('Metamizol', '1 g', 'endovenosa', 'SOS'),
+    ('Enoxaparina', '40 mg', 'subcutanea', '1_vez_dia'),
+]
+
+PROBABILIDAD_GEMELAR = 0.015
+PROBABILIDAD_PARTO_ACTIVA = 0.3     # fichas activas que ya tuvieron el parto
+PROBABILIDAD_PARTO_CERRADA = 0.9    # el resto son hospitalizaciones sin parto
+PROBABILIDAD_SEGUNDA_FICHA = 0.1    # embarazo anterior registrado en el sistema
+PROBABILIDAD_INESTABLE = 0.05       # registros con signos alterados (alertas MEOWS)
+PROBABILIDAD_OMISION = 0.05         # dosis no administradas
+
+
+def _elegir(rnd, opciones):
+    valores, pesos = zip(*opciones)
+    return rnd.choices(valores, pesos)[0]
+
+
+def _acotado(valor, minimo, maximo):
+    return max(minimo, min(maximo, valor))
+
+
+class Ids:
+    """Ids consecutivos por modelo a partir del máximo existente"""
+
+    def __init__(self):
+        self._siguiente = {}
+
+    def tomar(self, modelo, cantidad=1):
+        if modelo not in self._siguiente:
+            self._siguiente[modelo] = (modelo.objects.aggregate(maximo=Max('pk'))['maximo'] or 0) + 1
+        primero = self._siguiente[modelo]
+        self._siguiente[modelo] += cantidad
+        return primero
+
+
+class GeneradorSintetico:
+    """
+    Args:
+        semilla (int): Semilla del generador aleatorio
+        dias (int): Las fichas cerradas se reparten en los últimos `dias` días
+        proporcion_activas (float): Fracción de pacientes hospitalizadas hoy (ficha activa)
+        tamano_lote (int): Pacientes por transacción / bulk_create
+        fecha_referencia (date): "Hoy" de los datos (default: hoy)
+    """
+
+    def __init__(self, semilla=0, dias=365, proporcion_activas=0.02, tamano_lote=TAMANO_LOTE, fecha_referencia=None):
+        self.rnd = random.Random(semilla)
+        self.dias = dias
+        self.proporcion_activas = proporcion_activas
+        self.tamano_lote = tamano_lote
+        self.hoy = fecha_referencia or timezone.localdate()
+        # Los datos representan el estado al inicio del turno de mañana de `hoy`
+        self.corte = self._momento(self.hoy, 8)
+        self.ids = Ids()
+        self.filas = Counter()
+        self._cuerpo_rut = None
+        self.primera_ficha = None
+        self.dias_partos = set()
+        self.patologias = []
+        self.matronas = []
+        self.tens = []
+
+    # ============================================
+    # UTILIDADES
+    # ============================================
+
+    def _momento(self, dia, hora, minuto=0):
+        return timezone.make_aware(datetime.combine(dia, time(hour=hora, minute=minuto)))
+
+    def _siguiente_rut(self):
+        if self._cuerpo_rut is None:
+            # Rut_busqueda es texto: solo se comparan los de 9 caracteres (cuerpo de 8 dígitos + DV)
+            existentes = Persona.objects.annotate(largo=Length('Rut_busqueda')).filter(
+                largo=9, Rut_busqueda__gte=f'{CUERPO_RUT_INICIAL}0',
+            ).aggregate(maximo=Max('Rut_busqueda'))['maximo']
+            self._cuerpo_rut = int(existentes[:-1]) + 1 if existentes else CUERPO_RUT_INICIAL
+        cuerpo = str(self._cuerpo_rut)
+        if self._cuerpo_rut > CUERPO_RUT_MAXIMO:
+            raise ValueError('Se agotó el rango de RUT sintéticos')
+        self._cuerpo_rut += 1
+        return f'{cuerpo}-{calcular_dv(cuerpo)}'
+
+    def _persona(self, sexo, edad_media, edad_desviacion, edad_minima, edad_maxima):
+        rnd = self.rnd
+        rut = self._siguiente_rut()
+        edad = _acotado(rnd.gauss(edad_media, edad_desviacion), edad_minima, edad_maxima)
+        nombres = NOMBRES_MUJER if sexo == 'Femenino' else NOMBRES_HOMBRE
+        nacionalidad = _elegir(rnd, NACIONALIDADES)
+        return Persona(
+            id=self.ids.tomar(Persona),
+            Rut=rut,
+            Rut_busqueda=compactar_rut(rut),
+            Nombre=rnd.choice(nombres),
+            Apellido_Paterno=rnd.choice(APELLIDOS),
+            Apellido_Materno=rnd.choice(APELLIDOS),
+            Fecha_nacimiento=self.hoy - timedelta(days=int(edad * 365.25)),
+            Sexo=sexo,
+            Nacionalidad=nacionalidad,
+            Inmigrante='No' if nacionalidad == 'Chile' else 'Si',
+            Telefono=f'+569{rnd.randrange(10_000_000, 99_999_999)}',
+        )
+
+    def _insertar(self, modelo, objetos):
+        modelo.objects.bulk_create(objetos, batch_size=self.tamano_lote)
+        self.filas[modelo._meta.label] += len(objetos)
+
+    def _insertar_personas(self, personas):
+        self._insertar(Persona, personas)
+        self._insertar(PersonaToken, construir_tokens(personas))
+
+    # ============================================
+    # CATÁLOGO Y PERSONAL
+    # ============================================
+
+    def preparar_catalogo(self):
+        """Usa el catálogo de patologías existente; si está vacío crea uno por código CIE-10"""
+        self.patologias = list(Patologias.objects.filter(estado='Activo').order_by('pk').values_list('pk', flat=True))
+        if self.patologias:
+            return
+        riesgos = [valor for valor, _ in Patologias.NIVEL_RIESGO_CHOICES]
+        catalogo = [
+            Patologias(nombre=etiqueta.split(' - ')[-1], codigo_cie_10=codigo, nivel_de_riesgo=riesgos[i % len(riesgos)])
+            for i, (codigo, etiqueta) in enumerate(Patologias.CIE_10_CHOICES)
+        ]
+        self._insertar(Patologias, catalogo)
+        self.patologias = list(Patologias.objects.order_by('pk').values_list('pk', flat=True))
+
+    def generar_personal(self, matronas, tens, medicos):
+        """Personal clínico con sus personas; las fichas y registros se reparten entre ellos"""
+        rnd = self.rnd
+        turnos = [valor for valor, _ in Matrona.TURNO_CHOICES]
+        personas, roles = [], {Matrona: [], Tens: [], Medico: []}
+
+        for modelo, cantidad, proporcion_mujeres in ((Matrona, matronas, 0.9), (Tens, tens, 0.7), (Medico, medicos, 0.5)):
+            for _ in range(cantidad):
+                sexo = 'Femenino' if rnd.random() < proporcion_mujeres else 'Masculino'
+                persona = self._persona(sexo, 38, 9, 23, 65)
+                personas.append(persona)
+                datos = {'id': self.ids.tomar(modelo), 'persona_id': persona.id,
+                         'Años_experiencia': rnd.randint(1, 30), 'Turno': rnd.choice(turnos)}
+                if modelo is Tens:
+                    datos.update(Nivel=rnd.choice([v for v, _ in Tens.NIVEL_CHOICES]),
+                                 Certificaciones=rnd.choice([v for v, _ in Tens.CERTIFICACION_CHOICES]))
+                else:
+                    prefijo = 'MAT' if modelo is Matrona else 'MED'
+                    datos.update(Especialidad=rnd.choice([v for v, _ in modelo.ESPECIALIDAD_CHOICES]),
+                                 Registro_medico=f'SINT-{prefijo}-{persona.Rut}')
+                roles[modelo].append(modelo(**datos))
+
+        with transaction.atomic():
+            self._insertar_personas(personas)
+            for modelo, objetos in roles.items():
+                self._insertar(modelo, objetos)
+
+        nombres = {p.id: f'{p.Nombre} {p.Apellido_Paterno}' for p in personas}
+        self.matronas = [(m.id, nombres[m.persona_id]) for m in roles[Matrona]]
+        self.tens = [t.id for t in roles[Tens]]
+
+    def cargar_personal(self):
+        """Reutiliza el personal existente (cuando no se genera personal nuevo)"""
+        self.matronas = [
+            (pk, f'{nombre} {apellido}')
+            for pk, nombre, apellido in Matrona.objects.filter(Activo=True).order_by('pk')
+            .values_list('pk', 'persona__Nombre', 'persona__Apellido_Paterno')
+        ]
+        self.tens = list(Tens.objects.filter(Activo=True).order_by('pk').values_list('pk', flat=True))
+        if not self.matronas or not self.tens:
+            raise ValueError('No hay matronas o TENS activos: genere personal primero')
+
+    # ============================================
+    # PACIENTES Y ATENCIONES
+    # ============================================
+
+    def generar_pacientes(self, cantidad, progreso=None):
+        """Genera `cantidad` pacientes con toda su historia, en lotes; `progreso(generadas)` tras cada lote"""
+        generadas = 0
+        while generadas < cantidad:
+            lote = min(self.tamano_lote, cantidad - generadas)
+            self._generar_lote(lote)
+            generadas += lote
+            if progreso:
+                progreso(generadas)
+
+    def _generar_lote(self, cantidad):
+        rnd = self.rnd
+        lote = _Lote()
+
+        for _ in range(cantidad):
+            persona = self._persona('Femenino', 28, 6, 15, 45)
+            lote.personas.append(persona)
+            lote.pacientes.append(Paciente(
+                persona_id=persona.id,
+                Estado_civil=_elegir(rnd, ESTADOS_CIVILES),
+                Previcion=_elegir(rnd, PREVISIONES),
+                Consultorio=rnd.choice([v for v, _ in Paciente.CONSULTORIO_CHOICES]),
+                IMC=Decimal(str(round(_acotado(rnd.gauss(27, 4.5), 16, 50), 2))),
+                control_prenatal=rnd.random() < 0.95,
+            ))
+            activa = rnd.random() < self.proporcion_activas
+            if activa:
+                ingreso = self.hoy - timedelta(days=rnd.randint(0, 2))
+            else:
+                ingreso = self.hoy - timedelta(days=rnd.randint(3, max(3, self.dias)))
+            if rnd.random() < PROBABILIDAD_SEGUNDA_FICHA:
+                anterior = ingreso - timedelta(days=rnd.randint(400, 1500))
+                self._ficha(lote, persona.id, anterior, activa=False)
+            self._ficha(lote, persona.id, ingreso, activa=activa)
+
+        codigos_ficha = reservar_rango(
+            'ficha_obstetrica', len(lote.fichas),
+            inicial=lambda: ultimo_sufijo(FichaObstetrica, 'numero_ficha'),
+        )
+        for i, ficha in enumerate(lote.fichas):
+            ficha.numero_ficha = f'FO-{codigos_ficha + i:05d}'
+        if lote.partos:
+            codigos_parto = reservar_rango(
+                'registro_parto', len(lote.partos),
+                inicial=lambda: ultimo_sufijo(RegistroParto, 'numero_registro'),
+            )
+            for i, parto in enumerate(lote.partos):
+                parto.numero_registro = f'PARTO-{codigos_parto + i:06d}'
+
+        with transaction.atomic():
+            self._insertar_personas(lote.personas)
+            self._insertar(Paciente, lote.pacientes)
+            self._insertar(FichaObstetrica, lote.fichas)
+            # fecha_creacion es auto_now_add: bulk_create la sobrescribe con la hora actual
+            for ficha, creacion in zip(lote.fichas, lote.creacion_fichas):
+                ficha.fecha_creacion = creacion
+            FichaObstetrica.objects.bulk_update(lote.fichas, ['fecha_creacion'], batch_size=self.tamano_lote)
+            self._insertar(FichaObstetrica.patologias.through, lote.patologias)
+            self._insertar(MedicamentoFicha, lote.medicamentos)
+            self._insertar(AdministracionMedicamento, lote.administraciones)
+            self._insertar(RegistroTens, lote.registros)
+            self._insertar(RegistroParto, lote.partos)
+            self._insertar(RegistroRecienNacido, lote.recien_nacidos)
+
+        if self.primera_ficha is None and lote.fichas:
+            self.primera_ficha = lote.fichas[0].id
+
+    def _ficha(self, lote, paciente_id, ingreso, activa):
+        rnd = self.rnd
+        matrona_id, matrona_nombre = rnd.choice(self.matronas)
+        gestas = _acotado(int(rnd.expovariate(0.7)) + 1, 1, 10)
+        semanas = int(_acotado(rnd.gauss(38.5, 2), 24, 42))
+        ficha = FichaObstetrica(
+            id=self.ids.tomar(FichaObstetrica),
+            paciente_id=paciente_id,
+            matrona_responsable_id=matrona_id,
+            numero_gestas=gestas,
+            numero_partos=rnd.randint(0, gestas - 1),
+            edad_gestacional_semanas=semanas,
+            edad_gestacional_dias=rnd.randint(0, 6),
+            peso_actual=Decimal(str(round(_acotado(rnd.gauss(72, 12), 40, 150), 2))),
+            talla=Decimal(str(round(_acotado(rnd.gauss(158, 6), 135, 190), 2))),
+            patologias_criticas=_elegir(rnd, PATOLOGIAS_CRITICAS),
+            activa=activa,
+        )
+        lote.fichas.append(ficha)
+        lote.creacion_fichas.append(self._momento(ingreso, rnd.randint(0, 23), rnd.randint(0, 59)))
+
+        if self.patologias:
+            for patologia_id in rnd.sample(self.patologias, min(_elegir(rnd, NUMERO_PATOLOGIAS), len(self.patologias))):
+                lote.patologias.append(FichaObstetrica.patologias.through(
+                    fichaobstetrica_id=ficha.id, patologias_id=patologia_id,
+                ))
+
+        estadia = _elegir(rnd, DIAS_ESTADIA)
+        ultimo_dia = min(self.hoy, ingreso + timedelta(days=estadia - 1))
+        self._medicamentos(lote, ficha, ingreso, ultimo_dia, activa)
+        self._signos_vitales(lote, ficha, ingreso, ultimo_dia)
+
+        probabilidad_parto = PROBABILIDAD_PARTO_ACTIVA if activa else PROBABILIDAD_PARTO_CERRADA
+        if rnd.random() < probabilidad_parto:
+            self._parto(lote, ficha, ingreso, semanas, matrona_nombre, multipara=ficha.numero_partos > 0)
+
+    def _medicamentos(self, lote, ficha, inicio, termino, activa):
+        rnd = self.rnd
+        for nombre, dosis, via, frecuencia in rnd.sample(MEDICAMENTOS, _elegir(rnd, NUMERO_MEDICAMENTOS)):
+            medicamento = MedicamentoFicha(
+                id=self.ids.tomar(MedicamentoFicha), ficha_id=ficha.id,
+                nombre_medicamento=nombre, dosis=dosis, via_administracion=via, frecuencia=frecuencia,
+                fecha_inicio=inicio, fecha_termino=termino if not activa else termino + timedelta(days=2),
+                activo=activa,
+            )
+            lote.medicamentos.append(medicamento)
+
+            dia = inicio
+            while dia <= termino:
+                for hora in HORARIOS_FRECUENCIA.get(frecuencia, ()):
+                    momento = self._momento(dia, hora, rnd.randint(0, 40))
+                    if momento >= self.corte:
+                        continue
+                    omitida = rnd.random() < PROBABILIDAD_OMISION
+                    lote.administraciones.append(AdministracionMedicamento(
+                        medicamento_ficha_id=medicamento.id,
+                        tens_id=rnd.choice(self.tens),
+                        fecha_hora_administracion=momento,
+                        se_realizo_lavado=rnd.random() < 0.97,
+                        administrado_exitosamente=not omitida,
+                        motivo_no_administracion='Paciente en pabellón' if omitida else '',
+                    ))
+                dia += timedelta(days=1)
+
+    def _signos_vitales(self, lote, ficha, inicio, termino):
+        rnd = self.rnd
+        dia = inicio
+        while dia <= termino:
+            for turno in ('manana', 'tarde') if dia < self.hoy else ('manana',):
+                inestable = rnd.random() < PROBABILIDAD_INESTABLE
+                signos = {
+                    'temperatura': round(rnd.gauss(38.6 if inestable else 36.8, 0.4), 1),
+                    'frecuencia_cardiaca': int(rnd.gauss(118 if inestable else 82, 10)),
+                    'presion_sistolica': int(rnd.gauss(152 if inestable else 115, 10)),
+                    'presion_diastolica': int(rnd.gauss(98 if inestable else 72, 7)),
+                    'frecuencia_respiratoria': int(rnd.gauss(24 if inestable else 16, 2)),
+                    'saturacion_oxigeno': int(_acotado(rnd.gauss(94 if inestable else 98, 1.2), 80, 100)),
+                }
+                puntaje, nivel = calcular_meows(signos)
+                lote.registros.append(RegistroTens(
+                    ficha_id=ficha.id, tens_responsable_id=rnd.choice(self.tens), fecha=dia, turno=turno,
+                    temperatura=Decimal(str(signos['temperatura'])),
+                    frecuencia_cardiaca=signos['frecuencia_cardiaca'],
+                    presion_arterial=formatear_presion(signos['presion_sistolica'], signos['presion_diastolica']),
+                    presion_sistolica=signos['presion_sistolica'],
+                    presion_diastolica=signos['presion_diastolica'],
+                    frecuencia_respiratoria=signos['frecuencia_respiratoria'],
+                    saturacion_oxigeno=signos['saturacion_oxigeno'],
+                    puntaje_meows=puntaje, nivel_meows=nivel,
+                ))
+            dia += timedelta(days=1)
+
+    def _parto(self, lote, ficha, dia, semanas, matrona_nombre, multipara):
+        rnd = self.rnd
+        tipo = _elegir(rnd, TIPOS_PARTO)
+        cesarea = tipo.startswith('CESAREA')
+        gemelar = rnd.random() < PROBABILIDAD_GEMELAR
+        admision = self._momento(dia, rnd.randint(0, 23), rnd.randint(0, 59))
+        nacimiento = admision + timedelta(minutes=rnd.randint(60 if cesarea else 120, 900))
+
+        if gemelar:
+            robson = 'GRUPO_8'
+        elif semanas <= 36:
+            robson = 'GRUPO_10'
+        elif tipo == 'CESAREA_ELECTIVA':
+            robson = 'GRUPO_5_1' if multipara else 'GRUPO_2B'
+        else:
+            robson = 'GRUPO_3' if multipara else 'GRUPO_1'
+
+        parto = RegistroParto(
+            id=self.ids.tomar(RegistroParto), ficha_id=ficha.id,
+            fecha_hora_admision=admision, fecha_hora_parto=nacimiento,
+            edad_gestacional_semanas=semanas, edad_gestacional_dias=ficha.edad_gestacional_dias,
+            rotura_membrana=rnd.choice(['ESPONTANEA', 'ARTIFICIAL', 'MEMBRANAS_INTEGRAS']),
+            tipo_regimen=rnd.choice(['CERO', 'LIQUIDO', 'COMUN']),
+            tipo_parto=tipo,
+            clasificacion_robson=robson,
+            posicion_materna_parto='DORSAL' if cesarea else _elegir(rnd, POSICIONES_PARTO),
+            estado_perine='INDEMNE' if cesarea else _elegir(rnd, PERINES),
+            anestesia_neuroaxial=cesarea or rnd.random() < 0.45,
+            profesional_responsable=matrona_nombre,
+            causa_cesarea='Sufrimiento fetal agudo' if tipo == 'CESAREA_URGENCIA' else '',
+        )
+        lote.partos.append(parto)
+        self.dias_partos.add(timezone.localdate(admision))
+
+        for _ in range(2 if gemelar else 1):
+            peso_medio = 3350 - max(0, 39 - semanas) * 220 - (600 if gemelar else 0)
+            lote.recien_nacidos.append(RegistroRecienNacido(
+                registro_parto_id=parto.id,
+                sexo='FEMENINO' if rnd.random() < 0.49 else 'MASCULINO',
+                peso=int(_acotado(rnd.gauss(peso_medio, 450), 500, 6000)),
+                talla=int(_acotado(rnd.gauss(50 - max(0, 39 - semanas) * 1.2, 2.2), 25, 60)),
+                apgar_1_minuto=_elegir(rnd, [(9, 55), (8, 30), (7, 8), (6, 4), (4, 3)]),
+                apgar_5_minutos=_elegir(rnd, [(10, 40), (9, 50), (8, 7), (7, 3)]),
+                fecha_nacimiento=nacimiento,
+            ))
+
+    # ============================================
+    # CIERRE
+    # ============================================
+
+    def finalizar(self):
+        """
+        Reconstruye lo que en un guardado normal mantienen las señales:
+        estado MEOWS de las fichas generadas, estadística diaria de partos y cachés.
+
+        Returns:
+            tuple: (estados MEOWS, días de estadística recalculados)
+        """
+        estados = dias = 0
+        if self.primera_ficha is not None:
+            estados = reconstruir_estados(FichaObstetrica.objects.filter(pk__gte=self.primera_ficha).values('id'))
+        for dia in sorted(self.dias_partos):
+            recalcular_dia(dia)
+            dias += 1
+        invalidar_resumen_menu()
+        invalidar_cola_dosis()
+        return estados, dias
+
+
+class _Lote:
+    """Objetos sin guardar de un lote de pacientes, en orden de inserción"""
+
+    def __init__(self):
+        self.personas = []
+        self.pacientes = []
+        self.fichas = []
+        self.creacion_fichas = []
+        self.patologias = []
+        self.medicamentos = []
+        self.administraciones = []
+        self.registros = []
+        self.partos = []
+        self.recien_nacidos = []
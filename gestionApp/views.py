@@ -1,10 +1,14 @@
-from django.shortcuts import render, redirect, get_object_or_404
+from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.views.generic import ListView, DetailView
 from django.http import JsonResponse
 from .forms.Gestion_form import PersonaForm, PacienteForm, MedicoForm, MatronaForm, TensForm
 from .models import Persona, Medico, Matrona, Tens
+from .roles import con_roles, obtener_persona_con_roles, roles_persona, tiene_rol
 from matronaApp.models import Paciente
+from utilidad.paginacion import ACTIVO, filtros_desde_parametros, opciones, paginar_keyset
+from utilidad.autocompletar import Autocompletado, respuesta_json
+from utilidad.rut_validator import normalizar_rut
 
 
 
@@ -12,14 +16,41 @@ from matronaApp.models import Paciente
 # VISTAS DE LISTA Y DETALLE
 # ============================================
 
+# Órdenes del listado de personas (cada uno con su índice en Persona.Meta); 'id' desempata
+ORDENES_PERSONAS = {
+    'recientes': ('-id',),
+    'apellido': ('Apellido_Paterno', 'Apellido_Materno', 'Nombre', 'id'),
+}
+FILTROS_PERSONAS = {
+    'activo': ('Activo', ACTIVO, '1'),
+    'nacionalidad': ('Nacionalidad', opciones(Persona.NACIONALIDAD_CHOICES), None),
+}
+
+
 class PersonaListView(ListView):
-    """Lista de todas las personas registradas"""
+    """Lista de personas registradas, paginada por cursor, con filtros y orden por URL"""
     model = Persona
     template_name = 'Gestion/Data/persona_list.html'
     context_object_name = 'personas'
     
     def get_queryset(self):
-        return Persona.objects.filter(Activo=True).order_by('-id')
+        filtros, self.filtros_aplicados = filtros_desde_parametros(self.request.GET, FILTROS_PERSONAS)
+        # Los roles se muestran como badges en cada fila: solo se anotan (es_paciente, ...)
+        return con_roles(Persona.objects.filter(**filtros))
+    
+    def get_context_data(self, **kwargs):
+        orden = self.request.GET.get('orden')
+        if orden not in ORDENES_PERSONAS:
+            orden = 'recientes'
+        pagina = paginar_keyset(self.object_list, ORDENES_PERSONAS[orden], self.request.GET, contar=True)
+        return super().get_context_data(
+            object_list=pagina,
+            pagina=pagina,
+            orden=orden,
+            filtros=self.filtros_aplicados,
+            nacionalidades=Persona.NACIONALIDAD_CHOICES,
+            **kwargs,
+        )
 
 
 class PersonaDetailView(DetailView):
@@ -27,6 +58,15 @@ class PersonaDetailView(DetailView):
     model = Persona
     template_name = 'Gestion/Data/persona_detail.html'
     context_object_name = 'persona'
+    
+    def get_queryset(self):
+        # La ficha muestra datos de cada rol: se cargan en la misma consulta
+        return con_roles(cargar=True)
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['roles'] = roles_persona(self.object)
+        return context
 
 
 # ============================================
@@ -117,46 +157,41 @@ def agregar_tens(request):
 # API REST (AJAX)
 # ============================================
 
-def buscar_persona_api(request):
-    """Buscar persona por RUT vía AJAX (retorna JSON)"""
-    rut = request.GET.get('rut', '').strip()
+async def _persona_por_rut(rut):
+    persona = await Persona.objects.filter(Rut=rut, Activo=True).afirst()
+    if persona is None:
+        return {
+            'encontrado': False,
+            'mensaje': 'No se encontró una persona con ese RUT'
+        }
+    apellidos = f"{persona.Apellido_Paterno} {persona.Apellido_Materno}"
+    return {
+        'encontrado': True,
+        'persona': {
+            'id': persona.id,
+            'rut': persona.Rut,
+            'nombre': persona.Nombre,
+            'apellido': apellidos,
+            'nombre_completo': f"{persona.Nombre} {apellidos}",
+            'sexo': persona.Sexo,
+            'fecha_nacimiento': persona.Fecha_nacimiento.strftime('%d/%m/%Y'),
+            'telefono': persona.Telefono or 'No registrado',
+            'email': persona.Email or 'No registrado',
+            'direccion': persona.Direccion or 'No registrada',
+        }
+    }
+
+AUTOCOMPLETADO_PERSONA = Autocompletado('gestion:buscar_persona_api', _persona_por_rut)
+
+
+async def buscar_persona_api(request):
+    """Buscar persona por RUT vía AJAX (retorna JSON; async, cacheada por RUT normalizado)"""
+    rut = normalizar_rut(request.GET.get('rut', '').strip())
     
     if not rut:
         return JsonResponse({'encontrado': False, 'mensaje': 'RUT no proporcionado'})
     
-    try:
-        from utilidad.rut_validator import normalizar_rut
-        rut_normalizado = normalizar_rut(rut)
-        
-        persona = Persona.objects.filter(Rut=rut_normalizado, Activo=True).first()
-        
-        if persona:
-            return JsonResponse({
-                'encontrado': True,
-                'persona': {
-                    'id': persona.id,
-                    'rut': persona.Rut,
-                    'nombre': persona.Nombre,
-                    'apellido': persona.Apellido,
-                    'nombre_completo': f"{persona.Nombre} {persona.Apellido}",
-                    'sexo': persona.Sexo,
-                    'fecha_nacimiento': persona.Fecha_nacimiento.strftime('%d/%m/%Y'),
-                    'telefono': persona.Telefono or 'No registrado',
-                    'email': persona.Email or 'No registrado',
-                    'direccion': persona.Direccion or 'No registrada',
-                }
-            })
-        else:
-            return JsonResponse({
-                'encontrado': False,
-                'mensaje': 'No se encontró una persona con ese RUT'
-            })
-    
-    except Exception as e:
-        return JsonResponse({
-            'encontrado': False,
-            'mensaje': f'Error al buscar: {str(e)}'
-        }, status=400)
+    return respuesta_json(await AUTOCOMPLETADO_PERSONA.resolver(rut))
     
 
     # AGREGAR ESTAS FUNCIONES AL FINAL DE gestionApp/views.py
@@ -167,19 +202,11 @@ def buscar_persona_api(request):
 
 def gestionar_roles_persona(request, pk):
     """Vista para gestionar los roles de una persona"""
-    persona = get_object_or_404(Persona, pk=pk, Activo=True)
-    
-    # Verificar roles actuales
-    roles_actuales = {
-        'es_paciente': hasattr(persona, 'paciente'),
-        'es_medico': hasattr(persona, 'medico'),
-        'es_matrona': hasattr(persona, 'matrona'),
-        'es_tens': hasattr(persona, 'tens'),
-    }
+    persona = obtener_persona_con_roles(pk, cargar=True, Activo=True)
     
     context = {
         'persona': persona,
-        'roles': roles_actuales,
+        'roles': roles_persona(persona),
     }
     
     return render(request, 'Gestion/Formularios/gestionar_roles.html', context)
@@ -187,10 +214,10 @@ def gestionar_roles_persona(request, pk):
 
 def asignar_rol_paciente(request, pk):
     """Asignar rol de Paciente a una persona"""
-    persona = get_object_or_404(Persona, pk=pk, Activo=True)
+    persona = obtener_persona_con_roles(pk, Activo=True)
     
     # Verificar si ya es paciente
-    if hasattr(persona, 'paciente'):
+    if tiene_rol(persona, 'paciente'):
         messages.warning(request, "⚠️ Esta persona ya tiene el rol de Paciente.")
         return redirect('gestion:gestionar_roles', pk=pk)
     
@@ -221,9 +248,9 @@ def asignar_rol_paciente(request, pk):
 
 def asignar_rol_medico(request, pk):
     """Asignar rol de Médico a una persona"""
-    persona = get_object_or_404(Persona, pk=pk, Activo=True)
+    persona = obtener_persona_con_roles(pk, Activo=True)
     
-    if hasattr(persona, 'medico'):
+    if tiene_rol(persona, 'medico'):
         messages.warning(request, "⚠️ Esta persona ya tiene el rol de Médico.")
         return redirect('gestion:gestionar_roles', pk=pk)
     
@@ -251,9 +278,9 @@ def asignar_rol_medico(request, pk):
 
 def asignar_rol_matrona(request, pk):
     """Asignar rol de Matrona a una persona"""
-    persona = get_object_or_404(Persona, pk=pk, Activo=True)
+    persona = obtener_persona_con_roles(pk, Activo=True)
     
-    if hasattr(persona, 'matrona'):
+    if tiene_rol(persona, 'matrona'):
         messages.warning(request, "⚠️ Esta persona ya tiene el rol de Matrona.")
         return redirect('gestion:gestionar_roles', pk=pk)
     
@@ -281,9 +308,9 @@ def asignar_rol_matrona(request, pk):
 
 def asignar_rol_tens(request, pk):
     """Asignar rol de TENS a una persona"""
-    persona = get_object_or_404(Persona, pk=pk, Activo=True)
+    persona = obtener_persona_con_roles(pk, Activo=True)
     
-    if hasattr(persona, 'tens'):
+    if tiene_rol(persona, 'tens'):
         messages.warning(request, "⚠️ Esta persona ya tiene el rol de TENS.")
         return redirect('gestion:gestionar_roles', pk=pk)
     
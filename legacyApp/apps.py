@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LegacyappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'legacyApp'
+
+    def ready(self):
+        """Registra la medición de consultas en cada conexión nueva"""
+        from legacyApp import salud  # noqa: F401
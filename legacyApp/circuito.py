@@ -0,0 +1,115 @@
+# legacyApp/circuito.py
+"""
+Circuit breaker para la BD legacy
+Si el servidor legacy falla o no responde varias veces seguidas, el circuito se
+abre y las consultas fallan de inmediato (sin esperar el timeout) durante
+LEGACY_CIRCUITO_ESPERA segundos. Luego se deja pasar una consulta de prueba:
+si responde, el circuito se cierra; si falla, vuelve a abrirse.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DatabaseError
+
+
+CERRADO = 'cerrado'
+ABIERTO = 'abierto'
+SEMIABIERTO = 'semiabierto'
+
+FALLOS_DEFECTO = 3
+ESPERA_DEFECTO = 30
+
+
+class CircuitoAbierto(DatabaseError):
+    """La BD está marcada como no disponible; no se intentó la consulta"""
+
+
+class Circuito:
+    """Estado por proceso de un circuit breaker (seguro entre hilos)"""
+
+    def __init__(self, nombre, fallos_maximos=None, espera=None):
+        self.nombre = nombre
+        self._fallos_maximos = fallos_maximos
+        self._espera = espera
+        self._candado = threading.Lock()
+        self.reiniciar()
+
+    @property
+    def fallos_maximos(self):
+        return self._fallos_maximos or getattr(settings, 'LEGACY_CIRCUITO_FALLOS', FALLOS_DEFECTO)
+
+    @property
+    def espera(self):
+        return self._espera if self._espera is not None else getattr(settings, 'LEGACY_CIRCUITO_ESPERA', ESPERA_DEFECTO)
+
+    def reiniciar(self):
+        with self._candado:
+            self.estado = CERRADO
+            self.fallos = 0
+            self.abierto_desde = None
+            self._prueba_desde = None
+
+    def permitir(self):
+        """True si se puede intentar una consulta ahora"""
+        with self._candado:
+            if self.estado == CERRADO:
+                return True
+            if self.estado == ABIERTO and time.monotonic() - self.abierto_desde >= self.espera:
+                self.estado = SEMIABIERTO
+            if self.estado == SEMIABIERTO:
+                # Una prueba a la vez; si la prueba nunca informó resultado, se permite otra
+                ahora = time.monotonic()
+                if self._prueba_desde is None or ahora - self._prueba_desde >= self.espera:
+                    self._prueba_desde = ahora
+                    return True
+            return False
+
+    def registrar_exito(self):
+        with self._candado:
+            self.estado = CERRADO
+            self.fallos = 0
+            self.abierto_desde = None
+            self._prueba_desde = None
+
+    def registrar_fallo(self):
+        with self._candado:
+            self.fallos += 1
+            self._prueba_desde = None
+            if self.estado == SEMIABIERTO or self.fallos >= self.fallos_maximos:
+                self.estado = ABIERTO
+                self.abierto_desde = time.monotonic()
+
+    @contextmanager
+    def proteger(self):
+        """
+        Envuelve un acceso a la BD:
+            with circuito.proteger():
+                list(queryset)
+        Lanza CircuitoAbierto sin consultar si el circuito está abierto.
+        """
+        if not self.permitir():
+            raise CircuitoAbierto(f'BD {self.nombre} no disponible (circuito abierto)')
+        try:
+            yield
+        except DatabaseError:
+            self.registrar_fallo()
+            raise
+        except BaseException:
+            # Error ajeno a la BD: no cuenta como fallo, pero libera la prueba
+            with self._candado:
+                self._prueba_desde = None
+            raise
+        self.registrar_exito()
+
+    def resumen(self):
+        """Estado del circuito para el endpoint de salud"""
+        with self._candado:
+            reintento = None
+            if self.estado == ABIERTO:
+                reintento = round(max(0.0, self.espera - (time.monotonic() - self.abierto_desde)), 1)
+            return {'estado': self.estado, 'fallos_seguidos': self.fallos, 'reintento_en_s': reintento}
+
+
+circuito_legacy = Circuito('legacy')
@@ -0,0 +1,69 @@
+# legacyApp/historial.py
+"""
+Historial de controles prenatales desde la BD legacy
+- Búsqueda exacta por RUT normalizado (usa el índice paciente_rut).
+- Caché por RUT del listado liviano (id, fecha) con TTL configurable
+  (LEGACY_CACHE_TTL); el detalle de un control se lee solo al seleccionarlo.
+- Las lecturas se enrutan por LegacyRouter, que consulta el circuit breaker:
+  si legacy no responde, se falla rápido con CircuitoAbierto.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from legacyApp.models import ControlesPrevios
+from utilidad.rut_validator import normalizar_rut
+
+
+TTL_DEFECTO = 300
+
+
+def _ttl():
+    return getattr(settings, 'LEGACY_CACHE_TTL', TTL_DEFECTO)
+
+
+def _clave_historial(rut):
+    return f'legacy:controles:{rut}'
+
+
+def _clave_control(rut, control_id):
+    return f'legacy:control:{rut}:{control_id}'
+
+
+def historial_controles(rut):
+    """
+    Lista de {'id', 'fecha_control'} de los controles del RUT, más reciente primero.
+    Un RUT sin historial también se cachea (lista vacía).
+    """
+    rut = normalizar_rut(rut or '')
+    if not rut:
+        return []
+
+    clave = _clave_historial(rut)
+    controles = cache.get(clave)
+    if controles is None:
+        controles = list(
+            ControlesPrevios.objects
+            .filter(paciente_rut=rut)
+            .order_by('-fecha_control', '-id')
+            .values('id', 'fecha_control')
+        )
+        cache.set(clave, controles, _ttl())
+    return controles
+
+
+def control_detalle(rut, control_id):
+    """Control completo del RUT (o None si no existe o no es de ese RUT)"""
+    rut = normalizar_rut(rut or '')
+    clave = _clave_control(rut, control_id)
+    control = cache.get(clave)
+    if control is None:
+        control = ControlesPrevios.objects.filter(pk=control_id, paciente_rut=rut).first()
+        if control is None:
+            return None
+        cache.set(clave, control, _ttl())
+    return control
+
+
+def invalidar_historial(rut):
+    """Descarta el listado cacheado de un RUT (ej. tras una carga masiva)"""
+    cache.delete(_clave_historial(normalizar_rut(rut or '')))
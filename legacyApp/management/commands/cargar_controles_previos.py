@@ -0,0 +1,170 @@
+# ============================================
+# UBICACIÓN: legacyApp/management/commands/cargar_controles_previos.py
+# Carga masiva de controles prenatales históricos en la BD LEGACY (controles_previos)
+# ============================================
+
+import csv
+import os
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from legacyApp.models import ControlesPrevios
+from utilidad.rut_validator import MENSAJES_ERROR_RUT, validar_ruts
+from utilidad.carga_masiva import FORMATOS, leer_registros, en_lotes, Checkpoint, Medidor
+
+
+# Columnas cargables: todas las del modelo salvo el id autoincremental
+CAMPOS = [campo for campo in ControlesPrevios._meta.concrete_fields if not campo.primary_key]
+
+
+def validar_registro(registro, rut=None, error_rut=None):
+    """
+    Convierte un registro (dict de texto) en la tupla de valores Python de CAMPOS.
+    Lanza ValidationError con el motivo si algún valor no es válido.
+
+    `rut` / `error_rut`: resultado de validar_ruts() para este registro, cuando
+    el lote ya se validó completo (validar_lote); si no, se valida aquí.
+    """
+    if registro is None:
+        raise ValidationError('Registro ilegible')
+
+    valores = []
+    for campo in CAMPOS:
+        valor = registro.get(campo.name)
+        if isinstance(valor, str):
+            valor = valor.strip()
+        if valor in ('', None):
+            if campo.null:
+                valores.append(None)
+                continue
+            valor = None
+        elif campo.name == 'paciente_rut':
+            if rut is None and error_rut is None:
+                (rut,), (error_rut,) = validar_ruts([valor])
+            if error_rut:
+                raise ValidationError(f"{campo.name}: {MENSAJES_ERROR_RUT[error_rut]}")
+            valor = rut
+        try:
+            valores.append(campo.clean(valor, None))
+        except ValidationError as e:
+            raise ValidationError(f"{campo.name}: {'; '.join(e.messages)}")
+    return valores
+
+
+def validar_lote(lote):
+    """
+    Valida un lote [(numero, registro), ...]; los RUT se validan juntos con validar_ruts().
+
+    Returns:
+        tuple: (filas válidas, [(numero, motivo), ...] rechazados)
+    """
+    resultado = validar_ruts([(registro or {}).get('paciente_rut') for _, registro in lote])
+    filas, rechazos = [], []
+    for (numero, registro), rut, error_rut in zip(lote, resultado.ruts, resultado.errores):
+        try:
+            filas.append(validar_registro(registro, rut, error_rut))
+        except ValidationError as e:
+            rechazos.append((numero, '; '.join(e.messages)))
+    return filas, rechazos
+
+
+class Command(BaseCommand):
+    help = (
+        'Carga controles prenatales históricos (CSV con encabezado o JSONL, admite .gz) '
+        'en la tabla controles_previos de la BD LEGACY, por lotes y con checkpoint reanudable'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Archivo CSV / JSONL (.gz opcional)')
+        parser.add_argument('--formato', choices=FORMATOS, help='Default: según la extensión')
+        parser.add_argument('--lote', type=int, default=5000, help='Registros por transacción (default: 5000)')
+        parser.add_argument('--database', default='legacy', help='Alias de la BD destino (default: legacy)')
+        parser.add_argument('--checkpoint', help='Archivo de checkpoint (default: <archivo>.checkpoint.json)')
+        parser.add_argument('--errores', help='CSV de registros rechazados (default: <archivo>.errores.csv)')
+        parser.add_argument('--reiniciar', action='store_true', help='Ignora el checkpoint y carga desde el inicio')
+
+    def handle(self, *args, **options):
+        archivo = options['archivo']
+        if not os.path.exists(archivo):
+            raise CommandError(f'No existe el archivo {archivo}')
+        if options['lote'] < 1:
+            raise CommandError('--lote debe ser mayor a 0')
+
+        self.alias = options['database']
+        self.conexion = connections[self.alias]
+
+        checkpoint = Checkpoint(options['checkpoint'] or f'{archivo}.checkpoint.json', archivo)
+        if options['reiniciar']:
+            checkpoint.eliminar()
+        try:
+            procesados = checkpoint.cargar()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        insertados = checkpoint.datos['insertados']
+        rechazados = checkpoint.datos['rechazados']
+        if procesados:
+            self.stdout.write(self.style.WARNING(f'  ↪️  Reanudando desde el registro {procesados + 1}'))
+
+        ruta_errores = options['errores'] or f'{archivo}.errores.csv'
+        self.stdout.write(self.style.WARNING(f'\n📋 Cargando controles previos en "{self.alias}"...'))
+
+        medidor = Medidor()
+        with open(ruta_errores, 'a' if procesados else 'w', encoding='utf-8', newline='') as salida_errores:
+            errores = csv.writer(salida_errores)
+            if not procesados:
+                errores.writerow(['registro', 'motivo'])
+
+            registros = leer_registros(archivo, options['formato'], omitir=procesados)
+            for lote in en_lotes(registros, options['lote']):
+                filas, rechazos = validar_lote(lote)
+                errores.writerows(rechazos)
+                rechazados += len(rechazos)
+
+                with transaction.atomic(using=self.alias):
+                    self.insertar(filas)
+                salida_errores.flush()
+
+                procesados = lote[-1][0]
+                insertados += len(filas)
+                medidor.sumar(len(lote))
+                checkpoint.guardar(procesados=procesados, insertados=insertados, rechazados=rechazados)
+                self.stdout.write(
+                    f'  ✅ {procesados} registros ({insertados} insertados, {rechazados} rechazados) '
+                    f'- {medidor.filas_por_segundo:,.0f} filas/seg'
+                )
+
+        checkpoint.eliminar()
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ COMPLETADO: {insertados} insertados, {rechazados} rechazados '
+            f'en {medidor.segundos:.1f}s ({medidor.filas_por_segundo:,.0f} filas/seg)'
+        ))
+        if rechazados:
+            self.stdout.write(self.style.WARNING(f'  ⚠️  Detalle de rechazos en {ruta_errores}'))
+
+    def insertar(self, filas):
+        """
+        INSERT multi-fila. Cada sentencia lleva tantas filas como admita el motor
+        (límite de parámetros en SQLite; en MySQL, todo el lote).
+        """
+        if not filas:
+            return
+        operaciones = self.conexion.ops
+        tabla = operaciones.quote_name(ControlesPrevios._meta.db_table)
+        columnas = ', '.join(operaciones.quote_name(campo.column) for campo in CAMPOS)
+        marcadores_fila = '(' + ', '.join(['%s'] * len(CAMPOS)) + ')'
+        por_sentencia = operaciones.bulk_batch_size(CAMPOS, filas)
+
+        with self.conexion.cursor() as cursor:
+            for tramo in en_lotes(filas, por_sentencia):
+                parametros = [
+                    None if valor is None else campo.get_db_prep_save(valor, self.conexion)
+                    for fila in tramo
+                    for campo, valor in zip(CAMPOS, fila)
+                ]
+                cursor.execute(
+                    f'INSERT INTO {tabla} ({columnas}) VALUES {", ".join([marcadores_fila] * len(tramo))}',
+                    parametros,
+                )
@@ -0,0 +1,177 @@
+# legacyApp/salud.py
+"""
+Salud de las bases de datos (default y legacy)
+- MonitorBD por alias: latencias de las últimas consultas, éxitos, fallos y
+  último error. Lo alimenta un execute_wrapper instalado en cada conexión.
+- En legacy, los mismos resultados alimentan circuito_legacy. LegacyRouter llama a
+  verificar_disponible() antes de enrutar una lectura: con el circuito abierto
+  se falla de inmediato, sin esperar el timeout de conexión.
+
+Las métricas son por proceso (cada worker reporta las suyas).
+"""
+import threading
+import time
+from collections import deque
+
+from django.db import DatabaseError, connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from legacyApp.circuito import CircuitoAbierto, circuito_legacy
+from utilidad.metricas import percentiles
+
+
+MUESTRAS_LATENCIA = 1000
+
+# Alias protegidos por circuit breaker
+CIRCUITOS = {'legacy': circuito_legacy}
+
+
+class MonitorBD:
+    """Contadores y latencias recientes de un alias (seguro entre hilos)"""
+
+    def __init__(self, alias):
+        self.alias = alias
+        self._candado = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._candado:
+            self.latencias = deque(maxlen=MUESTRAS_LATENCIA)
+            self.exitos = 0
+            self.fallos = 0
+            self.ultimo_error = None
+            self.ultimo_fallo = None
+
+    def registrar(self, segundos, error=None):
+        with self._candado:
+            self.latencias.append(segundos * 1000)
+            if error is None:
+                self.exitos += 1
+            else:
+                self.fallos += 1
+                self.ultimo_error = f'{type(error).__name__}: {error}'
+                self.ultimo_fallo = time.time()
+
+    def resumen(self):
+        with self._candado:
+            latencias = list(self.latencias)
+            datos = {
+                'consultas': self.exitos,
+                'fallos': self.fallos,
+                'latencia_ms': percentiles(latencias) if latencias else None,
+                'muestras': len(latencias),
+                'ultimo_error': self.ultimo_error,
+                'ultimo_fallo_hace_s': round(time.time() - self.ultimo_fallo, 1) if self.ultimo_fallo else None,
+            }
+        circuito = CIRCUITOS.get(self.alias)
+        datos['circuito'] = circuito.resumen() if circuito else None
+        return datos
+
+
+_monitores = {}
+_candado_monitores = threading.Lock()
+
+
+def monitor(alias):
+    """MonitorBD del alias (se crea al primer uso)"""
+    with _candado_monitores:
+        if alias not in _monitores:
+            _monitores[alias] = MonitorBD(alias)
+        return _monitores[alias]
+
+
+def _registrar(alias, segundos, error=None):
+    monitor(alias).registrar(segundos, error)
+    circuito = CIRCUITOS.get(alias)
+    if circuito is not None:
+        if error is None:
+            circuito.registrar_exito()
+        else:
+            circuito.registrar_fallo()
+
+
+# ============================================
+# INSTRUMENTACIÓN DE CONEXIONES
+# ============================================
+
+class MedicionConsultas:
+    """execute_wrapper que mide cada consulta de una conexión"""
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            resultado = execute(sql, params, many, context)
+        except DatabaseError as e:
+            _registrar(self.alias, time.perf_counter() - inicio, e)
+            raise
+        _registrar(self.alias, time.perf_counter() - inicio)
+        return resultado
+
+
+def instalar_monitor(conexion):
+    """
+    Instala la medición en la conexión (una sola vez por hilo).
+    Va al inicio de la lista: execute_wrapper() de Django retira siempre el último.
+    """
+    if not any(isinstance(w, MedicionConsultas) for w in conexion.execute_wrappers):
+        conexion.execute_wrappers.insert(0, MedicionConsultas(conexion.alias))
+
+
+@receiver(connection_created)
+def _instalar_al_conectar(sender, connection, **kwargs):
+    instalar_monitor(connection)
+
+
+def verificar_disponible(alias):
+    """
+    Lanza CircuitoAbierto si el alias está marcado como caído.
+    Si aún no hay conexión, conecta aquí para que un fallo de conexión
+    (caída, timeout) también cuente para el circuito.
+    """
+    circuito = CIRCUITOS.get(alias)
+    if circuito is None:
+        return
+    if not circuito.permitir():
+        raise CircuitoAbierto(f'BD {alias} no disponible (circuito abierto)')
+
+    conexion = connections[alias]
+    if conexion.connection is None:
+        inicio = time.perf_counter()
+        try:
+            conexion.ensure_connection()
+        except DatabaseError as e:
+            _registrar(alias, time.perf_counter() - inicio, e)
+            raise
+
+
+def sondear(alias):
+    """Ejecuta SELECT 1 en el alias (pasando por el circuito); retorna True si respondió"""
+    try:
+        verificar_disponible(alias)
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except DatabaseError:
+        return False
+    return True
+
+
+def estado_bases(sondeo=False):
+    """Resumen de salud de todas las BD configuradas (opcionalmente con sondeo activo)"""
+    bases = {}
+    for alias in connections:
+        disponible = sondear(alias) if sondeo else None
+        datos = monitor(alias).resumen()
+        circuito = datos['circuito']
+        if disponible is False or (circuito and circuito['estado'] == 'abierto'):
+            datos['estado'] = 'caida'
+        elif circuito and circuito['estado'] == 'semiabierto':
+            datos['estado'] = 'recuperando'
+        else:
+            datos['estado'] = 'ok'
+        bases[alias] = datos
+    return bases
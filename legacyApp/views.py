@@ -1,3 +1,22 @@
-from django.shortcuts import render
+# legacyApp/views.py
+from django.http import JsonResponse
 
-# Create your views here.
+from legacyApp.salud import estado_bases
+
+
+def salud_bd(request):
+    """
+    Salud de las BD en JSON: latencias p50/p95/p99, fallos y estado del circuito.
+    ?sondeo=1 ejecuta además un SELECT 1 en cada alias.
+    Responde 503 solo si la BD principal está caída (legacy caída = degradado).
+    """
+    bases = estado_bases(sondeo=request.GET.get('sondeo') == '1')
+    principal_ok = bases['default']['estado'] != 'caida'
+    degradado = any(datos['estado'] != 'ok' for datos in bases.values())
+    return JsonResponse(
+        {
+            'estado': 'caido' if not principal_ok else 'degradado' if degradado else 'ok',
+            'bases': bases,
+        },
+        status=200 if principal_ok else 503,
+    )
@@ -2,6 +2,8 @@ from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from gestionApp.models import Paciente, Matrona, Tens
+from gestionApp.secuencias import siguiente_codigo, ultimo_sufijo
+from utilidad.cambios import SeguimientoCambiosMixin
 from medicoApp.models import Patologias
 
 
@@ -70,15 +72,10 @@ class IngresoPaciente(models.Model):
     def save(self, *args, **kwargs):
         if not self.numero_ficha:
             # Generar número de ficha automáticamente
-            ultimo_ingreso = IngresoPaciente.objects.order_by('-id').first()
-            if ultimo_ingreso:
-                try:
-                    numero = int(ultimo_ingreso.numero_ficha.split('-')[1]) + 1
-                except (IndexError, ValueError):
-                    numero = 1
-            else:
-                numero = 1
-            self.numero_ficha = f"ING-{numero:05d}"
+            self.numero_ficha = siguiente_codigo(
+                'ingreso_paciente', 'ING', 5,
+                inicial=lambda: ultimo_sufijo(IngresoPaciente, 'numero_ficha')
+            )
         super().save(*args, **kwargs)
 
 
@@ -86,7 +83,7 @@ class IngresoPaciente(models.Model):
 # MODELO DE FICHA OBSTÉTRICA
 # ============================================
 
-class FichaObstetrica(models.Model):
+class FichaObstetrica(SeguimientoCambiosMixin, models.Model):
     """Ficha clínica obstétrica completa"""
     
     paciente = models.ForeignKey(
@@ -418,15 +415,10 @@ class FichaObstetrica(models.Model):
     def save(self, *args, **kwargs):
         if not self.numero_ficha:
             # Generar número de ficha automáticamente
-            ultima_ficha = FichaObstetrica.objects.order_by('-id').first()
-            if ultima_ficha:
-                try:
-                    numero = int(ultima_ficha.numero_ficha.split('-')[1]) + 1
-                except (IndexError, ValueError):
-                    numero = 1
-            else:
-                numero = 1
-            self.numero_ficha = f"FO-{numero:05d}"
+            self.numero_ficha = siguiente_codigo(
+                'ficha_obstetrica', 'FO', 5,
+                inicial=lambda: ultimo_sufijo(FichaObstetrica, 'numero_ficha')
+            )
         super().save(*args, **kwargs)
     
     # ============================================
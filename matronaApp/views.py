@@ -11,10 +11,14 @@ from django.db.models import Q, Count, Prefetch
 
 from matronaApp.models import IngresoPaciente, FichaObstetrica, MedicamentoFicha
 from gestionApp.models import Persona, Paciente, Matrona
+from gestionApp.busqueda import buscar_pacientes
 from gestionApp.forms.Gestion_form import PacienteForm
 from matronaApp.forms.ingreso_forms import IngresoPacienteForm
 from matronaApp.forms.ficha_forms import FichaObstetricaForm
-from legacyApp.models import ControlesPrevios
+from legacyApp.historial import historial_controles, control_detalle
+from utilidad.paginacion import ACTIVO, filtros_desde_parametros, opciones, paginar_keyset
+from utilidad.autocompletar import Autocompletado, respuesta_json
+from utilidad.rut_validator import normalizar_rut
 
 
 
@@ -34,14 +38,44 @@ def menu_matrona(request):
 # VISTAS DE PACIENTE
 # ============================================
 
+# Órdenes del listado de pacientes (cada uno con su índice en Paciente.Meta); 'pk' desempata
+ORDENES_PACIENTES = {
+    'recientes': ('-Fecha_y_Hora_Ingreso', '-pk'),
+    'antiguos': ('Fecha_y_Hora_Ingreso', 'pk'),
+}
+FILTROS_PACIENTES = {
+    'activo': ('activo', ACTIVO, '1'),
+    'prevision': ('Previcion', opciones(Paciente.PREVISION_CHOICES), None),
+    'consultorio': ('Consultorio', opciones(Paciente.CONSULTORIO_CHOICES), None),
+    'nacionalidad': ('persona__Nacionalidad', opciones(Persona.NACIONALIDAD_CHOICES), None),
+}
+
+
 class PacienteListView(ListView):
-    """Listado de todos los pacientes"""
+    """Listado de pacientes, paginado por cursor, con filtros y orden por URL"""
     model = Paciente
     template_name = 'Matrona/Data/paciente_list.html'
     context_object_name = 'pacientes'
     
     def get_queryset(self):
-        return Paciente.objects.filter(activo=True).select_related('persona')
+        filtros, self.filtros_aplicados = filtros_desde_parametros(self.request.GET, FILTROS_PACIENTES)
+        return Paciente.objects.filter(**filtros).select_related('persona')
+    
+    def get_context_data(self, **kwargs):
+        orden = self.request.GET.get('orden')
+        if orden not in ORDENES_PACIENTES:
+            orden = 'recientes'
+        pagina = paginar_keyset(self.object_list, ORDENES_PACIENTES[orden], self.request.GET, contar=True)
+        return super().get_context_data(
+            object_list=pagina,
+            pagina=pagina,
+            orden=orden,
+            filtros=self.filtros_aplicados,
+            previsiones=Paciente.PREVISION_CHOICES,
+            consultorios=Paciente.CONSULTORIO_CHOICES,
+            nacionalidades=Persona.NACIONALIDAD_CHOICES,
+            **kwargs,
+        )
 
 
 class PacienteDetailView(DetailView):
@@ -59,22 +93,16 @@ class PacienteDetailView(DetailView):
         rut = (paciente.persona.Rut or "").strip()
 
         try:
-            # Consulta SIEMPRE contra la BD legacy
-            controles = (ControlesPrevios.objects
-                         .using("legacy")
-                         .filter(paciente_rut__iexact=rut)
-                         .order_by("-fecha_control"))
-
-            controles = list(controles)   # materializa para el template
+            # Listado liviano cacheado por RUT (BD legacy, búsqueda exacta)
+            controles = historial_controles(rut)
 
-            # seleccionar control por ?ctrl=<id> (o el más reciente)
+            # seleccionar control por ?ctrl=<id> (o el más reciente); solo ese se lee completo
             sel_id = self.request.GET.get("ctrl")
+            ids = [c["id"] for c in controles]
             seleccionado = None
             if controles:
-                if sel_id:
-                    seleccionado = next((c for c in controles if str(c.id) == str(sel_id)), controles[0])
-                else:
-                    seleccionado = controles[0]
+                elegido = int(sel_id) if sel_id and sel_id.isdigit() and int(sel_id) in ids else ids[0]
+                seleccionado = control_detalle(rut, elegido)
 
             ctx.update({
                 "legacy_controles": controles,
@@ -121,14 +149,7 @@ def buscar_paciente(request):
     pacientes = []
     
     if query:
-        pacientes = Paciente.objects.filter(
-            Q(activo=True)
-        ).filter(
-            Q(persona__Rut__icontains=query) |
-            Q(persona__Nombre__icontains=query) |
-            Q(persona__Apellido_Paterno__icontains=query) |
-            Q(persona__Apellido_Materno__icontains=query)
-        ).select_related('persona')
+        pacientes = buscar_pacientes(query)
     
     return render(request, 'Matrona/Data/buscar_paciente.html', {
         'pacientes': pacientes,
@@ -180,15 +201,11 @@ def seleccionar_paciente_ficha(request):
     pacientes = []
     
     if query:
-        pacientes = Paciente.objects.filter(
-            Q(activo=True)
-        ).filter(
-            Q(persona__Rut__icontains=query) |
-            Q(persona__Nombre__icontains=query) |
-            Q(persona__Apellido_Paterno__icontains=query) |
-            Q(persona__Apellido_Materno__icontains=query)
-        ).select_related('persona').annotate(
-            num_fichas=Count('fichas_obstetricas')
+        pacientes = buscar_pacientes(
+            query,
+            queryset=Paciente.objects.filter(activo=True).select_related('persona').annotate(
+                num_fichas=Count('fichas_obstetricas')
+            )
         )
     
     return render(request, 'Matrona/Data/seleccionar_paciente_ficha.html', {
@@ -254,6 +271,8 @@ def lista_fichas_paciente(request, paciente_pk):
         'matrona_responsable__persona'
     ).prefetch_related(
         'patologias'
+    ).annotate(
+        total_medicamentos=Count('medicamentos')
     ).order_by('-fecha_creacion')
     
     return render(request, 'Matrona/Data/lista_fichas.html', {
@@ -380,7 +399,7 @@ def lista_todas_fichas(request):
     fichas = FichaObstetrica.objects.select_related(
         'paciente__persona',
         'matrona_responsable__persona'
-    ).order_by('-fecha_creacion')
+    ).prefetch_related('patologias')
     
     # Filtros opcionales
     activa = request.GET.get('activa')
@@ -389,8 +408,12 @@ def lista_todas_fichas(request):
     elif activa == '0':
         fichas = fichas.filter(activa=False)
     
+    # Paginación por cursor (usa el índice de -fecha_creacion)
+    pagina = paginar_keyset(fichas, ('-fecha_creacion', '-id'), request.GET, contar=True)
+    
     return render(request, 'Matrona/Data/todas_fichas.html', {
-        'fichas': fichas
+        'fichas': pagina,
+        'pagina': pagina,
     })
 
 
@@ -414,12 +437,40 @@ def eliminar_patologia(request, paciente_pk, patologia_pk):
 # API REST (AJAX) - Para búsquedas dinámicas
 # ============================================
 
-def buscar_paciente_api(request):
+async def _paciente_por_rut(rut):
+    paciente = await Paciente.objects.select_related('persona').filter(
+        persona__Rut=rut,
+        activo=True
+    ).afirst()
+    if paciente is None:
+        return {
+            'encontrado': False,
+            'mensaje': 'No se encontró un paciente activo con ese RUT'
+        }
+    return {
+        'encontrado': True,
+        'paciente': {
+            'id': paciente.pk,
+            'rut': paciente.persona.Rut,
+            'nombre_completo': f'{paciente.persona.Nombre} {paciente.persona.Apellido_Paterno} {paciente.persona.Apellido_Materno}',
+            'edad': paciente.edad,
+            'telefono': paciente.persona.Telefono or '',
+            'estado_civil': paciente.get_Estado_civil_display(),
+            'prevision': paciente.get_Previcion_display(),
+            'acompanante': paciente.Acompañante or '',
+            'contacto_emergencia': paciente.Contacto_emergencia or '',
+        }
+    }
+
+AUTOCOMPLETADO_PACIENTE = Autocompletado('matrona:api_buscar_paciente', _paciente_por_rut)
+
+
+async def buscar_paciente_api(request):
     """
     Buscar paciente vía AJAX (retorna JSON)
-    Usado en formularios para autocompletar datos
+    Usado en formularios para autocompletar datos (async, cacheada por RUT normalizado)
     """
-    rut = request.GET.get('rut', '').strip()
+    rut = normalizar_rut(request.GET.get('rut', '').strip())
     
     if not rut:
         return JsonResponse({
@@ -427,31 +478,7 @@ def buscar_paciente_api(request):
             'mensaje': 'RUT no proporcionado'
         })
     
-    try:
-        paciente = Paciente.objects.select_related('persona').get(
-            persona__Rut=rut,
-            activo=True
-        )
-        
-        return JsonResponse({
-            'encontrado': True,
-            'paciente': {
-                'id': paciente.pk,
-                'rut': paciente.persona.Rut,
-                'nombre_completo': f'{paciente.persona.Nombre} {paciente.persona.Apellido_Paterno} {paciente.persona.Apellido_Materno}',
-                'edad': paciente.Edad,
-                'telefono': paciente.persona.Telefono or '',
-                'estado_civil': paciente.get_Estado_civil_display(),
-                'prevision': paciente.get_Previcion_display(),
-                'acompanante': paciente.Acompañante or '',
-                'contacto_emergencia': paciente.Contacto_emergencia or '',
-            }
-        })
-    except Paciente.DoesNotExist:
-        return JsonResponse({
-            'encontrado': False,
-            'mensaje': 'No se encontró un paciente activo con ese RUT'
-        })
+    return respuesta_json(await AUTOCOMPLETADO_PACIENTE.resolver(rut))
 
 
 def buscar_persona_api(request):
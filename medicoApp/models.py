@@ -1,6 +1,7 @@
 from django.db import models
+from utilidad.cambios import SeguimientoCambiosMixin
 
-class Patologias(models.Model):
+class Patologias(SeguimientoCambiosMixin, models.Model):
     """Catálogo de patologías obstétricas"""
 
     CIE_10_CHOICES = [
@@ -155,17 +155,13 @@ def buscar_paciente_medico(request):
     
     if query:
         from gestionApp.models import Paciente
-        from django.db.models import Q, Count
+        from gestionApp.busqueda import buscar_pacientes
         
-        pacientes = Paciente.objects.filter(
-            Q(activo=True)
-        ).filter(
-            Q(persona__Rut__icontains=query) |
-            Q(persona__Nombre__icontains=query) |
-            Q(persona__Apellido_Paterno__icontains=query) |
-            Q(persona__Apellido_Materno__icontains=query)
-        ).select_related('persona').annotate(
-            num_fichas=Count('fichas_obstetricas')
+        pacientes = buscar_pacientes(
+            query,
+            queryset=Paciente.objects.filter(activo=True).select_related('persona').annotate(
+                num_fichas=Count('fichas_obstetricas')
+            )
         )
     
     return render(request, 'Medico/Data/buscar_paciente.html', {
@@ -0,0 +1,76 @@
+# obstetric_care/db/mysql_pool/base.py
+"""
+Backend MySQL con pool de conexiones por proceso
+ENGINE = 'obstetric_care.db.mysql_pool' y, en OPTIONS, la clave 'pool':
+
+    'OPTIONS': {
+        'charset': 'utf8mb4',
+        'pool': {'tamano': 20, 'espera': 5, 'vida_maxima': 1800, 'pre_ping': True},
+    }
+
+Django sigue "cerrando" la conexión al final de cada request (CONN_MAX_AGE = 0);
+este backend la devuelve al pool en vez de cerrar el socket, así el siguiente
+request se ahorra el handshake TCP + autenticación.
+"""
+import threading
+
+from django.db.backends.mysql import base as mysql_base
+from django.db.backends.mysql.base import Database
+
+from obstetric_care.db.mysql_pool.pool import PoolConexiones, PoolAgotado
+
+
+_pools = {}
+_candado_pools = threading.Lock()
+
+
+def obtener_pool(alias):
+    return _pools.get(alias)
+
+
+class DatabaseWrapper(mysql_base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def _pool(self, conn_params):
+        with _candado_pools:
+            pool = _pools.get(self.alias)
+            if pool is None:
+                opciones = self.settings_dict['OPTIONS'].get('pool') or {}
+                pool = _pools[self.alias] = PoolConexiones(
+                    crear=lambda: mysql_base.DatabaseWrapper.get_new_connection(self, conn_params),
+                    error_conexion=Database.Error,
+                    **opciones,
+                )
+            return pool
+
+    def get_new_connection(self, conn_params):
+        try:
+            conexion = self._pool(conn_params).tomar()
+        except PoolAgotado as e:
+            raise Database.OperationalError(str(e)) from e
+        return conexion
+
+    def init_connection_state(self):
+        # Las variables de sesión (SQL_AUTO_IS_NULL, aislamiento) sobreviven al préstamo
+        if getattr(self.connection, '_estado_inicializado', False):
+            return
+        super().init_connection_state()
+        self.connection._estado_inicializado = True
+
+    def _close(self):
+        if self.connection is None:
+            return
+        # Cerrada a mitad de un atomic(): Django conserva la referencia hasta salir
+        # del bloque, así que no puede volver al pool. Tras un error, se descarta.
+        descartar = self.in_atomic_block or self.errors_occurred
+        with self.wrap_database_errors:
+            _pools[self.alias].devolver(
+                self.connection,
+                descartar=descartar,
+                # En autocommit no queda transacción abierta: se ahorra el ROLLBACK
+                revertir=not self.autocommit,
+            )
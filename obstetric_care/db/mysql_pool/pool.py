@@ -0,0 +1,116 @@
+# obstetric_care/db/mysql_pool/pool.py
+"""
+Pool de conexiones por proceso, independiente del driver
+- `tamano`: máximo de conexiones abiertas (prestadas + libres) por alias.
+- `espera`: segundos que se espera un cupo antes de fallar.
+- `vida_maxima`: segundos tras los cuales una conexión se recicla.
+- `pre_ping`: verifica la conexión al prestarla (descarta las cortadas por el servidor).
+Se entregan primero las conexiones devueltas más recientemente (LIFO), que
+son las que menos probablemente cerró el servidor por inactividad.
+"""
+import threading
+import time
+from collections import deque
+
+
+class PoolAgotado(Exception):
+    """No se liberó ninguna conexión dentro del tiempo de espera"""
+
+
+class PoolConexiones:
+
+    def __init__(self, crear, tamano=10, espera=5, vida_maxima=1800, pre_ping=True,
+                 ping=None, error_conexion=Exception):
+        """
+        Args:
+            crear (callable): Abre una conexión nueva del driver
+            ping (callable): ping(conexion) lanza `error_conexion` si está cortada
+        """
+        self._crear = crear
+        self._ping = ping or (lambda conexion: conexion.ping(reconnect=False))
+        self._error_conexion = error_conexion
+        self.tamano = tamano
+        self.espera = espera
+        self.vida_maxima = vida_maxima
+        self.pre_ping = pre_ping
+
+        self._libres = deque()          # (conexion, creada_en)
+        self._creadas = {}              # id(conexion) -> creada_en, de todas las abiertas
+        self._cupos = threading.BoundedSemaphore(tamano)
+        self._candado = threading.Lock()
+
+    # ---------- préstamo ----------
+
+    def tomar(self):
+        """Presta una conexión; lanza PoolAgotado si no hay cupo en `espera` segundos"""
+        if not self._cupos.acquire(timeout=self.espera):
+            raise PoolAgotado(f'Sin conexiones libres tras {self.espera}s (tamaño {self.tamano})')
+        try:
+            while True:
+                with self._candado:
+                    conexion, creada_en = self._libres.pop() if self._libres else (None, None)
+                if conexion is None:
+                    return self._nueva()
+                if self.vida_maxima and time.monotonic() - creada_en > self.vida_maxima:
+                    self._cerrar(conexion)
+                    continue
+                if self.pre_ping:
+                    try:
+                        self._ping(conexion)
+                    except self._error_conexion:
+                        self._cerrar(conexion)
+                        continue
+                return conexion
+        except BaseException:
+            self._cupos.release()
+            raise
+
+    def devolver(self, conexion, descartar=False, revertir=True):
+        """
+        Devuelve una conexión prestada. Con `descartar=True` (o si el rollback
+        falla) se cierra en lugar de volver al pool. `revertir=False` omite el
+        rollback cuando el llamador sabe que no hay transacción abierta.
+        """
+        try:
+            if not descartar and revertir:
+                try:
+                    conexion.rollback()
+                except self._error_conexion:
+                    descartar = True
+            if descartar:
+                self._cerrar(conexion)
+            else:
+                with self._candado:
+                    self._libres.append((conexion, self._creadas[id(conexion)]))
+        finally:
+            self._cupos.release()
+
+    # ---------- administración ----------
+
+    def _nueva(self):
+        conexion = self._crear()
+        with self._candado:
+            self._creadas[id(conexion)] = time.monotonic()
+        return conexion
+
+    def _cerrar(self, conexion):
+        with self._candado:
+            self._creadas.pop(id(conexion), None)
+        try:
+            conexion.close()
+        except self._error_conexion:
+            pass
+
+    def cerrar_libres(self):
+        """Cierra las conexiones libres (ej. al terminar el proceso o en tests)"""
+        with self._candado:
+            libres = list(self._libres)
+            self._libres.clear()
+        for conexion, _ in libres:
+            self._cerrar(conexion)
+
+    def estadisticas(self):
+        with self._candado:
+            abiertas = len(self._creadas)
+            libres = len(self._libres)
+        return {'tamano': self.tamano, 'abiertas': abiertas, 'libres': libres, 'prestadas': abiertas - libres}
@@ -1,8 +1,13 @@
+from legacyApp.salud import verificar_disponible
+
+
 class LegacyRouter:
     app_label = "legacyApp"
 
     def db_for_read(self, model, **hints):
         if model._meta.app_label == self.app_label:
+            # Falla de inmediato (CircuitoAbierto) si legacy está marcada como caída
+            verificar_disponible("legacy")
             return "legacy"
         return None
 
@@ -0,0 +1,234 @@
+# obstetric_care/instrumentacion.py
+"""
+Instrumentación por vista: consultas SQL, tiempo SQL y tiempo de render
+- MedicionMiddleware mide cada request y lo agrupa por nombre de vista
+  ('app:nombre' según las URLs), separando las consultas por alias de BD
+  (default / legacy).
+- Presupuestos de consultas por vista (PRESUPUESTO_CONSULTAS): al excederse
+  se registra un warning o, con PRESUPUESTO_CONSULTAS_ESTRICTO (tests), se
+  lanza PresupuestoExcedido para que la prueba falle.
+- metricas_vistas: JSON con p50/p95/p99 por vista (/salud/vistas/).
+
+Las métricas son por proceso, como las de /salud/bd/.
+"""
+import logging
+import threading
+import time
+from collections import deque, Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import JsonResponse
+
+from utilidad.metricas import percentiles
+
+
+logger = logging.getLogger(__name__)
+
+MUESTRAS_POR_VISTA = 500
+
+_medicion_actual = ContextVar('medicion_request', default=None)
+
+
+class PresupuestoExcedido(AssertionError):
+    """Una vista ejecutó más consultas que las permitidas en PRESUPUESTO_CONSULTAS"""
+
+
+# ============================================
+# MEDICIÓN DE UN REQUEST
+# ============================================
+
+class MedicionRequest:
+    """Acumuladores de un request en curso"""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.consultas = Counter()
+        self.segundos_sql = 0.0
+        self.segundos_plantilla = 0.0
+        self._profundidad_plantilla = 0
+
+    @property
+    def total_consultas(self):
+        return sum(self.consultas.values())
+
+
+class ContadorConsultas:
+    """execute_wrapper que suma cada consulta del alias a la medición del request"""
+
+    def __init__(self, alias, medicion):
+        self.alias = alias
+        self.medicion = medicion
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.medicion.consultas[self.alias] += 1
+            self.medicion.segundos_sql += time.perf_counter() - inicio
+
+
+def instalar_medicion_plantillas():
+    """Envuelve el render del backend de templates de Django (una sola vez por proceso)"""
+    from django.template.backends.django import Template
+
+    if getattr(Template.render, '_medido', False):
+        return
+    original = Template.render
+
+    @wraps(original)
+    def render(self, context=None, request=None):
+        medicion = _medicion_actual.get()
+        if medicion is None:
+            return original(self, context, request)
+        # Solo se mide el template más externo (render_to_string anidados no se suman dos veces)
+        medicion._profundidad_plantilla += 1
+        inicio = time.perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            medicion._profundidad_plantilla -= 1
+            if medicion._profundidad_plantilla == 0:
+                medicion.segundos_plantilla += time.perf_counter() - inicio
+
+    render._medido = True
+    Template.render = render
+
+
+# ============================================
+# MÉTRICAS ACUMULADAS POR VISTA
+# ============================================
+
+class MetricasVista:
+    """Últimas muestras de una vista (seguro entre hilos)"""
+
+    def __init__(self):
+        self._candado = threading.Lock()
+        self.muestras = deque(maxlen=MUESTRAS_POR_VISTA)
+        self.requests = 0
+        self.excesos = 0
+        self.consultas_por_alias = Counter()
+
+    def registrar(self, total_ms, sql_ms, plantilla_ms, consultas, excedido):
+        with self._candado:
+            self.muestras.append((total_ms, sql_ms, plantilla_ms, sum(consultas.values())))
+            self.requests += 1
+            self.excesos += excedido
+            self.consultas_por_alias.update(consultas)
+
+    def resumen(self):
+        with self._candado:
+            muestras = list(self.muestras)
+            datos = {
+                'requests': self.requests,
+                'excesos_presupuesto': self.excesos,
+                'consultas_por_alias': dict(self.consultas_por_alias),
+            }
+        columnas = list(zip(*muestras))
+        for nombre, valores in zip(('total_ms', 'sql_ms', 'plantilla_ms', 'consultas'), columnas):
+            datos[nombre] = percentiles(valores)
+        return datos
+
+
+_metricas = {}
+_candado_metricas = threading.Lock()
+
+
+def metricas(vista):
+    with _candado_metricas:
+        if vista not in _metricas:
+            _metricas[vista] = MetricasVista()
+        return _metricas[vista]
+
+
+def reiniciar_metricas():
+    with _candado_metricas:
+        _metricas.clear()
+
+
+def resumen_vistas():
+    with _candado_metricas:
+        vistas = dict(_metricas)
+    presupuestos = getattr(settings, 'PRESUPUESTO_CONSULTAS', {})
+    return {
+        vista: {**datos.resumen(), 'presupuesto': presupuestos.get(vista)}
+        for vista, datos in sorted(vistas.items())
+    }
+
+
+def nombre_vista(request):
+    coincidencia = getattr(request, 'resolver_match', None)
+    if coincidencia is None:
+        return None
+    return coincidencia.view_name or coincidencia._func_path
+
+
+# ============================================
+# MIDDLEWARE
+# ============================================
+
+class MedicionMiddleware:
+    """
+    Mide consultas (por alias), tiempo SQL y render de templates de cada request.
+    Debe ir al inicio de MIDDLEWARE para incluir lo que hacen los demás middlewares.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'MEDICION_VISTAS', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instalar_medicion_plantillas()
+
+    def __call__(self, request):
+        medicion = MedicionRequest()
+        token = _medicion_actual.set(medicion)
+        try:
+            with ExitStack() as pila:
+                for alias in connections:
+                    pila.enter_context(connections[alias].execute_wrapper(ContadorConsultas(alias, medicion)))
+                response = self.get_response(request)
+        finally:
+            _medicion_actual.reset(token)
+
+        vista = nombre_vista(request)
+        if vista is not None:
+            self.registrar(vista, medicion, response)
+        return response
+
+    def registrar(self, vista, medicion, response):
+        total_ms = (time.perf_counter() - medicion.inicio) * 1000
+        sql_ms = medicion.segundos_sql * 1000
+        plantilla_ms = medicion.segundos_plantilla * 1000
+
+        presupuestos = getattr(settings, 'PRESUPUESTO_CONSULTAS', {})
+        limite = presupuestos.get(vista, getattr(settings, 'PRESUPUESTO_CONSULTAS_DEFECTO', None))
+        excedido = limite is not None and medicion.total_consultas > limite
+
+        metricas(vista).registrar(total_ms, sql_ms, plantilla_ms, medicion.consultas, excedido)
+
+        if settings.DEBUG:
+            response['Server-Timing'] = (
+                f'sql;dur={sql_ms:.1f};desc="{medicion.total_consultas} consultas", '
+                f'tpl;dur={plantilla_ms:.1f}, total;dur={total_ms:.1f}'
+            )
+
+        if excedido:
+            mensaje = (
+                f'{vista}: {medicion.total_consultas} consultas '
+                f'({dict(medicion.consultas)}) exceden el presupuesto de {limite}'
+            )
+            if getattr(settings, 'PRESUPUESTO_CONSULTAS_ESTRICTO', False):
+                raise PresupuestoExcedido(mensaje)
+            logger.warning(mensaje)
+
+
+def metricas_vistas(request):
+    """JSON con percentiles de latencia, SQL, render y consultas por vista"""
+    if request.GET.get('reiniciar') == '1':
+        reiniciar_metricas()
+    return JsonResponse({'vistas': resumen_vistas()})
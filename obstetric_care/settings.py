@@ -48,6 +48,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'obstetric_care.instrumentacion.MedicionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -102,13 +103,118 @@ DATABASES = {
         'PASSWORD': '12345678',
         'HOST': '127.0.0.1',
         'PORT': '3306',
-        'OPTIONS': {'charset': 'utf8mb4'},
+        # Timeouts (segundos) para que un servidor legacy lento no bloquee las vistas
+        'OPTIONS': {'charset': 'utf8mb4', 'connect_timeout': 2, 'read_timeout': 5},
     },
 }
 
+# Modo de conexión a MySQL (variable de entorno OBSTETRIC_MODO_CONEXION):
+#   'pool'        pool por proceso con límite de tamaño y pre-ping (obstetric_care/db/mysql_pool)
+#   'persistente' una conexión por hilo reutilizada CONN_MAX_AGE segundos (nativo de Django)
+#   'ninguno'     conexión nueva en cada request
+MODO_CONEXION_BD = os.environ.get('OBSTETRIC_MODO_CONEXION', 'pool')
+
+# tamano: conexiones máximas por proceso | espera: segundos esperando un cupo
+# vida_maxima: segundos antes de reciclar una conexión (menor que wait_timeout de MySQL)
+POOL_BD = {
+    'default': {'tamano': 20, 'espera': 5, 'vida_maxima': 1800, 'pre_ping': True},
+    # Legacy es de consulta: pool chico y espera corta para no retener workers
+    'legacy': {'tamano': 5, 'espera': 2, 'vida_maxima': 600, 'pre_ping': True},
+}
+
+for _alias, _bd in DATABASES.items():
+    if MODO_CONEXION_BD == 'pool':
+        _bd['ENGINE'] = 'obstetric_care.db.mysql_pool'
+        _bd['OPTIONS']['pool'] = POOL_BD[_alias]
+    elif MODO_CONEXION_BD == 'persistente':
+        _bd['CONN_MAX_AGE'] = 300
+        _bd['CONN_HEALTH_CHECKS'] = True
+
 # Router para impedir migraciones y escrituras en la base legacy
 DATABASE_ROUTERS = ['obstetric_care.dbrouters.LegacyRouter']
 
+# Números correlativos (ING-, FO-, PARTO-) que cada proceso reserva por bloque.
+# Valores > 1 evitan bloquear la tabla de secuencias en cada inserción (puede dejar saltos).
+SECUENCIAS_TAMANO_BLOQUE = 20
+
+# Caché en memoria por proceso (estadísticas de menús consultadas en cada recarga)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'obstetric-care',
+    }
+}
+
+# Segundos que se reutilizan las estadísticas del menú de partos.
+# Las señales de partosApp invalidan el caché del proceso al guardar; el TTL
+# acota la desactualización entre procesos.
+PARTOS_MENU_CACHE_TTL = 60
+
+# Segundos que se reutiliza la cola de dosis del turno (tensApp.dosis).
+# Las señales de tensApp invalidan el caché del proceso al registrar una
+# administración; el TTL acota cuánto puede otro worker mostrarla aún pendiente.
+TENS_COLA_DOSIS_TTL = 30
+
+# Historial de controles de la BD legacy: segundos en caché por RUT y circuit breaker
+# (fallos seguidos para abrir el circuito / segundos antes de reintentar)
+LEGACY_CACHE_TTL = 300
+LEGACY_CIRCUITO_FALLOS = 3
+LEGACY_CIRCUITO_ESPERA = 30
+
+# APIs de autocompletado (utilidad.autocompletar): segundos que se reutiliza un
+# resultado y entradas máximas por endpoint. Las señales de gestionApp vacían el
+# caché del proceso al guardar; el TTL acota la desactualización entre procesos.
+AUTOCOMPLETAR_CACHE_TTL = 10
+AUTOCOMPLETAR_CACHE_MAXIMO = 1024
+
+# Puntaje MEOWS desde el cual una paciente aparece en el listado de alertas TENS
+MEOWS_UMBRAL_ALERTA = 5
+
+# Instrumentación por vista (obstetric_care/instrumentacion.py, métricas en /salud/vistas/)
+MEDICION_VISTAS = True
+# Máximo de consultas SQL por request según nombre de vista; al excederse se
+# registra un warning (o falla el test si PRESUPUESTO_CONSULTAS_ESTRICTO)
+PRESUPUESTO_CONSULTAS = {
+    # Matrona
+    'matrona:todas_fichas': 6,
+    'matrona:lista_pacientes': 3,
+    'matrona:detalle_paciente': 4,
+    'matrona:lista_fichas_paciente': 5,
+    'matrona:detalle_ficha': 5,
+    # Médico
+    'medico:listar_patologias': 3,
+    'medico:detalle_patologia': 3,
+    'medico:historial_clinico': 6,
+    # Gestión
+    'gestion:lista_personas': 4,
+    'gestion:detalle_persona': 6,
+    'gestion:gestionar_roles': 6,
+    # TENS
+    'tens:listar_tratamientos': 3,
+    'tens:listar_tratamientos_activos': 3,
+    'tens:listar_tratamientos_inactivos': 3,
+    'tens:listar_tratamientos_ficha': 4,
+    'tens:ver_fichas_paciente': 3,
+    'tens:detalle_ficha': 8,
+    'tens:alertas_meows': 2,
+    'tens:cola_dosis': 4,
+    'tens:api_cola_dosis': 4,
+    'tens:censo_sala': 6,
+    'tens:tendencia_signos': 3,
+    # Partos
+    'partos:listar_partos': 4,
+    'partos:detalle_parto': 4,
+    'partos:detalle_rn': 2,
+    # Asistente de parto: los pasos solo leen/escriben el borrador en la sesión
+    'partos:registrar_parto_paso1': 7,
+    'partos:registrar_parto_paso2': 4,
+    'partos:registrar_parto_paso3': 4,
+    'partos:registrar_parto_paso4': 4,
+    'partos:registrar_parto_paso5': 4,
+}
+PRESUPUESTO_CONSULTAS_DEFECTO = None
+PRESUPUESTO_CONSULTAS_ESTRICTO = False
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.urls import path, include
 from inicioApp import views as inicio_views
+from legacyApp import views as legacy_views
+from obstetric_care import instrumentacion
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -8,6 +10,11 @@ urlpatterns = [
     # Página principal
     path('', inicio_views.home, name='home'),
     
+    # Salud de las bases de datos (JSON)
+    path('salud/bd/', legacy_views.salud_bd, name='salud_bd'),
+    # Consultas y latencia por vista (JSON)
+    path('salud/vistas/', instrumentacion.metricas_vistas, name='metricas_vistas'),
+    
     # Apps del sistema
     path('gestion/', include('gestionApp.urls')),
     path('matrona/', include('matronaApp.urls')),
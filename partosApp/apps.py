@@ -12,6 +12,6 @@ class PartosappConfig(AppConfig):
     def ready(self):
         """
         Método que se ejecuta cuando la aplicación está lista
-        Aquí se pueden importar signals si es necesario
+        Registra las señales que invalidan el caché de estadísticas
         """
-        pass
\ No newline at end of file
+        from partosApp import signals  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,119 @@
+# partosApp/asistente.py
+"""
+Asistente de registro de parto por pasos, con borrador en la sesión
+Antes cada paso releía el RegistroParto de la sesión, validaba un ModelForm
+parcial y reescribía la fila completa (~60 columnas); además el paso 1 insertaba
+un registro incompleto que las columnas obligatorias de los pasos siguientes
+no permitían guardar.
+
+- Cada paso valida solo sus campos y guarda los valores enviados en el borrador
+  (sesión): los pasos intermedios no consultan ni escriben RegistroParto.
+- Al confirmar el último paso se aplican los formularios de todos los pasos
+  sobre una misma instancia y el parto se inserta una sola vez, en una transacción.
+"""
+from django.db import transaction
+
+from partosApp.forms import (
+    RegistroPartoBaseForm,
+    TrabajoDePartoForm,
+    InformacionPartoForm,
+    PuerperioForm,
+    AnestesiaAnalgesiaForm,
+    ProfesionalesForm,
+)
+from partosApp.models import RegistroParto
+
+
+PASOS = {
+    1: RegistroPartoBaseForm,
+    2: TrabajoDePartoForm,
+    3: InformacionPartoForm,
+    4: PuerperioForm,
+    5: AnestesiaAnalgesiaForm,
+    6: ProfesionalesForm,
+}
+TOTAL_PASOS = len(PASOS)
+
+CLAVE_SESION = 'borrador_parto'
+
+
+class BorradorParto:
+    """
+    Borrador del asistente guardado en request.session:
+    {'ficha': pk, 'pasos': {'1': {campo: valor, ...}, ...}}
+    Los valores son los enviados por el formulario (texto/bool), así al volver a
+    un paso se vuelven a validar igual que la primera vez.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    @property
+    def _datos(self):
+        return self.session.get(CLAVE_SESION)
+
+    @property
+    def activo(self):
+        return self._datos is not None
+
+    @property
+    def ficha_pk(self):
+        return self._datos['ficha'] if self.activo else None
+
+    def iniciar(self, ficha_pk):
+        """Comienza un borrador para la ficha (conserva el existente si es de la misma ficha)"""
+        if self.ficha_pk != ficha_pk:
+            self.session[CLAVE_SESION] = {'ficha': ficha_pk, 'pasos': {}}
+
+    def valores(self, paso):
+        if not self.activo:
+            return {}
+        return self._datos['pasos'].get(str(paso), {})
+
+    def paso_pendiente(self, hasta):
+        """Primer paso anterior a `hasta` que aún no se completó, o None"""
+        for paso in range(1, hasta):
+            if str(paso) not in self._datos['pasos']:
+                return paso
+        return None
+
+    def formulario(self, paso, data=None):
+        """Formulario del paso: ligado a `data` o con los valores del borrador como iniciales"""
+        if data is not None:
+            return PASOS[paso](data)
+        return PASOS[paso](initial=self.valores(paso))
+
+    def guardar_paso(self, paso, form):
+        """Guarda los valores de un formulario ya validado"""
+        datos = self._datos
+        datos['pasos'][str(paso)] = {campo: form[campo].value() for campo in form.fields}
+        if paso == 1:
+            datos['ficha'] = form.cleaned_data['ficha'].pk
+        # El dict de la sesión se modificó en el lugar: hay que marcarla
+        self.session.modified = True
+
+    def construir(self):
+        """
+        RegistroParto sin guardar con los datos de todos los pasos.
+
+        Returns:
+            tuple: (parto, None) o (None, paso) con el primer paso que ya no es válido
+        """
+        parto = RegistroParto()
+        for paso, Formulario in PASOS.items():
+            if not Formulario(self.valores(paso), instance=parto).is_valid():
+                return None, paso
+        return parto, None
+
+    def registrar(self):
+        """Inserta el parto (una vez, en una transacción) y descarta el borrador"""
+        parto, paso_invalido = self.construir()
+        if parto is None:
+            return None, paso_invalido
+        with transaction.atomic():
+            parto.save()
+        self.descartar()
+        return parto, None
+
+    def descartar(self):
+        self.session.pop(CLAVE_SESION, None)
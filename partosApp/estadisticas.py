@@ -0,0 +1,214 @@
+# partosApp/estadisticas.py
+"""
+Estadísticas del módulo de Partos
+Consultas agregadas (una por tabla) con rangos de fecha semiabiertos [inicio, fin),
+que usan los índices de fecha en lugar de funciones como __date / __year.
+
+Los reportes por rango (Robson, tipo de parto, bandas de peso) se leen de la
+tabla materializada EstadisticaDiariaParto, recalculada por día.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum, Min, Max, Case, When, Value
+from django.utils import timezone
+
+from partosApp.models import RegistroParto, RegistroRecienNacido, EstadisticaDiariaParto
+
+
+TIPOS_CESAREA = ['CESAREA_URGENCIA', 'CESAREA_ELECTIVA']
+TTL_MENU_DEFECTO = 60
+
+
+# ============================================
+# RANGOS DE FECHA
+# ============================================
+
+def inicio_del_dia(fecha):
+    """Datetime aware al inicio (00:00) del día `fecha` en la zona horaria local"""
+    return timezone.make_aware(datetime.combine(fecha, time.min))
+
+
+def rango_dia(fecha):
+    """Rango semiabierto [00:00 del día, 00:00 del día siguiente)"""
+    return inicio_del_dia(fecha), inicio_del_dia(fecha + timedelta(days=1))
+
+
+def rango_mes(fecha):
+    """Rango semiabierto [día 1 del mes, día 1 del mes siguiente)"""
+    primero = fecha.replace(day=1)
+    siguiente = (primero + timedelta(days=32)).replace(day=1)
+    return inicio_del_dia(primero), inicio_del_dia(siguiente)
+
+
+def filtro_rango(campo, rango):
+    """Q(campo__gte=inicio, campo__lt=fin)"""
+    inicio, fin = rango
+    return Q(**{f'{campo}__gte': inicio, f'{campo}__lt': fin})
+
+
+# ============================================
+# MENÚ DE PARTOS
+# ============================================
+
+def clave_menu(fecha):
+    return f'partos:menu:{fecha.isoformat()}'
+
+
+def calcular_resumen_menu(hoy):
+    """
+    Estadísticas del menú de partos para el día `hoy`:
+    una agregación condicional sobre RegistroParto y otra sobre RegistroRecienNacido.
+    """
+    dia = rango_dia(hoy)
+    mes = rango_mes(hoy)
+
+    partos = RegistroParto.objects.filter(activo=True).aggregate(
+        total_partos=Count('id'),
+        partos_hoy=Count('id', filter=filtro_rango('fecha_hora_admision', dia)),
+        partos_mes=Count('id', filter=filtro_rango('fecha_hora_admision', mes)),
+        partos_eutocicos=Count('id', filter=Q(tipo_parto='EUTOCICO')),
+        cesareas=Count('id', filter=Q(tipo_parto__in=TIPOS_CESAREA)),
+    )
+    recien_nacidos = RegistroRecienNacido.objects.aggregate(
+        total_rn=Count('id'),
+        rn_hoy=Count('id', filter=filtro_rango('fecha_nacimiento', dia)),
+    )
+    return {**partos, **recien_nacidos}
+
+
+def resumen_menu():
+    """
+    Estadísticas del menú de partos con caché por día.
+    El TTL (PARTOS_MENU_CACHE_TTL, segundos) acota la desactualización entre
+    procesos; dentro del proceso, las señales post_save/post_delete invalidan la clave.
+    """
+    hoy = timezone.localdate()
+    clave = clave_menu(hoy)
+    resumen = cache.get(clave)
+    if resumen is None:
+        resumen = calcular_resumen_menu(hoy)
+        cache.set(clave, resumen, getattr(settings, 'PARTOS_MENU_CACHE_TTL', TTL_MENU_DEFECTO))
+    return resumen
+
+
+def invalidar_resumen_menu():
+    """Elimina el resumen cacheado del día actual"""
+    cache.delete(clave_menu(timezone.localdate()))
+
+
+# ============================================
+# RESUMEN DIARIO MATERIALIZADO
+# ============================================
+
+def expresion_banda_peso(campo='peso'):
+    """Case equivalente a RegistroRecienNacido.banda_peso(), evaluado en la BD"""
+    return Case(
+        When(**{f'{campo}__lt': RegistroRecienNacido.PESO_BAJO_LIMITE}, then=Value('BAJO_PESO')),
+        When(**{f'{campo}__lte': RegistroRecienNacido.PESO_MACROSOMICO_LIMITE}, then=Value('ADECUADO')),
+        default=Value('MACROSOMICO'),
+    )
+
+
+def _celdas_dia(fecha):
+    """EstadisticaDiariaParto (sin guardar) calculadas desde los registros de un día"""
+    partos = RegistroParto.objects.filter(
+        filtro_rango('fecha_hora_admision', rango_dia(fecha)), activo=True
+    )
+    celdas = [
+        EstadisticaDiariaParto(
+            fecha=fecha,
+            tipo_parto=fila['tipo_parto'],
+            clasificacion_robson=fila['clasificacion_robson'],
+            banda_peso='',
+            partos=fila['total'],
+        )
+        for fila in partos.order_by().values('tipo_parto', 'clasificacion_robson').annotate(total=Count('id'))
+    ]
+    recien_nacidos = RegistroRecienNacido.objects.filter(
+        registro_parto__in=partos.values('id')
+    ).annotate(
+        banda=expresion_banda_peso()
+    ).order_by().values(
+        'registro_parto__tipo_parto', 'registro_parto__clasificacion_robson', 'banda'
+    ).annotate(total=Count('id'))
+    celdas += [
+        EstadisticaDiariaParto(
+            fecha=fecha,
+            tipo_parto=fila['registro_parto__tipo_parto'],
+            clasificacion_robson=fila['registro_parto__clasificacion_robson'],
+            banda_peso=fila['banda'],
+            recien_nacidos=fila['total'],
+        )
+        for fila in recien_nacidos
+    ]
+    return celdas
+
+
+def recalcular_dia(fecha):
+    """
+    Reemplaza las celdas de `fecha` por las calculadas desde los registros.
+    Es idempotente: lo usan tanto las señales como la reconstrucción nocturna.
+    """
+    celdas = _celdas_dia(fecha)
+    with transaction.atomic():
+        EstadisticaDiariaParto.objects.filter(fecha=fecha).delete()
+        EstadisticaDiariaParto.objects.bulk_create(celdas)
+    return len(celdas)
+
+
+def rango_registros():
+    """(primer día, último día) con partos registrados, o (None, None)"""
+    extremos = RegistroParto.objects.aggregate(
+        primero=Min('fecha_hora_admision'), ultimo=Max('fecha_hora_admision')
+    )
+    if extremos['primero'] is None:
+        return None, None
+    return timezone.localdate(extremos['primero']), timezone.localdate(extremos['ultimo'])
+
+
+def reconstruir(desde, hasta):
+    """Recalcula todos los días de [desde, hasta]; retorna (días, celdas)"""
+    dias = celdas = 0
+    fecha = desde
+    while fecha <= hasta:
+        celdas += recalcular_dia(fecha)
+        dias += 1
+        fecha += timedelta(days=1)
+    return dias, celdas
+
+
+def estadisticas_rango(desde, hasta):
+    """
+    Totales de [desde, hasta] (fechas incluidas) desde la tabla materializada.
+    Una consulta agrupada; el costo depende de los días y celdas del rango,
+    no de la cantidad de partos.
+    """
+    filas = EstadisticaDiariaParto.objects.filter(
+        fecha__gte=desde, fecha__lte=hasta
+    ).order_by().values(
+        'tipo_parto', 'clasificacion_robson', 'banda_peso'
+    ).annotate(partos=Sum('partos'), recien_nacidos=Sum('recien_nacidos'))
+
+    resumen = {
+        'total_partos': 0,
+        'total_rn': 0,
+        'por_tipo': {},
+        'por_robson': {},
+        'por_banda_peso': {},
+        'cesareas_por_robson': {},
+    }
+    for fila in filas:
+        tipo, robson, banda = fila['tipo_parto'], fila['clasificacion_robson'], fila['banda_peso']
+        if banda:
+            resumen['total_rn'] += fila['recien_nacidos']
+            resumen['por_banda_peso'][banda] = resumen['por_banda_peso'].get(banda, 0) + fila['recien_nacidos']
+            continue
+        resumen['total_partos'] += fila['partos']
+        resumen['por_tipo'][tipo] = resumen['por_tipo'].get(tipo, 0) + fila['partos']
+        resumen['por_robson'][robson] = resumen['por_robson'].get(robson, 0) + fila['partos']
+        if tipo in TIPOS_CESAREA:
+            resumen['cesareas_por_robson'][robson] = resumen['cesareas_por_robson'].get(robson, 0) + fila['partos']
+    return resumen
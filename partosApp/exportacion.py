@@ -0,0 +1,110 @@
+# partosApp/exportacion.py
+"""
+Exportación de partos para reportes estadísticos (REM)
+Una fila por recién nacido, con los datos del parto y sus documentos; un parto
+sin RN registrado aparece en una fila con las columnas rn_* vacías.
+
+Las filas salen de una consulta con LEFT JOIN a recien_nacidos y documentos,
+sin instanciar modelos, leída por tramos con paginación keyset sobre
+(fecha_hora_admision, id, id del RN): cada tramo es una consulta acotada a
+TAMANO_LOTE filas, así la memoria se mantiene constante aunque se exporten
+millones de filas. No se usa iterator(chunk_size=...): con el backend MySQL
+(mysqlclient) el driver trae el resultado completo a memoria del cliente.
+"""
+from datetime import timedelta
+
+from partosApp.estadisticas import inicio_del_dia
+from partosApp.models import RegistroParto, RegistroRecienNacido, DocumentosParto
+from utilidad.exportacion import generar_exportacion
+from utilidad.paginacion import filtro_despues_de
+
+
+TAMANO_LOTE = 2000
+
+# Campos de control interno que no van al reporte
+_EXCLUIDOS = {'id', 'ficha', 'registro_parto', 'fecha_modificacion', 'activo'}
+
+
+def _columnas_modelo(modelo, prefijo, ruta):
+    return [
+        (f'{prefijo}{campo.name}', f'{ruta}{campo.attname}')
+        for campo in modelo._meta.concrete_fields
+        if campo.name not in _EXCLUIDOS
+    ]
+
+
+def columnas_exportacion():
+    """[(encabezado, lookup de values_list)] en el orden del archivo"""
+    return (
+        [
+            ('numero_ficha', 'ficha__numero_ficha'),
+            ('rut_paciente', 'ficha__paciente__persona__Rut'),
+        ]
+        + _columnas_modelo(RegistroParto, '', '')
+        + _columnas_modelo(RegistroRecienNacido, 'rn_', 'recien_nacidos__')
+        + _columnas_modelo(DocumentosParto, 'doc_', 'documentos__')
+    )
+
+
+def partos_para_exportar(desde=None, hasta=None, tipo_parto=None):
+    """Partos activos admitidos entre `desde` y `hasta` (ambos días incluidos)"""
+    partos = RegistroParto.objects.filter(activo=True)
+    if desde:
+        partos = partos.filter(fecha_hora_admision__gte=inicio_del_dia(desde))
+    if hasta:
+        partos = partos.filter(fecha_hora_admision__lt=inicio_del_dia(hasta + timedelta(days=1)))
+    if tipo_parto:
+        partos = partos.filter(tipo_parto=tipo_parto)
+    return partos
+
+
+# Orden de las filas, en el formato de utilidad.paginacion (nombre, descendente, campo).
+# Un parto sin RN tiene una sola fila (id del RN NULL): su tramo sigue con (fecha, id).
+_ORDEN_FILAS = (
+    ('fecha_hora_admision', False, None),
+    ('id', False, None),
+    ('recien_nacidos__id', False, None),
+)
+
+
+def filas_exportacion(partos, columnas, tamano_lote=TAMANO_LOTE):
+    """
+    Tuplas de valores (una por RN) en orden de admisión.
+    Generador: una consulta de a lo más `tamano_lote` filas por tramo.
+    """
+    claves = [nombre for nombre, _, _ in _ORDEN_FILAS]
+    consulta = (
+        partos
+        .order_by(*claves)
+        .values_list(*[lookup for _, lookup in columnas], *claves)
+    )
+    ultima = None
+    while True:
+        if ultima is None:
+            tramo = consulta
+        else:
+            orden = _ORDEN_FILAS if ultima[-1] is not None else _ORDEN_FILAS[:-1]
+            tramo = consulta.filter(filtro_despues_de(orden, ultima))
+        filas = list(tramo[:tamano_lote])
+        for fila in filas:
+            yield fila[:-len(claves)]
+        if len(filas) < tamano_lote:
+            return
+        ultima = filas[-1][-len(claves):]
+
+
+def exportar_partos(formato='csv', comprimir=False, desde=None, hasta=None, tipo_parto=None):
+    """
+    Exportación lista para escribir o enviar por HTTP.
+
+    Returns:
+        tuple: (bloques de bytes, tipo de contenido, extensión del archivo)
+    """
+    columnas = columnas_exportacion()
+    filas = filas_exportacion(partos_para_exportar(desde, hasta, tipo_parto), columnas)
+    return generar_exportacion(formato, [encabezado for encabezado, _ in columnas], filas, comprimir)
+
+
+def nombre_archivo(extension, desde=None, hasta=None):
+    partes = ['partos', desde.isoformat() if desde else 'inicio', hasta.isoformat() if hasta else 'hoy']
+    return f"{'_'.join(partes)}.{extension}"
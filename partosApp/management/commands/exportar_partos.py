@@ -0,0 +1,63 @@
+# ============================================
+# UBICACIÓN: partosApp/management/commands/exportar_partos.py
+# Exportación de partos + RN + documentos para reportes REM
+# ============================================
+
+import sys
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from partosApp.exportacion import exportar_partos, nombre_archivo
+from partosApp.models import RegistroParto
+
+
+class Command(BaseCommand):
+    help = (
+        'Exporta los partos activos (una fila por recién nacido, con documentos) a CSV, CSV.gz o XLSX. '
+        'Escribe en streaming y lee por tramos keyset de 2000 filas (una consulta acotada por tramo, '
+        'también en MySQL, cuyo driver no transmite resultados): la memoria no depende de la cantidad de filas.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', type=date.fromisoformat, help='Primer día de admisión (YYYY-MM-DD)')
+        parser.add_argument('--hasta', type=date.fromisoformat, help='Último día de admisión (YYYY-MM-DD)')
+        parser.add_argument(
+            '--tipo-parto',
+            choices=[valor for valor, _ in RegistroParto._meta.get_field('tipo_parto').choices],
+        )
+        parser.add_argument('--formato', choices=['csv', 'xlsx'], default='csv')
+        parser.add_argument('--gzip', action='store_true', help='Comprimir el CSV (.csv.gz)')
+        parser.add_argument('--salida', help='Archivo de destino ("-" = salida estándar; default: nombre según rango)')
+
+    def handle(self, *args, **options):
+        desde, hasta = options['desde'], options['hasta']
+        if desde and hasta and desde > hasta:
+            raise CommandError('--desde debe ser anterior o igual a --hasta')
+
+        bloques, _, extension = exportar_partos(
+            formato=options['formato'],
+            comprimir=options['gzip'],
+            desde=desde,
+            hasta=hasta,
+            tipo_parto=options['tipo_parto'],
+        )
+        salida = options['salida'] or nombre_archivo(extension, desde, hasta)
+
+        if salida == '-':
+            for bloque in bloques:
+                sys.stdout.buffer.write(bloque)
+            sys.stdout.buffer.flush()
+            return
+
+        self.stdout.write(self.style.WARNING(f'\n📋 Exportando partos a {salida}...'))
+        inicio = time.perf_counter()
+        escritos = 0
+        with open(salida, 'wb') as archivo:
+            for bloque in bloques:
+                archivo.write(bloque)
+                escritos += len(bloque)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ COMPLETADO: {escritos / 1024:.1f} KB en {time.perf_counter() - inicio:.1f}s → {salida}'
+        ))
@@ -0,0 +1,41 @@
+# ============================================
+# UBICACIÓN: partosApp/management/commands/reconstruir_estadisticas_partos.py
+# ============================================
+
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from partosApp.estadisticas import rango_registros, reconstruir
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula la tabla materializada EstadisticaDiariaParto. '
+        'Pensado para ejecutarse cada noche (ej. --dias 7) o completo tras una carga masiva.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', type=date.fromisoformat, help='Primer día (YYYY-MM-DD)')
+        parser.add_argument('--hasta', type=date.fromisoformat, help='Último día (YYYY-MM-DD, default: hoy)')
+        parser.add_argument('--dias', type=int, help='Recalcular solo los últimos N días')
+
+    def handle(self, *args, **options):
+        hasta = options['hasta'] or timezone.localdate()
+
+        if options['dias']:
+            desde = hasta - timedelta(days=options['dias'] - 1)
+        elif options['desde']:
+            desde = options['desde']
+        else:
+            desde, _ = rango_registros()
+            if desde is None:
+                self.stdout.write(self.style.WARNING('No hay partos registrados'))
+                return
+
+        if desde > hasta:
+            raise CommandError('--desde debe ser anterior o igual a --hasta')
+
+        self.stdout.write(self.style.WARNING(f'\n📋 Recalculando estadísticas de partos {desde} → {hasta}...'))
+        dias, celdas = reconstruir(desde, hasta)
+        self.stdout.write(self.style.SUCCESS(f'\n✅ COMPLETADO: {dias} días, {celdas} celdas'))
@@ -2,13 +2,15 @@ from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from matronaApp.models import FichaObstetrica
+from gestionApp.secuencias import siguiente_codigo, ultimo_sufijo
+from utilidad.cambios import SeguimientoCambiosMixin
 
 
 # ============================================
 # MODELO: REGISTRO DE PARTO
 # ============================================
 
-class RegistroParto(models.Model):
+class RegistroParto(SeguimientoCambiosMixin, models.Model):
     """
     Registro completo del trabajo de parto, parto y puerperio inmediato
     """
@@ -460,6 +462,7 @@ class RegistroParto(models.Model):
             models.Index(fields=['numero_registro']),
             models.Index(fields=['ficha', '-fecha_hora_admision']),
             models.Index(fields=['-fecha_hora_parto']),
+            models.Index(fields=['fecha_hora_admision']),
         ]
     
     def __str__(self):
@@ -468,15 +471,10 @@ class RegistroParto(models.Model):
     def save(self, *args, **kwargs):
         if not self.numero_registro:
             # Generar número de registro automáticamente
-            ultimo_registro = RegistroParto.objects.order_by('-id').first()
-            if ultimo_registro:
-                try:
-                    numero = int(ultimo_registro.numero_registro.split('-')[1]) + 1
-                except (IndexError, ValueError):
-                    numero = 1
-            else:
-                numero = 1
-            self.numero_registro = f"PARTO-{numero:06d}"
+            self.numero_registro = siguiente_codigo(
+                'registro_parto', 'PARTO', 6,
+                inicial=lambda: ultimo_sufijo(RegistroParto, 'numero_registro')
+            )
         super().save(*args, **kwargs)
 
 
@@ -489,6 +487,15 @@ class RegistroRecienNacido(models.Model):
     Registro del recién nacido, apego y acompañamiento
     """
     
+    # Bandas de peso al nacer (OMS), en gramos
+    PESO_BAJO_LIMITE = 2500
+    PESO_MACROSOMICO_LIMITE = 4000
+    BANDAS_PESO = [
+        ('BAJO_PESO', 'Bajo peso al nacer'),
+        ('ADECUADO', 'Peso adecuado'),
+        ('MACROSOMICO', 'Macrosómico'),
+    ]
+    
     # ============================================
     # RELACIÓN
     # ============================================
@@ -643,14 +650,18 @@ class RegistroRecienNacido(models.Model):
     def __str__(self):
         return f"RN {self.sexo} - Parto {self.registro_parto.numero_registro} - {self.peso}g"
     
+    def banda_peso(self):
+        """Código de la banda de peso del RN según OMS (ver BANDAS_PESO)"""
+        if self.peso < self.PESO_BAJO_LIMITE:
+            return 'BAJO_PESO'
+        elif self.peso <= self.PESO_MACROSOMICO_LIMITE:
+            return 'ADECUADO'
+        else:
+            return 'MACROSOMICO'
+    
     def clasificacion_peso(self):
         """Clasifica el peso del RN según OMS"""
-        if self.peso < 2500:
-            return "Bajo peso al nacer"
-        elif self.peso <= 4000:
-            return "Peso adecuado"
-        else:
-            return "Macrosómico"
+        return dict(self.BANDAS_PESO)[self.banda_peso()]
 
 
 # ============================================
@@ -753,4 +764,65 @@ class DocumentosParto(models.Model):
         verbose_name_plural = 'Documentos de Partos'
     
     def __str__(self):
-        return f"Documentos - Parto {self.registro_parto.numero_registro}"
\ No newline at end of file
+        return f"Documentos - Parto {self.registro_parto.numero_registro}"
+
+
+# ============================================
+# MODELO: ESTADÍSTICA DIARIA DE PARTOS
+# ============================================
+
+class EstadisticaDiariaParto(models.Model):
+    """
+    Resumen materializado por día × tipo de parto × grupo de Robson × banda de peso.
+    Lo mantienen las señales de partosApp y el comando reconstruir_estadisticas_partos;
+    no se edita a mano.
+    
+    Las filas con banda_peso vacía cuentan partos; las filas con banda cuentan
+    recién nacidos de esa banda. Así un parto múltiple no se cuenta dos veces.
+    """
+    
+    fecha = models.DateField(
+        verbose_name='Fecha',
+        help_text='Día (hora local) de admisión del parto'
+    )
+    
+    tipo_parto = models.CharField(
+        max_length=30,
+        verbose_name='Tipo de Parto'
+    )
+    
+    clasificacion_robson = models.CharField(
+        max_length=20,
+        verbose_name='Clasificación de Robson'
+    )
+    
+    banda_peso = models.CharField(
+        max_length=20,
+        blank=True,
+        choices=RegistroRecienNacido.BANDAS_PESO,
+        verbose_name='Banda de Peso RN'
+    )
+    
+    partos = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Partos'
+    )
+    
+    recien_nacidos = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Recién Nacidos'
+    )
+    
+    class Meta:
+        ordering = ['fecha', 'tipo_parto', 'clasificacion_robson', 'banda_peso']
+        verbose_name = 'Estadística Diaria de Partos'
+        verbose_name_plural = 'Estadísticas Diarias de Partos'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['fecha', 'tipo_parto', 'clasificacion_robson', 'banda_peso'],
+                name='estadistica_parto_celda_unica',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.fecha} {self.tipo_parto} {self.clasificacion_robson} {self.banda_peso or 'partos'}"
@@ -0,0 +1,73 @@
+# partosApp/signals.py
+"""
+Señales del módulo de Partos
+- Invalidan el resumen cacheado del menú cuando cambian partos o recién nacidos.
+- Recalculan los días afectados de EstadisticaDiariaParto. El recálculo corre al
+  confirmar la transacción, para leer el estado ya confirmado y no bloquear el guardado.
+"""
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from partosApp.models import RegistroParto, RegistroRecienNacido
+from partosApp.estadisticas import invalidar_resumen_menu, recalcular_dia
+
+
+@receiver([post_save, post_delete], sender=RegistroParto)
+@receiver([post_save, post_delete], sender=RegistroRecienNacido)
+def invalidar_menu_partos(sender, **kwargs):
+    """Descarta las estadísticas del día para que el próximo acceso las recalcule"""
+    invalidar_resumen_menu()
+
+
+# ============================================
+# ESTADÍSTICA DIARIA MATERIALIZADA
+# ============================================
+
+def _programar_recalculo(*fechas_hora):
+    for fecha in {timezone.localdate(f) for f in fechas_hora if f is not None}:
+        transaction.on_commit(partial(recalcular_dia, fecha))
+
+
+# Columnas de RegistroParto que entran en EstadisticaDiariaParto
+CAMPOS_ESTADISTICA = {'fecha_hora_admision', 'tipo_parto', 'clasificacion_robson', 'activo'}
+
+
+def _afecta_estadistica(update_fields, campos=CAMPOS_ESTADISTICA):
+    """save(update_fields=...) que no toca las columnas de la estadística no la recalcula"""
+    return update_fields is None or not campos.isdisjoint(update_fields)
+
+
+@receiver(pre_save, sender=RegistroParto)
+def recordar_fecha_anterior(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Guarda la fecha de admisión previa: si cambia, también hay que recalcular ese día"""
+    if raw or instance.pk is None or not _afecta_estadistica(update_fields, {'fecha_hora_admision'}):
+        return
+    instance._fecha_admision_anterior = RegistroParto.objects.filter(
+        pk=instance.pk
+    ).values_list('fecha_hora_admision', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=RegistroParto)
+def actualizar_estadistica_parto(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not _afecta_estadistica(update_fields):
+        return
+    _programar_recalculo(
+        instance.fecha_hora_admision,
+        getattr(instance, '_fecha_admision_anterior', None),
+    )
+
+
+@receiver([post_save, post_delete], sender=RegistroRecienNacido)
+def actualizar_estadistica_recien_nacido(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    try:
+        parto = instance.registro_parto
+    except RegistroParto.DoesNotExist:
+        # Borrado en cascada: la señal del parto ya recalcula su día
+        return
+    _programar_recalculo(parto.fecha_hora_admision)
@@ -57,6 +57,10 @@ urlpatterns = [
         views.listar_partos, 
         name='listar_partos'),
     
+    path('partos/exportar/', 
+        views.exportar_partos, 
+        name='exportar_partos'),
+    
     path('parto/<int:pk>/', 
         views.detalle_parto, 
         name='detalle_parto'),
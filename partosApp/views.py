@@ -1,22 +1,23 @@
+from datetime import date
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.db.models import Q, Count, Prefetch
 from django.utils import timezone
-from django.core.paginator import Paginator
+from utilidad.paginacion import paginar_keyset
+from utilidad.autocompletar import Autocompletado, respuesta_json
 
 from partosApp.models import RegistroParto, RegistroRecienNacido, DocumentosParto
+from partosApp.asistente import BorradorParto, TOTAL_PASOS
+from partosApp.estadisticas import resumen_menu, estadisticas_rango
+from partosApp.exportacion import exportar_partos as generar_exportacion_partos, nombre_archivo
 from matronaApp.models import FichaObstetrica
 from gestionApp.models import Paciente
 
 from partosApp.forms import (
     # Formularios de Parto
     RegistroPartoBaseForm,
-    TrabajoDePartoForm,
-    InformacionPartoForm,
-    PuerperioForm,
-    AnestesiaAnalgesiaForm,
-    ProfesionalesForm,
     RegistroPartoCompletoForm,
     # Formularios de Recién Nacido
     RegistroRecienNacidoForm,
@@ -34,34 +35,8 @@ from partosApp.forms import (
 def menu_partos(request):
     """Vista principal del módulo de Partos"""
     
-    # Estadísticas generales
-    hoy = timezone.now().date()
-    
-    context = {
-        'total_partos': RegistroParto.objects.filter(activo=True).count(),
-        'partos_hoy': RegistroParto.objects.filter(
-            fecha_hora_admision__date=hoy,
-            activo=True
-        ).count(),
-        'partos_mes': RegistroParto.objects.filter(
-            fecha_hora_admision__year=hoy.year,
-            fecha_hora_admision__month=hoy.month,
-            activo=True
-        ).count(),
-        'total_rn': RegistroRecienNacido.objects.count(),
-        'rn_hoy': RegistroRecienNacido.objects.filter(
-            fecha_nacimiento__date=hoy
-        ).count(),
-        # Estadísticas por tipo de parto
-        'partos_eutocicos': RegistroParto.objects.filter(
-            tipo_parto='EUTOCICO',
-            activo=True
-        ).count(),
-        'cesareas': RegistroParto.objects.filter(
-            tipo_parto__in=['CESAREA_URGENCIA', 'CESAREA_ELECTIVA'],
-            activo=True
-        ).count(),
-    }
+    # Estadísticas generales (agregación condicional, cacheada por día)
+    context = resumen_menu()
     
     return render(request, 'Partos/menu_partos.html', context)
 
@@ -102,6 +77,56 @@ def seleccionar_ficha_parto(request):
 # REGISTRO DE PARTO - OPCIÓN 1: POR PASOS
 # ============================================
 
+def _paso_parto(request, paso, plantilla, mensaje=None):
+    """
+    Paso 2..6 del asistente: valida solo los campos del paso y los guarda en el
+    borrador de la sesión. El último paso inserta el parto completo.
+    """
+    borrador = BorradorParto(request.session)
+    if not borrador.activo:
+        messages.warning(request, '⚠️ Sesión expirada. Inicia nuevamente el registro.')
+        return redirect('partos:seleccionar_ficha')
+
+    pendiente = borrador.paso_pendiente(paso)
+    if pendiente is not None:
+        messages.warning(request, f'⚠️ Completa primero el paso {pendiente}.')
+        return _redirigir_paso(pendiente, borrador.ficha_pk)
+
+    if request.method == 'POST':
+        form = borrador.formulario(paso, request.POST)
+        if form.is_valid():
+            borrador.guardar_paso(paso, form)
+            if paso < TOTAL_PASOS:
+                messages.success(request, mensaje)
+                return _redirigir_paso(paso + 1, borrador.ficha_pk)
+
+            parto, paso_invalido = borrador.registrar()
+            if parto is None:
+                messages.error(request, f'❌ Revisa los datos del paso {paso_invalido}.')
+                return _redirigir_paso(paso_invalido, borrador.ficha_pk)
+            messages.success(request, f'🎉 Registro de parto {parto.numero_registro} completado exitosamente.')
+            return redirect('partos:detalle_parto', pk=parto.pk)
+        else:
+            messages.error(request, '❌ Por favor corrige los errores.')
+    else:
+        form = borrador.formulario(paso)
+
+    context = {
+        'form': form,
+        'ficha_pk': borrador.ficha_pk,
+        'paso': paso,
+        'total_pasos': TOTAL_PASOS,
+    }
+
+    return render(request, plantilla, context)
+
+
+def _redirigir_paso(paso, ficha_pk):
+    if paso == 1:
+        return redirect('partos:registrar_parto_paso1', ficha_pk=ficha_pk)
+    return redirect(f'partos:registrar_parto_paso{paso}')
+
+
 def registrar_parto_paso1(request, ficha_pk):
     """
     PASO 1: Información básica del parto
@@ -111,27 +136,28 @@ def registrar_parto_paso1(request, ficha_pk):
         pk=ficha_pk,
         activa=True
     )
+    borrador = BorradorParto(request.session)
+    borrador.iniciar(ficha.pk)
     
     if request.method == 'POST':
-        form = RegistroPartoBaseForm(request.POST)
+        form = borrador.formulario(1, request.POST)
         if form.is_valid():
-            parto = form.save()
-            # Guardar el ID en sesión para los siguientes pasos
-            request.session['parto_actual_id'] = parto.pk
-            messages.success(request, f'✅ Parto {parto.numero_registro} iniciado correctamente.')
+            # Solo se guarda el borrador: el parto se inserta al completar el paso 6
+            borrador.guardar_paso(1, form)
+            messages.success(request, '✅ Información básica guardada.')
             return redirect('partos:registrar_parto_paso2')
         else:
             messages.error(request, '❌ Por favor corrige los errores en el formulario.')
     else:
         # Pre-seleccionar la ficha
-        form = RegistroPartoBaseForm(initial={'ficha': ficha})
+        form = RegistroPartoBaseForm(initial={'ficha': ficha, **borrador.valores(1)})
     
     context = {
         'form': form,
         'ficha': ficha,
         'paciente': ficha.paciente,
         'paso': 1,
-        'total_pasos': 6,
+        'total_pasos': TOTAL_PASOS,
     }
     
     return render(request, 'Partos/Formularios/paso1_base.html', context)
@@ -141,163 +167,47 @@ def registrar_parto_paso2(request):
     """
     PASO 2: Trabajo de parto
     """
-    parto_id = request.session.get('parto_actual_id')
-    if not parto_id:
-        messages.warning(request, '⚠️ Sesión expirada. Inicia nuevamente el registro.')
-        return redirect('partos:seleccionar_ficha')
-    
-    parto = get_object_or_404(RegistroParto, pk=parto_id)
-    
-    if request.method == 'POST':
-        form = TrabajoDePartoForm(request.POST, instance=parto)
-        if form.is_valid():
-            form.save()
-            messages.success(request, '✅ Información de trabajo de parto guardada.')
-            return redirect('partos:registrar_parto_paso3')
-        else:
-            messages.error(request, '❌ Por favor corrige los errores.')
-    else:
-        form = TrabajoDePartoForm(instance=parto)
-    
-    context = {
-        'form': form,
-        'parto': parto,
-        'paso': 2,
-        'total_pasos': 6,
-    }
-    
-    return render(request, 'Partos/Formularios/paso2_trabajo.html', context)
+    return _paso_parto(
+        request, 2, 'Partos/Formularios/paso2_trabajo.html',
+        '✅ Información de trabajo de parto guardada.'
+    )
 
 
 def registrar_parto_paso3(request):
     """
     PASO 3: Información del parto
     """
-    parto_id = request.session.get('parto_actual_id')
-    if not parto_id:
-        messages.warning(request, '⚠️ Sesión expirada.')
-        return redirect('partos:seleccionar_ficha')
-    
-    parto = get_object_or_404(RegistroParto, pk=parto_id)
-    
-    if request.method == 'POST':
-        form = InformacionPartoForm(request.POST, instance=parto)
-        if form.is_valid():
-            form.save()
-            messages.success(request, '✅ Información del parto guardada.')
-            return redirect('partos:registrar_parto_paso4')
-        else:
-            messages.error(request, '❌ Por favor corrige los errores.')
-    else:
-        form = InformacionPartoForm(instance=parto)
-    
-    context = {
-        'form': form,
-        'parto': parto,
-        'paso': 3,
-        'total_pasos': 6,
-    }
-    
-    return render(request, 'Partos/Formularios/paso3_info.html', context)
+    return _paso_parto(
+        request, 3, 'Partos/Formularios/paso3_info.html',
+        '✅ Información del parto guardada.'
+    )
 
 
 def registrar_parto_paso4(request):
     """
     PASO 4: Puerperio
     """
-    parto_id = request.session.get('parto_actual_id')
-    if not parto_id:
-        messages.warning(request, '⚠️ Sesión expirada.')
-        return redirect('partos:seleccionar_ficha')
-    
-    parto = get_object_or_404(RegistroParto, pk=parto_id)
-    
-    if request.method == 'POST':
-        form = PuerperioForm(request.POST, instance=parto)
-        if form.is_valid():
-            form.save()
-            messages.success(request, '✅ Información de puerperio guardada.')
-            return redirect('partos:registrar_parto_paso5')
-        else:
-            messages.error(request, '❌ Por favor corrige los errores.')
-    else:
-        form = PuerperioForm(instance=parto)
-    
-    context = {
-        'form': form,
-        'parto': parto,
-        'paso': 4,
-        'total_pasos': 6,
-    }
-    
-    return render(request, 'Partos/Formularios/paso4_puerperio.html', context)
+    return _paso_parto(
+        request, 4, 'Partos/Formularios/paso4_puerperio.html',
+        '✅ Información de puerperio guardada.'
+    )
 
 
 def registrar_parto_paso5(request):
     """
     PASO 5: Anestesia y Analgesia
     """
-    parto_id = request.session.get('parto_actual_id')
-    if not parto_id:
-        messages.warning(request, '⚠️ Sesión expirada.')
-        return redirect('partos:seleccionar_ficha')
-    
-    parto = get_object_or_404(RegistroParto, pk=parto_id)
-    
-    if request.method == 'POST':
-        form = AnestesiaAnalgesiaForm(request.POST, instance=parto)
-        if form.is_valid():
-            form.save()
-            messages.success(request, '✅ Información de anestesia guardada.')
-            return redirect('partos:registrar_parto_paso6')
-        else:
-            messages.error(request, '❌ Por favor corrige los errores.')
-    else:
-        form = AnestesiaAnalgesiaForm(instance=parto)
-    
-    context = {
-        'form': form,
-        'parto': parto,
-        'paso': 5,
-        'total_pasos': 6,
-    }
-    
-    return render(request, 'Partos/Formularios/paso5_anestesia.html', context)
+    return _paso_parto(
+        request, 5, 'Partos/Formularios/paso5_anestesia.html',
+        '✅ Información de anestesia guardada.'
+    )
 
 
 def registrar_parto_paso6(request):
     """
-    PASO 6: Profesionales y finalización
+    PASO 6: Profesionales y finalización (inserta el parto)
     """
-    parto_id = request.session.get('parto_actual_id')
-    if not parto_id:
-        messages.warning(request, '⚠️ Sesión expirada.')
-        return redirect('partos:seleccionar_ficha')
-    
-    parto = get_object_or_404(RegistroParto, pk=parto_id)
-    
-    if request.method == 'POST':
-        form = ProfesionalesForm(request.POST, instance=parto)
-        if form.is_valid():
-            form.save()
-            # Limpiar sesión
-            if 'parto_actual_id' in request.session:
-                del request.session['parto_actual_id']
-            messages.success(request, f'🎉 Registro de parto {parto.numero_registro} completado exitosamente.')
-            return redirect('partos:detalle_parto', pk=parto.pk)
-        else:
-            messages.error(request, '❌ Por favor corrige los errores.')
-    else:
-        form = ProfesionalesForm(instance=parto)
-    
-    context = {
-        'form': form,
-        'parto': parto,
-        'paso': 6,
-        'total_pasos': 6,
-    }
-    
-    return render(request, 'Partos/Formularios/paso6_profesionales.html', context)
+    return _paso_parto(request, 6, 'Partos/Formularios/paso6_profesionales.html')
 
 
 # ============================================
@@ -347,7 +257,7 @@ def listar_partos(request):
         activo=True
     ).select_related(
         'ficha__paciente__persona'
-    ).order_by('-fecha_hora_admision')
+    )
     
     # Filtros
     busqueda = request.GET.get('q', '').strip()
@@ -373,14 +283,13 @@ def listar_partos(request):
     if fecha_fin:
         partos = partos.filter(fecha_hora_admision__lte=fecha_fin)
     
-    # Paginación
-    paginator = Paginator(partos, 20)  # 20 partos por página
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Paginación por cursor (20 partos por página)
+    pagina = paginar_keyset(partos, ('-fecha_hora_admision', '-id'), request.GET, contar=True)
     
     context = {
-        'partos': page_obj,
-        'total_partos': partos.count(),
+        'partos': pagina,
+        'pagina': pagina,
+        'total_partos': pagina.total,
         'busqueda': busqueda,
         'tipo_parto': tipo_parto,
     }
@@ -388,6 +297,37 @@ def listar_partos(request):
     return render(request, 'Partos/Data/listar_partos.html', context)
 
 
+def exportar_partos(request):
+    """
+    Descarga de partos con RN y documentos para reportes REM (respuesta en streaming)
+    Acepta ?desde=YYYY-MM-DD&hasta=YYYY-MM-DD&tipo_parto=...&formato=csv|xlsx&gzip=1
+    """
+    try:
+        desde = date.fromisoformat(request.GET['desde']) if request.GET.get('desde') else None
+        hasta = date.fromisoformat(request.GET['hasta']) if request.GET.get('hasta') else None
+    except ValueError:
+        messages.error(request, 'Rango de fechas inválido para la exportación')
+        return redirect('partos:listar_partos')
+    
+    tipo_parto = request.GET.get('tipo_parto', '')
+    if tipo_parto and tipo_parto not in dict(RegistroParto._meta.get_field('tipo_parto').choices):
+        messages.error(request, 'Tipo de parto inválido para la exportación')
+        return redirect('partos:listar_partos')
+    
+    formato = 'xlsx' if request.GET.get('formato') == 'xlsx' else 'csv'
+    bloques, tipo_contenido, extension = generar_exportacion_partos(
+        formato=formato,
+        comprimir=request.GET.get('gzip') == '1',
+        desde=desde,
+        hasta=hasta,
+        tipo_parto=tipo_parto or None,
+    )
+    
+    response = StreamingHttpResponse(bloques, content_type=tipo_contenido)
+    response['Content-Disposition'] = f'attachment; filename="{nombre_archivo(extension, desde, hasta)}"'
+    return response
+
+
 def detalle_parto(request, pk):
     """
     Ver detalle completo de un parto
@@ -428,6 +368,7 @@ def editar_parto(request, pk):
     if request.method == 'POST':
         form = RegistroPartoCompletoForm(request.POST, instance=parto)
         if form.is_valid():
+            # RegistroParto solo escribe las columnas modificadas (SeguimientoCambiosMixin)
             form.save()
             messages.success(request, f'✅ Parto {parto.numero_registro} actualizado correctamente.')
             return redirect('partos:detalle_parto', pk=parto.pk)
@@ -627,37 +568,40 @@ def gestionar_documentos(request, parto_pk):
 def estadisticas_partos(request):
     """
     Vista con estadísticas y gráficos de partos
+    Acepta ?desde=YYYY-MM-DD&hasta=YYYY-MM-DD (default: mes actual).
+    Lee la tabla materializada EstadisticaDiariaParto, no los registros.
     """
     # Obtener rango de fechas
-    hoy = timezone.now().date()
+    hoy = timezone.localdate()
     mes_actual = hoy.replace(day=1)
+    try:
+        desde = date.fromisoformat(request.GET.get('desde') or mes_actual.isoformat())
+        hasta = date.fromisoformat(request.GET.get('hasta') or hoy.isoformat())
+    except ValueError:
+        messages.warning(request, 'Rango de fechas inválido, se muestra el mes actual')
+        desde, hasta = mes_actual, hoy
     
-    # Estadísticas del mes
-    partos_mes = RegistroParto.objects.filter(
-        fecha_hora_admision__gte=mes_actual,
-        activo=True
-    )
+    resumen = estadisticas_rango(desde, hasta)
+    por_tipo = resumen['por_tipo']
     
     # Por tipo de parto
     stats_tipo = {
-        'eutocico': partos_mes.filter(tipo_parto='EUTOCICO').count(),
-        'distocico': partos_mes.filter(tipo_parto='DISTOCICO').count(),
-        'cesarea_urgencia': partos_mes.filter(tipo_parto='CESAREA_URGENCIA').count(),
-        'cesarea_electiva': partos_mes.filter(tipo_parto='CESAREA_ELECTIVA').count(),
+        'eutocico': por_tipo.get('EUTOCICO', 0),
+        'distocico': por_tipo.get('DISTOCICO', 0),
+        'cesarea_urgencia': por_tipo.get('CESAREA_URGENCIA', 0),
+        'cesarea_electiva': por_tipo.get('CESAREA_ELECTIVA', 0),
     }
     
-    # Por clasificación de Robson
-    stats_robson = {}
-    for grupo in RegistroParto.objects.filter(
-        fecha_hora_admision__gte=mes_actual
-    ).values('clasificacion_robson').annotate(total=Count('id')):
-        stats_robson[grupo['clasificacion_robson']] = grupo['total']
-    
     context = {
-        'partos_mes': partos_mes.count(),
+        'partos_mes': resumen['total_partos'],
         'stats_tipo': stats_tipo,
-        'stats_robson': stats_robson,
-        'mes_nombre': mes_actual.strftime('%B %Y'),
+        'stats_robson': resumen['por_robson'],
+        'stats_cesareas_robson': resumen['cesareas_por_robson'],
+        'stats_peso': resumen['por_banda_peso'],
+        'total_rn': resumen['total_rn'],
+        'mes_nombre': desde.strftime('%B %Y'),
+        'desde': desde,
+        'hasta': hasta,
     }
     
     return render(request, 'Partos/Data/estadisticas.html', context)
@@ -667,15 +611,7 @@ def estadisticas_partos(request):
 # API Y BÚSQUEDAS AJAX
 # ============================================
 
-def api_buscar_ficha(request):
-    """
-    API para búsqueda de fichas (para autocomplete)
-    """
-    query = request.GET.get('q', '').strip()
-    
-    if len(query) < 3:
-        return JsonResponse({'fichas': []})
-    
+async def _fichas_por_texto(query):
     fichas = FichaObstetrica.objects.filter(
         activa=True
     ).filter(
@@ -686,11 +622,24 @@ def api_buscar_ficha(request):
         'paciente__persona'
     )[:10]
     
-    resultados = [{
+    return {'fichas': [{
         'id': f.pk,
         'numero_ficha': f.numero_ficha,
         'paciente_nombre': f"{f.paciente.persona.Nombre} {f.paciente.persona.Apellido_Paterno}",
         'paciente_rut': f.paciente.persona.Rut,
-    } for f in fichas]
+    } async for f in fichas]}
+
+AUTOCOMPLETADO_FICHAS = Autocompletado('partos:api_buscar_ficha', _fichas_por_texto)
+
+
+async def api_buscar_ficha(request):
+    """
+    API para búsqueda de fichas (para autocomplete)
+    Async; cacheada por consulta normalizada (espacios simples)
+    """
+    query = ' '.join(request.GET.get('q', '').split())
+    
+    if len(query) < 3:
+        return JsonResponse({'fichas': []})
     
-    return JsonResponse({'fichas': resultados})
\ No newline at end of file
+    return respuesta_json(await AUTOCOMPLETADO_FICHAS.resolver(query))
\ No newline at end of file
@@ -0,0 +1,128 @@
+# tensApp/alertas.py
+"""
+Alertas MEOWS por ficha
+- Incremental: cada RegistroTens calcula su propio puntaje al guardarse y la
+  señal actualiza EstadoMeowsFicha con el registro más reciente de la ficha
+  (una consulta por el índice (ficha, fecha, turno); no se recalcula historia).
+- Por lotes: recalcular_meows() vuelve a puntuar todos los registros de un
+  conjunto de fichas (ej. todas las activas tras cambiar las bandas) y
+  reconstruye sus estados en una pasada.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from matronaApp.models import FichaObstetrica
+from tensApp.meows import SIGNOS_MEOWS, calcular_meows
+from tensApp.models import RegistroTens, EstadoMeowsFicha
+
+
+UMBRAL_DEFECTO = 5
+TAMANO_LOTE = 2000
+
+# Orden cronológico inverso de los registros de una ficha
+ORDEN_RECIENTE = ('-fecha', '-turno', '-fecha_registro', '-id')
+
+
+def umbral_alerta():
+    return getattr(settings, 'MEOWS_UMBRAL_ALERTA', UMBRAL_DEFECTO)
+
+
+def _registros_puntuados():
+    return RegistroTens.objects.filter(fecha__isnull=False, puntaje_meows__isnull=False)
+
+
+def _estado_desde(registro):
+    return {
+        'registro_id': registro['id'],
+        'puntaje': registro['puntaje_meows'],
+        'nivel': registro['nivel_meows'],
+        'fecha': registro['fecha'],
+        'turno': registro['turno'],
+    }
+
+
+def actualizar_estado_ficha(ficha_id):
+    """Sincroniza EstadoMeowsFicha con el registro puntuado más reciente de la ficha"""
+    ultimo = (
+        _registros_puntuados()
+        .filter(ficha_id=ficha_id)
+        .order_by(*ORDEN_RECIENTE)
+        .values('id', 'puntaje_meows', 'nivel_meows', 'fecha', 'turno')
+        .first()
+    )
+    if ultimo is None:
+        EstadoMeowsFicha.objects.filter(ficha_id=ficha_id).delete()
+        return None
+    estado, _ = EstadoMeowsFicha.objects.update_or_create(ficha_id=ficha_id, defaults=_estado_desde(ultimo))
+    return estado
+
+
+# ============================================
+# RECÁLCULO POR LOTES
+# ============================================
+
+def recalcular_meows(fichas=None, tamano_lote=TAMANO_LOTE):
+    """
+    Vuelve a puntuar los registros de `fichas` (queryset o ids; default: fichas activas)
+    y reconstruye sus estados. Lee solo las columnas de signos, por lotes de id,
+    y escribe únicamente los registros cuyo puntaje cambió.
+
+    Returns:
+        tuple: (registros actualizados, estados reconstruidos)
+    """
+    if fichas is None:
+        fichas = FichaObstetrica.objects.filter(activa=True).values('id')
+    elif not hasattr(fichas, 'query'):
+        fichas = list(fichas)
+
+    registros = RegistroTens.objects.filter(ficha_id__in=fichas).order_by('id')
+    columnas = ('id', 'puntaje_meows', 'nivel_meows') + SIGNOS_MEOWS
+
+    actualizados = 0
+    ultimo_id = 0
+    while True:
+        lote = list(registros.filter(id__gt=ultimo_id).values_list(*columnas)[:tamano_lote])
+        if not lote:
+            break
+        ultimo_id = lote[-1][0]
+
+        cambios = []
+        for registro_id, puntaje_actual, nivel_actual, *signos in lote:
+            puntaje, nivel = calcular_meows(signos)
+            if (puntaje, nivel) != (puntaje_actual, nivel_actual):
+                cambios.append(RegistroTens(id=registro_id, puntaje_meows=puntaje, nivel_meows=nivel))
+        RegistroTens.objects.bulk_update(cambios, ['puntaje_meows', 'nivel_meows'])
+        actualizados += len(cambios)
+
+    return actualizados, reconstruir_estados(fichas)
+
+
+def reconstruir_estados(fichas):
+    """Reemplaza los EstadoMeowsFicha de `fichas` con el último registro puntuado de cada una"""
+    ultimo = _registros_puntuados().filter(ficha_id=OuterRef('ficha_id')).order_by(*ORDEN_RECIENTE)
+    recientes = (
+        _registros_puntuados()
+        .filter(ficha_id__in=fichas, id=Subquery(ultimo.values('id')[:1]))
+        .values('id', 'ficha_id', 'puntaje_meows', 'nivel_meows', 'fecha', 'turno')
+    )
+    estados = [EstadoMeowsFicha(ficha_id=r['ficha_id'], **_estado_desde(r)) for r in recientes]
+
+    with transaction.atomic():
+        EstadoMeowsFicha.objects.filter(ficha_id__in=fichas).delete()
+        EstadoMeowsFicha.objects.bulk_create(estados)
+    return len(estados)
+
+
+# ============================================
+# CONSULTA DE ALERTAS
+# ============================================
+
+def fichas_en_alerta(umbral=None, limite=100):
+    """Estados de fichas activas con puntaje >= umbral, del más grave al menos grave"""
+    return (
+        EstadoMeowsFicha.objects
+        .filter(puntaje__gte=umbral_alerta() if umbral is None else umbral, ficha__activa=True)
+        .select_related('ficha__paciente__persona')
+        .order_by('-puntaje', '-fecha')[:limite]
+    )
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TensappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tensApp'
+
+    def ready(self):
+        """Registra las señales que mantienen el estado MEOWS de cada ficha"""
+        from tensApp import signals  # noqa: F401
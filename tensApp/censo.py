@@ -0,0 +1,164 @@
+# tensApp/censo.py
+"""
+Censo de sala: todas las fichas activas con su estado clínico resumido
+Una sola consulta sobre FichaObstetrica; lo "último" de cada ficha (signos
+vitales, administración) viene en subconsultas correlacionadas que retornan
+un objeto JSON, y los conteos en subconsultas agregadas. La cantidad de
+consultas no depende del número de pacientes.
+
+Las dosis pendientes/vencidas se toman de la cola de dosis del turno
+(tensApp.dosis, cacheada), agrupadas por ficha.
+"""
+from collections import Counter
+from datetime import timezone as zona_horaria
+from decimal import Decimal
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, JSONObject
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from matronaApp.models import FichaObstetrica, MedicamentoFicha, AdministracionMedicamento
+from tensApp.dosis import cola_dosis, VENCIDA
+from tensApp.models import RegistroTens
+from tensApp.alertas import ORDEN_RECIENTE
+
+
+PATOLOGIA_SIN_RIESGO = 'NINGUNA'
+
+
+def _ultimo_registro_tens():
+    return Subquery(
+        RegistroTens.objects
+        .filter(ficha_id=OuterRef('pk'), fecha__isnull=False)
+        .order_by(*ORDEN_RECIENTE)
+        .values(datos=JSONObject(
+            fecha='fecha',
+            turno='turno',
+            temperatura='temperatura',
+            frecuencia_cardiaca='frecuencia_cardiaca',
+            presion_arterial='presion_arterial',
+            frecuencia_respiratoria='frecuencia_respiratoria',
+            saturacion_oxigeno='saturacion_oxigeno',
+            puntaje_meows='puntaje_meows',
+            nivel_meows='nivel_meows',
+        ))[:1]
+    )
+
+
+def _ultima_administracion():
+    return Subquery(
+        AdministracionMedicamento.objects
+        .filter(medicamento_ficha__ficha_id=OuterRef('pk'))
+        .order_by('-fecha_hora_administracion')
+        .values(datos=JSONObject(
+            fecha_hora='fecha_hora_administracion',
+            medicamento='medicamento_ficha__nombre_medicamento',
+            exitosa='administrado_exitosamente',
+            tens_nombre='tens__persona__Nombre',
+            tens_apellido='tens__persona__Apellido_Paterno',
+        ))[:1]
+    )
+
+
+def _medicamentos_activos():
+    return Coalesce(
+        Subquery(
+            MedicamentoFicha.objects
+            .filter(ficha_id=OuterRef('pk'), activo=True)
+            .order_by()
+            .values('ficha_id')
+            .annotate(total=Count('id'))
+            .values('total')[:1],
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def _fecha_hora(valor):
+    """Los motores serializan datetimes de forma distinta dentro de JSON: se normaliza a ISO local"""
+    if not valor:
+        return None
+    fecha_hora = parse_datetime(valor) if isinstance(valor, str) else valor
+    if fecha_hora is None:
+        return valor
+    if timezone.is_naive(fecha_hora):
+        fecha_hora = timezone.make_aware(fecha_hora, zona_horaria.utc)
+    return timezone.localtime(fecha_hora).isoformat()
+
+
+def _numero(valor):
+    if isinstance(valor, str):
+        try:
+            valor = float(valor)
+        except ValueError:
+            return valor
+    if isinstance(valor, Decimal):
+        valor = float(valor)
+    return valor
+
+
+def consulta_censo():
+    """Queryset (values) de fichas activas con todas las anotaciones del censo"""
+    return (
+        FichaObstetrica.objects
+        .filter(activa=True)
+        .annotate(
+            ultimo_registro=_ultimo_registro_tens(),
+            ultima_administracion=_ultima_administracion(),
+            medicamentos_activos=_medicamentos_activos(),
+        )
+        .order_by(F('estado_meows__puntaje').desc(nulls_last=True), 'numero_ficha')
+        .values(
+            'id', 'numero_ficha', 'patologias_criticas',
+            'paciente__persona__Rut', 'paciente__persona__Nombre', 'paciente__persona__Apellido_Paterno',
+            'estado_meows__puntaje', 'estado_meows__nivel',
+            'ultimo_registro', 'ultima_administracion', 'medicamentos_activos',
+        )
+    )
+
+
+def censo_sala(horas_dosis=4):
+    """
+    Lista de dicts (uno por ficha activa), ordenada por MEOWS descendente.
+    Usa 1 consulta (+2 si la cola de dosis del turno no está en caché).
+    """
+    dosis_por_ficha = {}
+    for dosis in cola_dosis(horas_dosis):
+        dosis_por_ficha.setdefault(dosis['ficha_id'], Counter())[dosis['estado']] += 1
+
+    censo = []
+    for fila in consulta_censo():
+        registro = fila['ultimo_registro']
+        if registro:
+            registro = {
+                **registro,
+                'temperatura': _numero(registro['temperatura']),
+                'fecha': str(registro['fecha'])[:10],
+            }
+        administracion = fila['ultima_administracion']
+        if administracion:
+            administracion = {
+                'fecha_hora': _fecha_hora(administracion['fecha_hora']),
+                'medicamento': administracion['medicamento'],
+                'exitosa': bool(administracion['exitosa']),
+                'tens': f"{administracion['tens_nombre']} {administracion['tens_apellido']}",
+            }
+        conteo_dosis = dosis_por_ficha.get(fila['id'], Counter())
+        censo.append({
+            'ficha_id': fila['id'],
+            'numero_ficha': fila['numero_ficha'],
+            'rut': fila['paciente__persona__Rut'],
+            'paciente': f"{fila['paciente__persona__Nombre']} {fila['paciente__persona__Apellido_Paterno']}",
+            'patologias_criticas': fila['patologias_criticas'],
+            'critica': fila['patologias_criticas'] not in (None, '', PATOLOGIA_SIN_RIESGO),
+            'meows': fila['estado_meows__puntaje'],
+            'nivel_meows': fila['estado_meows__nivel'],
+            'ultimo_registro': registro,
+            'medicamentos_activos': fila['medicamentos_activos'],
+            'ultima_administracion': administracion,
+            'dosis_vencidas': conteo_dosis[VENCIDA],
+            'dosis_pendientes': sum(conteo_dosis.values()) - conteo_dosis[VENCIDA],
+        })
+    return censo
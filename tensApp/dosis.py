@@ -0,0 +1,209 @@
+# tensApp/dosis.py
+"""
+Horario de dosis de MedicamentoFicha y cola de dosis pendientes/vencidas
+- expandir_horario(): convierte la frecuencia de una prescripción en las horas
+  programadas dentro de un intervalo (entre fecha_inicio y fecha_termino).
+- conciliar(): asocia cada administración registrada a la dosis que cubre.
+- cola_dosis(): dosis pendientes o vencidas de todas las fichas activas en las
+  próximas N horas. Se calcula en bloque (una consulta de prescripciones y otra
+  de administraciones) y se cachea por turno durante TENS_COLA_DOSIS_TTL
+  segundos; las señales de tensApp invalidan el caché del proceso al registrar
+  administraciones o cambiar prescripciones, y el TTL acota la desactualización
+  entre procesos (una dosis ya administrada en otro worker).
+"""
+from bisect import bisect_right
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from matronaApp.models import MedicamentoFicha, AdministracionMedicamento
+
+
+# Horas del día en que corresponde cada frecuencia ('SOS' no se programa)
+HORARIOS_FRECUENCIA = {
+    '1_vez_dia': (8,),
+    '2_veces_dia': (8, 20),
+    '3_veces_dia': (8, 14, 20),
+    'Cada_8_horas': (6, 14, 22),
+    'Cada_12_horas': (8, 20),
+    'SOS': (),
+}
+
+# Una administración cubre la dosis si ocurre desde ANTICIPACION antes de la hora
+# programada y antes de la siguiente dosis (menos la misma anticipación)
+ANTICIPACION = timedelta(hours=1)
+# Una dosis sin administrar pasa a vencida GRACIA después de su hora
+GRACIA = timedelta(minutes=30)
+
+# Turnos de la cola: comienzan a las 08:00 y 20:00
+INICIO_TURNOS = (8, 20)
+DURACION_TURNO = timedelta(hours=12)
+HORIZONTE_MAXIMO = 12   # horas hacia adelante que puede pedir la cola
+RETROSPECTIVA = timedelta(hours=12)   # dosis vencidas que aún se muestran
+TTL_COLA_DEFECTO = 30
+
+PENDIENTE = 'pendiente'
+VENCIDA = 'vencida'
+ADMINISTRADA = 'administrada'
+NO_ADMINISTRADA = 'no_administrada'
+
+
+def _en_hora(fecha, hora):
+    return timezone.make_aware(datetime.combine(fecha, time(hour=hora)))
+
+
+# ============================================
+# HORARIO Y CONCILIACIÓN
+# ============================================
+
+def expandir_horario(frecuencia, fecha_inicio, fecha_termino, desde, hasta):
+    """Datetimes programados de la prescripción dentro de [desde, hasta), en orden"""
+    horas = HORARIOS_FRECUENCIA.get(frecuencia, ())
+    if not horas:
+        return []
+
+    primero = max(fecha_inicio, timezone.localdate(desde))
+    ultimo = min(fecha_termino, timezone.localdate(hasta))
+    programadas = []
+    dia = primero
+    while dia <= ultimo:
+        for hora in horas:
+            momento = _en_hora(dia, hora)
+            if desde <= momento < hasta:
+                programadas.append(momento)
+        dia += timedelta(days=1)
+    return programadas
+
+
+def conciliar(programadas, administraciones):
+    """
+    Estado de cada dosis programada.
+
+    Args:
+        programadas (list): datetimes en orden
+        administraciones (list): tuplas (fecha_hora, administrado_exitosamente)
+
+    Returns:
+        list: [(datetime programado, estado o None si no hay registro)]
+    """
+    estados = [None] * len(programadas)
+    # Inicio de la ventana de cada dosis; la ventana termina donde empieza la siguiente
+    ventanas = [momento - ANTICIPACION for momento in programadas]
+    for fecha_hora, exitosa in sorted(administraciones):
+        indice = bisect_right(ventanas, fecha_hora) - 1
+        if indice < 0 or estados[indice] == ADMINISTRADA:
+            continue
+        estados[indice] = ADMINISTRADA if exitosa else NO_ADMINISTRADA
+    return list(zip(programadas, estados))
+
+
+# ============================================
+# COLA DE DOSIS POR TURNO
+# ============================================
+
+def inicio_turno(momento):
+    """Inicio (aware) del turno que contiene `momento`"""
+    local = timezone.localtime(momento)
+    inicios = [_en_hora(local.date(), hora) for hora in INICIO_TURNOS]
+    anteriores = [inicio for inicio in inicios if inicio <= local]
+    if anteriores:
+        return anteriores[-1]
+    return _en_hora(local.date() - timedelta(days=1), INICIO_TURNOS[-1])
+
+
+def clave_cola(turno):
+    return f'tens:cola_dosis:{turno.isoformat()}'
+
+
+def calcular_dosis_turno(turno):
+    """
+    Todas las dosis programadas del intervalo que cubre el turno (con retrospectiva
+    y horizonte), ya conciliadas. Dos consultas en total.
+    """
+    desde = turno - RETROSPECTIVA
+    hasta = turno + DURACION_TURNO + timedelta(hours=HORIZONTE_MAXIMO)
+
+    prescripciones = list(
+        MedicamentoFicha.objects
+        .filter(
+            activo=True,
+            ficha__activa=True,
+            fecha_inicio__lte=timezone.localdate(hasta),
+            fecha_termino__gte=timezone.localdate(desde),
+        )
+        .exclude(frecuencia='SOS')
+        .values(
+            'id', 'ficha_id', 'ficha__numero_ficha', 'nombre_medicamento', 'dosis',
+            'via_administracion', 'frecuencia', 'fecha_inicio', 'fecha_termino',
+            'ficha__paciente__persona__Nombre', 'ficha__paciente__persona__Apellido_Paterno',
+            'ficha__paciente__persona__Rut',
+        )
+    )
+
+    administraciones = {}
+    filas = AdministracionMedicamento.objects.filter(
+        medicamento_ficha_id__in=[p['id'] for p in prescripciones],
+        fecha_hora_administracion__gte=desde - ANTICIPACION,
+        fecha_hora_administracion__lt=hasta,
+    ).values_list('medicamento_ficha_id', 'fecha_hora_administracion', 'administrado_exitosamente')
+    for medicamento_id, fecha_hora, exitosa in filas:
+        administraciones.setdefault(medicamento_id, []).append((fecha_hora, exitosa))
+
+    dosis = []
+    for prescripcion in prescripciones:
+        programadas = expandir_horario(
+            prescripcion['frecuencia'], prescripcion['fecha_inicio'], prescripcion['fecha_termino'], desde, hasta
+        )
+        for programada, estado in conciliar(programadas, administraciones.get(prescripcion['id'], [])):
+            dosis.append({
+                'medicamento_id': prescripcion['id'],
+                'ficha_id': prescripcion['ficha_id'],
+                'numero_ficha': prescripcion['ficha__numero_ficha'],
+                'paciente': f"{prescripcion['ficha__paciente__persona__Nombre']} "
+                            f"{prescripcion['ficha__paciente__persona__Apellido_Paterno']}",
+                'rut': prescripcion['ficha__paciente__persona__Rut'],
+                'nombre_medicamento': prescripcion['nombre_medicamento'],
+                'dosis': prescripcion['dosis'],
+                'via_administracion': prescripcion['via_administracion'],
+                'programada': programada,
+                'estado': estado,
+            })
+    dosis.sort(key=lambda d: d['programada'])
+    return dosis
+
+
+def dosis_turno(turno):
+    """calcular_dosis_turno() cacheado TENS_COLA_DOSIS_TTL segundos"""
+    clave = clave_cola(turno)
+    dosis = cache.get(clave)
+    if dosis is None:
+        dosis = calcular_dosis_turno(turno)
+        cache.set(clave, dosis, getattr(settings, 'TENS_COLA_DOSIS_TTL', TTL_COLA_DEFECTO))
+    return dosis
+
+
+def invalidar_cola_dosis(momento=None):
+    """Descarta la cola del turno actual (se llama al registrar administraciones o prescripciones)"""
+    cache.delete(clave_cola(inicio_turno(momento or timezone.now())))
+
+
+def cola_dosis(horas=4, ahora=None):
+    """
+    Dosis pendientes en las próximas `horas` y vencidas sin registro, de todas las fichas activas.
+    Cada elemento incluye 'estado': 'pendiente' o 'vencida'.
+    """
+    ahora = ahora or timezone.now()
+    horas = max(1, min(int(horas), HORIZONTE_MAXIMO))
+    limite = ahora + timedelta(hours=horas)
+
+    cola = []
+    for dosis in dosis_turno(inicio_turno(ahora)):
+        if dosis['estado'] is not None or dosis['programada'] >= limite:
+            continue
+        if dosis['programada'] < ahora - RETROSPECTIVA:
+            continue
+        estado = VENCIDA if dosis['programada'] < ahora - GRACIA else PENDIENTE
+        cola.append({**dosis, 'estado': estado})
+    return cola
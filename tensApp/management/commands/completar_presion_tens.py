@@ -0,0 +1,22 @@
+# ============================================
+# UBICACIÓN: tensApp/management/commands/completar_presion_tens.py
+# Completa presión sistólica/diastólica numérica en registros TENS anteriores
+# ============================================
+
+from django.core.management.base import BaseCommand
+from tensApp.signos_vitales import completar_presiones
+
+
+class Command(BaseCommand):
+    help = (
+        'Completa presion_sistolica y presion_diastolica de RegistroTens a partir del texto '
+        'presion_arterial (ej. "120/80"). Ejecutar una vez tras migrar; es idempotente.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=1000, help='Registros por UPDATE')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING('\n📋 Completando presión arterial numérica...'))
+        actualizados = completar_presiones(tamano_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(f'\n✅ COMPLETADO: {actualizados} registros actualizados'))
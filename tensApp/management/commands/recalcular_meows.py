@@ -0,0 +1,25 @@
+# ============================================
+# UBICACIÓN: tensApp/management/commands/recalcular_meows.py
+# Recalcula puntajes MEOWS y el estado de alerta de las fichas
+# ============================================
+
+from django.core.management.base import BaseCommand
+from tensApp.alertas import recalcular_meows
+
+
+class Command(BaseCommand):
+    help = (
+        'Vuelve a puntuar (MEOWS) los registros de signos vitales y reconstruye el estado '
+        'de alerta por ficha. Por defecto procesa las fichas activas.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fichas', nargs='+', type=int, help='IDs de fichas a recalcular')
+        parser.add_argument('--lote', type=int, default=2000, help='Registros leídos por consulta')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING('\n📋 Recalculando puntajes MEOWS...'))
+        registros, estados = recalcular_meows(options['fichas'], tamano_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ COMPLETADO: {registros} registros con puntaje nuevo, {estados} fichas con estado'
+        ))
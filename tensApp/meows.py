@@ -0,0 +1,79 @@
+# tensApp/meows.py
+"""
+Puntaje de alerta temprana obstétrica (MEOWS modificado)
+Cada signo vital suma puntos según la banda en que cae; el total y la
+presencia de algún parámetro en rango crítico definen el nivel de alerta.
+
+Las bandas se expresan como límites inferiores ordenados: bisect ubica el
+valor en O(log n) y el mismo cálculo sirve para un registro o para lotes.
+"""
+from bisect import bisect_right
+
+
+# (límites, puntos): valor < límites[0] -> puntos[0]; límites[i-1] <= valor < límites[i] -> puntos[i]
+BANDAS = {
+    'temperatura': ((35.0, 36.0, 38.0, 39.0), (3, 1, 0, 2, 3)),
+    'frecuencia_cardiaca': ((40, 50, 100, 120, 130), (3, 2, 0, 1, 2, 3)),
+    'presion_sistolica': ((80, 90, 140, 150, 160), (3, 2, 0, 1, 2, 3)),
+    'presion_diastolica': ((90, 100, 110), (0, 1, 2, 3)),
+    'frecuencia_respiratoria': ((10, 21, 30), (3, 0, 2, 3)),
+    'saturacion_oxigeno': ((92, 95), (3, 2, 0)),
+}
+
+SIGNOS_MEOWS = tuple(BANDAS)
+
+PUNTOS_CRITICOS = 3
+
+NIVEL_NORMAL = 'normal'
+NIVEL_BAJO = 'bajo'
+NIVEL_MEDIO = 'medio'
+NIVEL_ALTO = 'alto'
+
+NIVEL_CHOICES = [
+    (NIVEL_NORMAL, 'Normal'),
+    (NIVEL_BAJO, 'Bajo'),
+    (NIVEL_MEDIO, 'Medio'),
+    (NIVEL_ALTO, 'Alto'),
+]
+
+
+def puntos_signo(signo, valor):
+    """Puntos de un signo vital (None si no se midió)"""
+    if valor is None:
+        return None
+    limites, puntos = BANDAS[signo]
+    return puntos[bisect_right(limites, valor)]
+
+
+def nivel_alerta(total, maximo):
+    """
+    Nivel según el total y el mayor puntaje individual:
+    7+ alto; 5-6 o algún parámetro crítico (3) medio; 1-4 bajo; 0 normal.
+    """
+    if total >= 7:
+        return NIVEL_ALTO
+    if total >= 5 or maximo >= PUNTOS_CRITICOS:
+        return NIVEL_MEDIO
+    if total >= 1:
+        return NIVEL_BAJO
+    return NIVEL_NORMAL
+
+
+def calcular_meows(valores):
+    """
+    Args:
+        valores (dict | tuple): signos vitales, por nombre o en el orden de SIGNOS_MEOWS
+
+    Returns:
+        tuple: (total, nivel), o (None, '') si no hay ningún signo medido
+    """
+    if not isinstance(valores, dict):
+        valores = dict(zip(SIGNOS_MEOWS, valores))
+    puntos = [
+        p for p in (puntos_signo(signo, valores.get(signo)) for signo in SIGNOS_MEOWS)
+        if p is not None
+    ]
+    if not puntos:
+        return None, ''
+    total = sum(puntos)
+    return total, nivel_alerta(total, max(puntos))
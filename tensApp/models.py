@@ -1,9 +1,33 @@
+import re
+
 from django.db import models
 from matronaApp.models import FichaObstetrica, MedicamentoFicha
 from gestionApp.models import Tens, Paciente
 
 from django.utils import timezone
 
+from tensApp.meows import NIVEL_CHOICES, SIGNOS_MEOWS, calcular_meows
+
+
+# ============================================
+# PRESIÓN ARTERIAL
+# ============================================
+
+PRESION_REGEX = re.compile(r'^\s*(\d{2,3})\s*/\s*(\d{2,3})\s*(mmhg)?\s*$', re.IGNORECASE)
+
+
+def parsear_presion(texto):
+    """'120/80' (o '120 / 80 mmHg') -> (120, 80); None si no tiene ese formato"""
+    coincidencia = PRESION_REGEX.match(texto or '')
+    if not coincidencia:
+        return None
+    return int(coincidencia.group(1)), int(coincidencia.group(2))
+
+
+def formatear_presion(sistolica, diastolica):
+    return f'{sistolica}/{diastolica}'
+
+
 class RegistroTens(models.Model):
     TURNO_CHOICES = [
         ('manana', 'Mañana'),
@@ -17,10 +41,18 @@ class RegistroTens(models.Model):
 
     # Signos Vitales
     temperatura = models.DecimalField(max_digits=4, decimal_places=1, blank=True, null=True)
-    frecuencia_cardiaca = models.PositiveBigIntegerField(blank=True, null=True)
+    frecuencia_cardiaca = models.PositiveSmallIntegerField(blank=True, null=True)
     presion_arterial = models.CharField(max_length=20, blank=True, null=True)
-    frecuencia_respiratoria = models.PositiveBigIntegerField(blank=True, null=True)
-    saturacion_oxigeno = models.PositiveBigIntegerField(blank=True, null=True)
+    frecuencia_respiratoria = models.PositiveSmallIntegerField(blank=True, null=True)
+    saturacion_oxigeno = models.PositiveSmallIntegerField(blank=True, null=True)
+
+    # Presión arterial numérica (derivada de presion_arterial al guardar) para tendencias
+    presion_sistolica = models.PositiveSmallIntegerField(blank=True, null=True, editable=False)
+    presion_diastolica = models.PositiveSmallIntegerField(blank=True, null=True, editable=False)
+
+    # Alerta temprana obstétrica (calculada al guardar, ver tensApp/meows.py)
+    puntaje_meows = models.PositiveSmallIntegerField(blank=True, null=True, editable=False)
+    nivel_meows = models.CharField(max_length=10, choices=NIVEL_CHOICES, blank=True, editable=False)
 
     observaciones = models.TextField(blank=True, null=True)
     fecha_registro = models.DateTimeField(auto_now_add=True)
@@ -28,8 +60,47 @@ class RegistroTens(models.Model):
     def __str__(self):
         return f"Registro TENS - {self.ficha.numero_ficha} - {self.fecha}"
     
+    def save(self, *args, **kwargs):
+        """Sincroniza sistólica/diastólica con el texto de presion_arterial y calcula el MEOWS"""
+        presion = parsear_presion(self.presion_arterial)
+        self.presion_sistolica, self.presion_diastolica = presion or (None, None)
+        if presion:
+            self.presion_arterial = formatear_presion(*presion)
+        self.puntaje_meows, self.nivel_meows = calcular_meows(
+            {signo: self._meta.get_field(signo).to_python(getattr(self, signo)) for signo in SIGNOS_MEOWS}
+        )
+        super().save(*args, **kwargs)
+    
     class Meta:
         ordering = ['-fecha', '-fecha_registro']
+        indexes = [
+            models.Index(fields=['ficha', 'fecha', 'turno']),
+        ]
+
+
+class EstadoMeowsFicha(models.Model):
+    """
+    Último puntaje MEOWS de cada ficha (tabla materializada)
+    Se actualiza con cada RegistroTens guardado o eliminado; el listado de
+    pacientes en alerta filtra por el índice de puntaje sin recorrer registros.
+    """
+    ficha = models.OneToOneField(FichaObstetrica, on_delete=models.CASCADE, related_name='estado_meows')
+    registro = models.ForeignKey(RegistroTens, on_delete=models.CASCADE, related_name='+')
+    puntaje = models.PositiveSmallIntegerField()
+    nivel = models.CharField(max_length=10, choices=NIVEL_CHOICES)
+    fecha = models.DateField()
+    turno = models.CharField(max_length=10, choices=RegistroTens.TURNO_CHOICES, blank=True, null=True)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"MEOWS {self.puntaje} ({self.nivel}) - {self.ficha_id}"
+
+    class Meta:
+        verbose_name = "Estado MEOWS de Ficha"
+        verbose_name_plural = "Estados MEOWS de Fichas"
+        indexes = [
+            models.Index(fields=['-puntaje']),
+        ]
 
 
 # tratamientos por f
@@ -65,4 +136,8 @@ class Tratamiento_aplicado(models.Model):
 
     class Meta:
         verbose_name = "Tratamiento Aplicado"
-        verbose_name_plural = "Tratamientos Aplicados"
\ No newline at end of file
+        verbose_name_plural = "Tratamientos Aplicados"
+        indexes = [
+            models.Index(fields=['-fecha_aplicacion', '-hora_aplicacion']),
+            models.Index(fields=['ficha', '-fecha_aplicacion']),
+        ]
@@ -0,0 +1,30 @@
+# tensApp/signals.py
+"""
+Señales del módulo TENS
+- Mantienen EstadoMeowsFicha al día con el último registro de signos vitales.
+- Invalidan la cola de dosis del turno cuando cambian prescripciones,
+  administraciones o el estado de una ficha.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from matronaApp.models import FichaObstetrica, MedicamentoFicha, AdministracionMedicamento
+from tensApp.alertas import actualizar_estado_ficha
+from tensApp.dosis import invalidar_cola_dosis
+from tensApp.models import RegistroTens
+
+
+@receiver([post_save, post_delete], sender=RegistroTens)
+def actualizar_alerta_meows(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    actualizar_estado_ficha(instance.ficha_id)
+
+
+@receiver([post_save, post_delete], sender=MedicamentoFicha)
+@receiver([post_save, post_delete], sender=AdministracionMedicamento)
+@receiver([post_save, post_delete], sender=FichaObstetrica)
+def invalidar_dosis(sender, raw=False, **kwargs):
+    if raw:
+        return
+    invalidar_cola_dosis()
@@ -0,0 +1,149 @@
+# tensApp/signos_vitales.py
+"""
+Series de tiempo de signos vitales (RegistroTens)
+Consultas para gráficos: retornan listas paralelas (formato columnar) leídas
+con values()/values_list(), sin instanciar objetos del ORM. Usan el índice
+(ficha, fecha, turno).
+
+- serie_signos(): cada medición, en orden cronológico.
+- tendencia_signos(): agregado por turno o por día con mínimo, máximo y media.
+"""
+from decimal import Decimal
+
+from django.db.models import Avg, Count, Max, Min
+
+from tensApp.models import RegistroTens, parsear_presion
+
+
+SIGNOS = (
+    'temperatura',
+    'frecuencia_cardiaca',
+    'presion_sistolica',
+    'presion_diastolica',
+    'frecuencia_respiratoria',
+    'saturacion_oxigeno',
+)
+
+AGRUPACIONES = {
+    'turno': ('fecha', 'turno'),
+    'dia': ('fecha',),
+}
+
+
+def _numero(valor, decimales=1):
+    """Decimal/float -> float redondeado (JSON); None se mantiene"""
+    if valor is None:
+        return None
+    if isinstance(valor, Decimal):
+        valor = float(valor)
+    return round(valor, decimales) if isinstance(valor, float) else valor
+
+
+def _registros(ficha_id, desde=None, hasta=None):
+    registros = RegistroTens.objects.filter(ficha_id=ficha_id, fecha__isnull=False)
+    if desde:
+        registros = registros.filter(fecha__gte=desde)
+    if hasta:
+        registros = registros.filter(fecha__lte=hasta)
+    return registros
+
+
+def serie_signos(ficha_id, desde=None, hasta=None, signos=SIGNOS):
+    """
+    Mediciones de la ficha entre `desde` y `hasta` (fechas incluidas).
+
+    Returns:
+        dict: {'fechas': [...], 'turnos': [...], '<signo>': [...], ...}
+    """
+    columnas = ('fecha', 'turno') + tuple(signos)
+    serie = {'fechas': [], 'turnos': [], **{signo: [] for signo in signos}}
+    filas = (
+        _registros(ficha_id, desde, hasta)
+        .order_by('fecha', 'turno', 'fecha_registro')
+        .values_list(*columnas)
+    )
+    for fecha, turno, *valores in filas:
+        serie['fechas'].append(fecha.isoformat())
+        serie['turnos'].append(turno)
+        for signo, valor in zip(signos, valores):
+            serie[signo].append(_numero(valor))
+    return serie
+
+
+def tendencia_signos(ficha_id, por='dia', desde=None, hasta=None, signos=SIGNOS):
+    """
+    Signos agregados por turno ('turno') o por día ('dia'), en una sola consulta.
+
+    Returns:
+        dict: {
+            'por': 'dia',
+            'fechas': [...], 'turnos': [...] (solo por turno),
+            'mediciones': [...],
+            'series': {'<signo>': {'min': [...], 'max': [...], 'media': [...]}},
+        }
+    """
+    if por not in AGRUPACIONES:
+        raise ValueError(f"Agrupación no válida: {por!r} (use {', '.join(AGRUPACIONES)})")
+    grupo = AGRUPACIONES[por]
+
+    agregados = {'mediciones': Count('id')}
+    for signo in signos:
+        agregados[f'{signo}__min'] = Min(signo)
+        agregados[f'{signo}__max'] = Max(signo)
+        agregados[f'{signo}__media'] = Avg(signo)
+
+    filas = (
+        _registros(ficha_id, desde, hasta)
+        .values(*grupo)
+        .annotate(**agregados)
+        .order_by(*grupo)
+    )
+
+    tendencia = {
+        'por': por,
+        'fechas': [],
+        'mediciones': [],
+        'series': {signo: {'min': [], 'max': [], 'media': []} for signo in signos},
+    }
+    if por == 'turno':
+        tendencia['turnos'] = []
+
+    for fila in filas:
+        tendencia['fechas'].append(fila['fecha'].isoformat())
+        if por == 'turno':
+            tendencia['turnos'].append(fila['turno'])
+        tendencia['mediciones'].append(fila['mediciones'])
+        for signo in signos:
+            for medida in ('min', 'max', 'media'):
+                tendencia['series'][signo][medida].append(_numero(fila[f'{signo}__{medida}']))
+    return tendencia
+
+
+def completar_presiones(tamano_lote=1000):
+    """
+    Completa presion_sistolica / presion_diastolica de registros anteriores a
+    esas columnas, a partir del texto de presion_arterial. Retorna cuántos actualizó.
+    Recorre por lotes de id creciente (sin OFFSET ni cursores abiertos al actualizar).
+    """
+    pendientes = (
+        RegistroTens.objects
+        .filter(presion_sistolica__isnull=True, presion_arterial__isnull=False)
+        .exclude(presion_arterial='')
+        .order_by('id')
+    )
+
+    actualizados = 0
+    ultimo_id = 0
+    while True:
+        lote = list(pendientes.filter(id__gt=ultimo_id).values_list('id', 'presion_arterial')[:tamano_lote])
+        if not lote:
+            return actualizados
+        ultimo_id = lote[-1][0]
+
+        cambios = []
+        for registro_id, texto in lote:
+            presion = parsear_presion(texto)
+            if presion:
+                cambios.append(RegistroTens(id=registro_id, presion_sistolica=presion[0], presion_diastolica=presion[1]))
+        RegistroTens.objects.bulk_update(cambios, ['presion_sistolica', 'presion_diastolica'])
+        actualizados += len(cambios)
@@ -39,6 +39,11 @@ urlpatterns = [
     # ============================================
     path('parametros/', views.registrar_tens, name='parametros_tens'),
     path('registrar/', views.registrar_tens, name='registrar_tens'),
+    path('ficha/<int:ficha_pk>/signos/tendencia/', views.tendencia_signos_ficha, name='tendencia_signos'),
+    path('api/alertas-meows/', views.alertas_meows, name='alertas_meows'),
+    path('dosis/', views.cola_dosis_tens, name='cola_dosis'),
+    path('api/dosis/', views.api_cola_dosis, name='api_cola_dosis'),
+    path('api/censo/', views.api_censo_sala, name='censo_sala'),
 
     
 
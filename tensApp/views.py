@@ -1,4 +1,6 @@
 # tensApp/views.py
+from datetime import date
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.http import JsonResponse
@@ -6,6 +8,7 @@ from django.db.models import Q, Count, Prefetch
 from django.utils import timezone
 
 from gestionApp.models import Tens, Persona, Paciente
+from gestionApp.busqueda import buscar_pacientes
 from matronaApp.models import (
     FichaObstetrica, MedicamentoFicha, AdministracionMedicamento,IngresoPaciente )
 from tensApp.forms.administracion_forms import AdministracionMedicamentoForm
@@ -18,6 +21,14 @@ from gestionApp.forms.tens_forms import FormularioTratamientoAplicado
 from tensApp.models import Tratamiento_aplicado
 from gestionApp.models import Paciente
 from matronaApp.models import FichaObstetrica,MedicamentoFicha, AdministracionMedicamento
+from utilidad.paginacion import paginar_keyset
+from tensApp.signos_vitales import AGRUPACIONES, serie_signos, tendencia_signos
+from tensApp.alertas import fichas_en_alerta, umbral_alerta
+from tensApp.meows import NIVEL_MEDIO, NIVEL_ALTO
+from tensApp.dosis import cola_dosis, HORIZONTE_MAXIMO, VENCIDA
+from tensApp.censo import censo_sala
+from utilidad.autocompletar import Autocompletado, respuesta_json
+from utilidad.rut_validator import normalizar_rut
 
 # ============================================
 # MENÚ PRINCIPAL TENS
@@ -52,53 +63,47 @@ def buscar_paciente_tens(request):
     pacientes = []
     
     if query:
-        pacientes = Paciente.objects.filter(
-            Q(activo=True)
-        ).filter(
-            Q(persona__Rut__icontains=query) |
-            Q(persona__Nombre__icontains=query) |
-            Q(persona__Apellido_Paterno__icontains=query) |
-            Q(persona__Apellido_Materno__icontains=query)
-        ).select_related('persona').annotate(
-            num_fichas=Count('fichas_obstetricas')
+        pacientes = buscar_pacientes(
+            query,
+            queryset=Paciente.objects.filter(activo=True).select_related('persona').annotate(
+                num_fichas=Count('fichas_obstetricas')
+            )
         )
     
-    return render(request, 'tens/data/buscar_paciente.html', {
+    return render(request, 'Tens/Data/buscar_paciente.html', {
         'pacientes': pacientes,
         'query': query
     })
 
 
-def api_buscar_paciente(request):
-    """API JSON para búsqueda de pacientes"""
-    rut = request.GET.get('rut', '').strip()
+async def _paciente_por_rut(rut):
+    paciente = await Paciente.objects.select_related('persona').filter(
+        persona__Rut=rut,
+        activo=True
+    ).afirst()
+    if paciente is None:
+        return {'encontrado': False, 'mensaje': 'Paciente no encontrado'}
+    return {
+        'encontrado': True,
+        'paciente': {
+            'id': paciente.pk,
+            'rut': paciente.persona.Rut,
+            'nombre_completo': f"{paciente.persona.Nombre} {paciente.persona.Apellido_Paterno} {paciente.persona.Apellido_Materno}",
+            'edad': paciente.edad,
+        }
+    }
+
+AUTOCOMPLETADO_PACIENTE = Autocompletado('tens:api_buscar_paciente', _paciente_por_rut)
+
+
+async def api_buscar_paciente(request):
+    """API JSON para búsqueda de pacientes (async, cacheada por RUT normalizado)"""
+    rut = normalizar_rut(request.GET.get('rut', '').strip())
     
     if not rut:
         return JsonResponse({'encontrado': False, 'mensaje': 'RUT no proporcionado'})
     
-    try:
-        from utilidad.rut_validator import normalizar_rut
-        rut_normalizado = normalizar_rut(rut)
-        
-        paciente = Paciente.objects.select_related('persona').get(
-            persona__Rut=rut_normalizado,
-            activo=True
-        )
-        
-        return JsonResponse({
-            'encontrado': True,
-            'paciente': {
-                'id': paciente.pk,
-                'rut': paciente.persona.Rut,
-                'nombre_completo': f"{paciente.persona.Nombre} {paciente.persona.Apellido_Paterno} {paciente.persona.Apellido_Materno}",
-                'edad': paciente.Edad,
-            }
-        })
-    except Paciente.DoesNotExist:
-        return JsonResponse({
-            'encontrado': False,
-            'mensaje': 'Paciente no encontrado'
-        })
+    return respuesta_json(await AUTOCOMPLETADO_PACIENTE.resolver(rut))
 
 
 # ============================================
@@ -121,7 +126,7 @@ def ver_fichas_paciente(request, paciente_pk):
         num_medicamentos=Count('medicamentos', filter=Q(medicamentos__activo=True))
     ).order_by('-fecha_creacion')
     
-    return render(request, 'tens/Data/ver_fichas.html', {
+    return render(request, 'Tens/Data/ver_fichas.html', {
         'paciente': paciente,
         'fichas': fichas
     })
@@ -156,7 +161,7 @@ def detalle_ficha_tens(request, ficha_pk):
     total_medicamentos = medicamentos.count()
     total_tratamientos = tratamientos.count()
 
-    return render(request, 'tens/formularios/detalle_ficha.html', {
+    return render(request, 'Tens/Formularios/detalle_ficha.html', {
         'ficha': ficha,
         'paciente': ficha.paciente,
         'medicamentos': medicamentos,
@@ -165,6 +170,57 @@ def detalle_ficha_tens(request, ficha_pk):
         'total_tratamientos': total_tratamientos,
     })
 
+# ============================================
+# COLA DE DOSIS DEL TURNO
+# ============================================
+
+def _horas_cola(request, defecto=4):
+    try:
+        return max(1, min(int(request.GET.get('horas', defecto)), HORIZONTE_MAXIMO))
+    except ValueError:
+        return defecto
+
+
+def cola_dosis_tens(request):
+    """Dosis pendientes y vencidas de todas las fichas activas (?horas=N)"""
+    horas = _horas_cola(request)
+    cola = cola_dosis(horas)
+    total_vencidas = sum(1 for dosis in cola if dosis['estado'] == VENCIDA)
+    
+    return render(request, 'Tens/Data/cola_dosis.html', {
+        'cola': cola,
+        'horas': horas,
+        'opciones_horas': [2, 4, 8, 12],
+        'total_vencidas': total_vencidas,
+        'total_pendientes': len(cola) - total_vencidas,
+    })
+
+
+def api_cola_dosis(request):
+    """API JSON de la cola de dosis (?horas=N)"""
+    horas = _horas_cola(request)
+    cola = [
+        {**dosis, 'programada': dosis['programada'].isoformat()}
+        for dosis in cola_dosis(horas)
+    ]
+    return JsonResponse({'horas': horas, 'total': len(cola), 'dosis': cola})
+
+
+def api_censo_sala(request):
+    """
+    API JSON: censo de todas las fichas activas (últimos signos, MEOWS, medicamentos,
+    última administración, dosis del turno y patologías críticas) en una sola llamada
+    ?horas=N para la ventana de dosis pendientes
+    """
+    censo = censo_sala(_horas_cola(request))
+    return JsonResponse({
+        'generado': timezone.localtime().isoformat(),
+        'total_fichas': len(censo),
+        'criticas': sum(1 for ficha in censo if ficha['critica']),
+        'fichas': censo,
+    })
+
+
 # ============================================
 # ADMINISTRACIÓN DE MEDICAMENTOS
 # ============================================
@@ -234,7 +290,7 @@ def historial_administraciones(request, ficha_pk):
         'tens__persona'
     ).order_by('-fecha_hora_administracion')
     
-    return render(request, 'tens/historial_administraciones.html', {
+    return render(request, 'Tens/Data/historial_administraciones.html', {
         'ficha': ficha,
         'paciente': ficha.paciente,
         'administraciones': administraciones
@@ -292,6 +348,12 @@ def registrar_tens(request):
                 registro.ficha = ficha
                 registro.save()
                 messages.success(request, 'Registro guardado exitosamente')
+                if registro.nivel_meows in (NIVEL_MEDIO, NIVEL_ALTO):
+                    messages.warning(
+                        request,
+                        f'⚠️ MEOWS {registro.puntaje_meows} (riesgo {registro.get_nivel_meows_display().lower()}): '
+                        f'avise a la matrona responsable'
+                    )
                 # Limpiar sesión después de guardar para buscar nuevo paciente
                 if 'ficha_id' in request.session:
                     del request.session['ficha_id']
@@ -314,7 +376,7 @@ def registrar_tens(request):
     if ficha:
         ultimos_registros = RegistroTens.objects.filter(
             ficha=ficha
-        ).order_by('-fecha')[:10]
+        ).select_related('tens_responsable__persona').order_by('-fecha', '-fecha_registro')[:10]
     
     context = {
         'buscar_form': buscar_form,
@@ -323,7 +385,53 @@ def registrar_tens(request):
         'ultimos_registros': ultimos_registros,
     }
     
-    return render(request, 'tens/formularios/registro_tens.html', context)
+    return render(request, 'Tens/Formularios/registro_tens.html', context)
+
+
+def tendencia_signos_ficha(request, ficha_pk):
+    """
+    API JSON: tendencia de signos vitales de una ficha para gráficos
+    ?por=dia|turno|medicion&desde=YYYY-MM-DD&hasta=YYYY-MM-DD
+    """
+    ficha = get_object_or_404(FichaObstetrica, pk=ficha_pk)
+    por = request.GET.get('por', 'dia')
+    try:
+        desde = date.fromisoformat(request.GET['desde']) if request.GET.get('desde') else None
+        hasta = date.fromisoformat(request.GET['hasta']) if request.GET.get('hasta') else None
+    except ValueError:
+        return JsonResponse({'error': 'Fechas inválidas (use YYYY-MM-DD)'}, status=400)
+    
+    if por == 'medicion':
+        return JsonResponse({'por': por, **serie_signos(ficha.pk, desde, hasta)})
+    if por not in AGRUPACIONES:
+        return JsonResponse({'error': f"Agrupación no válida: {por}"}, status=400)
+    return JsonResponse(tendencia_signos(ficha.pk, por, desde, hasta))
+
+
+def alertas_meows(request):
+    """
+    API JSON: pacientes con fichas activas cuyo último MEOWS alcanza el umbral
+    ?umbral=N (default: settings.MEOWS_UMBRAL_ALERTA)
+    """
+    try:
+        umbral = int(request.GET['umbral']) if request.GET.get('umbral') else umbral_alerta()
+    except ValueError:
+        return JsonResponse({'error': 'Umbral inválido'}, status=400)
+    
+    alertas = [
+        {
+            'ficha_id': estado.ficha_id,
+            'numero_ficha': estado.ficha.numero_ficha,
+            'paciente': f'{estado.ficha.paciente.persona.Nombre} {estado.ficha.paciente.persona.Apellido_Paterno}',
+            'rut': estado.ficha.paciente.persona.Rut,
+            'puntaje': estado.puntaje,
+            'nivel': estado.nivel,
+            'fecha': estado.fecha.isoformat(),
+            'turno': estado.turno,
+        }
+        for estado in fichas_en_alerta(umbral)
+    ]
+    return JsonResponse({'umbral': umbral, 'total': len(alertas), 'alertas': alertas})
 
 
 # ============================================
@@ -364,7 +472,7 @@ def registrar_administracion(request, medicamento_pk):
             'fecha_hora_administracion': timezone.now()
         })
 
-    return render(request, 'tens/formularios/registrar_administracion.html', {
+    return render(request, 'Tens/Formularios/registrar_administracion.html', {
         'form': form,
         'medicamento': medicamento_ficha,
         'ficha': medicamento_ficha.ficha,
@@ -383,7 +491,7 @@ def historial_administraciones(request, ficha_pk):
         medicamento_ficha__ficha=ficha
     ).select_related('medicamento_ficha', 'tens__persona').order_by('-fecha_hora_administracion')
 
-    return render(request, 'tens/historial_administraciones.html', {
+    return render(request, 'Tens/Data/historial_administraciones.html', {
         'ficha': ficha,
         'paciente': ficha.paciente,
         'administraciones': administraciones
@@ -458,7 +566,7 @@ def registrar_tratamiento(request, ficha_pk):
             }
         )
 
-    return render(request, 'tens/formularios/registrar_tratamiento.html', {
+    return render(request, 'Tens/Formularios/registrar_tratamiento.html', {
         'titulo': 'Registrar Tratamiento Aplicado',
         'form': form,
         'ficha': ficha,
@@ -483,7 +591,7 @@ def listar_tratamientos_ficha(request, ficha_pk):
         'medicamento_ficha'
     ).order_by('-fecha_aplicacion', '-hora_aplicacion')
     
-    return render(request, 'tens/formularios/listar_tratamientos_ficha.html', {
+    return render(request, 'Tens/Formularios/listar_tratamientos_ficha.html', {
         'titulo': f'Tratamientos - Ficha {ficha.numero_ficha}',
         'ficha': ficha,
         'paciente': ficha.paciente,
@@ -532,7 +640,7 @@ def editar_tratamiento(request, tratamiento_pk):
             ficha=ficha
         )
 
-    return render(request, 'tens/formularios/registrar_tratamiento.html', {
+    return render(request, 'Tens/Formularios/registrar_tratamiento.html', {
         'form': form,
         'titulo': 'Editar Tratamiento Aplicado',
         'ficha': ficha,
@@ -580,20 +688,23 @@ def restaurar_tratamiento(request, tratamiento_pk):
 # LISTADOS GENERALES DE TRATAMIENTOS (OPCIONAL)
 # ============================================
 
+# Orden de los listados paginados; 'id' desempata registros de la misma hora
+ORDEN_TRATAMIENTOS = ('-fecha_aplicacion', '-hora_aplicacion', '-id')
+# Todo lo que muestra listar_tratamientos.html por fila
+RELACIONES_TRATAMIENTOS = ('ficha', 'paciente__persona', 'tens__persona', 'medicamento_ficha')
+
 def listar_todos_tratamientos(request):
     """
     Listar todos los tratamientos del sistema (para reportes)
     """
-    tratamientos = Tratamiento_aplicado.objects.select_related(
-        'ficha__paciente__persona',
-        'tens__persona',
-        'ficha'
-    ).order_by('-fecha_aplicacion', '-hora_aplicacion')
+    tratamientos = Tratamiento_aplicado.objects.select_related(*RELACIONES_TRATAMIENTOS)
+    pagina = paginar_keyset(tratamientos, ORDEN_TRATAMIENTOS, request.GET, contar=True)
     
-    return render(request, 'tens/formularios/listar_tratamientos.html', {
+    return render(request, 'Tens/Formularios/listar_tratamientos.html', {
         'titulo': 'Todos los Tratamientos Aplicados',
-        'tratamientos': tratamientos,
-        'total_tratamientos': tratamientos.count(),
+        'tratamientos': pagina,
+        'pagina': pagina,
+        'total_tratamientos': pagina.total,
         'fecha_actual': timezone.now(),
     })
 
@@ -602,16 +713,14 @@ def listar_tratamientos_activos(request):
     """Listar solo tratamientos activos"""
     tratamientos = Tratamiento_aplicado.objects.filter(
         activo=True
-    ).select_related(
-        'ficha__paciente__persona',
-        'tens__persona',
-        'ficha'
-    ).order_by('-fecha_aplicacion', '-hora_aplicacion')
+    ).select_related(*RELACIONES_TRATAMIENTOS)
+    pagina = paginar_keyset(tratamientos, ORDEN_TRATAMIENTOS, request.GET, contar=True)
     
-    return render(request, 'tens/formularios/listar_tratamientos.html', {
+    return render(request, 'Tens/Formularios/listar_tratamientos.html', {
         'titulo': 'Tratamientos Activos',
-        'tratamientos': tratamientos,
-        'total_tratamientos': tratamientos.count(),
+        'tratamientos': pagina,
+        'pagina': pagina,
+        'total_tratamientos': pagina.total,
         'fecha_actual': timezone.now(),
     })
 
@@ -620,15 +729,13 @@ def listar_tratamientos_inactivos(request):
     """Listar solo tratamientos inactivos/eliminados"""
     tratamientos = Tratamiento_aplicado.objects.filter(
         activo=False
-    ).select_related(
-        'ficha__paciente__persona',
-        'tens__persona',
-        'ficha'
-    ).order_by('-fecha_aplicacion', '-hora_aplicacion')
+    ).select_related(*RELACIONES_TRATAMIENTOS)
+    pagina = paginar_keyset(tratamientos, ORDEN_TRATAMIENTOS, request.GET, contar=True)
     
-    return render(request, 'tens/formularios/listar_tratamientos.html', {
+    return render(request, 'Tens/Formularios/listar_tratamientos.html', {
         'titulo': 'Tratamientos Inactivos',
-        'tratamientos': tratamientos,
-        'total_tratamientos': tratamientos.count(),
+        'tratamientos': pagina,
+        'pagina': pagina,
+        'total_tratamientos': pagina.total,
         'fecha_actual': timezone.now(),
     })
\ No newline at end of file
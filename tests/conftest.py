@@ -0,0 +1,66 @@
+import pytest
+from datetime import date
+from django.db import connections
+from gestionApp.models import Persona, Paciente, Matrona, Tens
+from matronaApp.models import FichaObstetrica
+from legacyApp.models import ControlesPrevios
+from utilidad.autocompletar import invalidar_autocompletado
+
+
+@pytest.fixture(autouse=True)
+def _presupuesto_consultas_estricto(settings):
+    """En las pruebas, exceder PRESUPUESTO_CONSULTAS hace fallar el request"""
+    settings.PRESUPUESTO_CONSULTAS_ESTRICTO = True
+
+
+@pytest.fixture(autouse=True)
+def _autocompletado_vacio():
+    """El rollback de cada prueba no dispara señales: el caché de autocompletado no debe sobrevivirla"""
+    invalidar_autocompletado()
+
+
+@pytest.fixture
+def paciente(db):
+    persona = Persona.objects.create(
+        Rut="16293109-1", Nombre="Ana", Apellido_Paterno="Silva", Apellido_Materno="Rivas",
+        Sexo="Femenino", Fecha_nacimiento=date(1990, 1, 1),
+    )
+    return Paciente.objects.create(persona=persona, Estado_civil="SOLTERA", Previcion="FONASA_A")
+
+
+@pytest.fixture
+def matrona(db):
+    persona = Persona.objects.create(
+        Rut="12345678-5", Nombre="Carla", Apellido_Paterno="Rojas", Apellido_Materno="Soto",
+        Sexo="Femenino", Fecha_nacimiento=date(1985, 5, 5),
+    )
+    return Matrona.objects.create(
+        persona=persona, Especialidad="Atención del Parto", Registro_medico="MAT-001",
+        Años_experiencia=8, Turno="Mañana",
+    )
+
+
+@pytest.fixture
+def tens(db):
+    persona = Persona.objects.create(
+        Rut="11111111-1", Nombre="Luis", Apellido_Paterno="Muñoz", Apellido_Materno="Vera",
+        Sexo="Masculino", Fecha_nacimiento=date(1992, 3, 3),
+    )
+    return Tens.objects.create(
+        persona=persona, Nivel="Preparto", Años_experiencia=4, Turno="Mañana", Certificaciones="SVB",
+    )
+
+
+@pytest.fixture
+def ficha(paciente, matrona):
+    return FichaObstetrica.objects.create(paciente=paciente, matrona_responsable=matrona)
+
+
+@pytest.fixture(scope="module")
+def tabla_controles_previos(django_db_setup, django_db_blocker):
+    """controles_previos no es administrada por Django: se crea solo para estas pruebas"""
+    with django_db_blocker.unblock(), connections["legacy"].schema_editor() as editor:
+        editor.create_model(ControlesPrevios)
+    yield
+    with django_db_blocker.unblock(), connections["legacy"].schema_editor() as editor:
+        editor.delete_model(ControlesPrevios)
@@ -0,0 +1,100 @@
+"""
+Asistente de parto por pasos (partosApp.asistente): borrador en sesión e
+inserción única al final
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from partosApp.asistente import CLAVE_SESION
+from partosApp.forms import RegistroPartoCompletoForm
+from partosApp.models import RegistroParto
+
+
+def _pasos(ficha):
+    return [
+        (reverse("partos:registrar_parto_paso1", args=[ficha.pk]), {
+            "ficha": ficha.pk, "fecha_hora_admision": "2025-03-10T08:30",
+        }),
+        (reverse("partos:registrar_parto_paso2"), {
+            "vih_tomado_sala": "NO", "edad_gestacional_semanas": 39, "edad_gestacional_dias": 2,
+            "numero_tactos_vaginales": 3, "rotura_membrana": "ESPONTANEA", "monitor_ttc": "on",
+        }),
+        (reverse("partos:registrar_parto_paso3"), {
+            "tipo_regimen": "LIQUIDO", "tipo_parto": "EUTOCICO",
+            "clasificacion_robson": "GRUPO_1", "posicion_materna_parto": "SEMISENTADA",
+        }),
+        (reverse("partos:registrar_parto_paso4"), {"estado_perine": "INDEMNE"}),
+        (reverse("partos:registrar_parto_paso5"), {"analgesia_no_farmacologica": "on"}),
+        (reverse("partos:registrar_parto_paso6"), {"profesional_responsable": "Matrona de turno"}),
+    ]
+
+
+@pytest.mark.django_db
+def test_parto_se_inserta_una_vez_al_final(client, ficha):
+    pasos = _pasos(ficha)
+    for url, datos in pasos[:-1]:
+        assert client.post(url, datos).status_code == 302
+    assert not RegistroParto.objects.exists()
+
+    url, datos = pasos[-1]
+    with CaptureQueriesContext(connection) as consultas:
+        respuesta = client.post(url, datos)
+    inserciones = [q["sql"] for q in consultas.captured_queries if q["sql"].startswith('INSERT INTO "partosApp_registroparto"')]
+    assert len(inserciones) == 1
+
+    parto = RegistroParto.objects.get()
+    assert respuesta.url == reverse("partos:detalle_parto", args=[parto.pk])
+    assert (parto.ficha_id, parto.edad_gestacional_semanas, parto.tipo_parto, parto.estado_perine) == (
+        ficha.pk, 39, "EUTOCICO", "INDEMNE")
+    assert parto.monitor_ttc and parto.analgesia_no_farmacologica and not parto.induccion
+    assert parto.profesional_responsable == "Matrona de turno"
+    assert CLAVE_SESION not in client.session
+
+
+@pytest.mark.django_db
+def test_pasos_intermedios_sin_consultas_a_partos(client, ficha):
+    pasos = _pasos(ficha)
+    client.post(*pasos[0])
+    for url, datos in pasos[1:-1]:
+        with CaptureQueriesContext(connection) as consultas:
+            assert client.post(url, datos).status_code == 302
+        assert not any("registroparto" in q["sql"].lower() for q in consultas.captured_queries)
+
+
+@pytest.mark.django_db
+def test_no_se_puede_saltar_pasos(client, ficha):
+    pasos = _pasos(ficha)
+    assert client.post(*pasos[3]).url == reverse("partos:seleccionar_ficha")
+
+    client.post(*pasos[0])
+    respuesta = client.post(*pasos[3])
+    assert respuesta.url == reverse("partos:registrar_parto_paso2")
+    assert not RegistroParto.objects.exists()
+
+
+@pytest.mark.django_db
+def test_editar_parto_escribe_solo_columnas_modificadas(client, ficha):
+    for url, datos in _pasos(ficha):
+        client.post(url, datos)
+    parto = RegistroParto.objects.get()
+    formulario = RegistroPartoCompletoForm(instance=parto)
+    datos = {}
+    for nombre, campo in formulario.fields.items():
+        valor = formulario[nombre].value()
+        if isinstance(valor, bool):
+            if valor:
+                datos[nombre] = "on"
+        elif valor is not None:
+            datos[nombre] = campo.widget.format_value(valor) if hasattr(valor, "isoformat") else valor
+    datos["observaciones"] = "Sin incidentes"
+
+    with CaptureQueriesContext(connection) as consultas:
+        respuesta = client.post(reverse("partos:editar_parto", args=[parto.pk]), datos)
+    assert respuesta.status_code == 302
+    actualizaciones = [q["sql"] for q in consultas.captured_queries if q["sql"].startswith('UPDATE "partosApp_registroparto"')]
+    assert len(actualizaciones) == 1
+    columnas = actualizaciones[0].split(" WHERE ")[0]
+    assert '"observaciones"' in columnas and '"tipo_parto"' not in columnas
+    parto.refresh_from_db()
+    assert parto.observaciones == "Sin incidentes"
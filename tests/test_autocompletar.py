@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from utilidad.autocompletar import Autocompletado, CacheLRU, _FALTA
+
+
+def _get(client, url, **parametros):
+    with CaptureQueriesContext(connection) as consultas:
+        respuesta = client.get(url, parametros)
+    assert respuesta.status_code == 200
+    return respuesta.json(), len(consultas.captured_queries)
+
+
+@pytest.mark.django_db
+def test_buscar_paciente_cachea_por_rut_normalizado(client, paciente):
+    url = reverse("tens:api_buscar_paciente")
+    datos, consultas = _get(client, url, rut="16293109-1")
+    assert datos["encontrado"] and datos["paciente"]["nombre_completo"] == "Ana Silva Rivas"
+    assert consultas == 1
+
+    # Otro formato del mismo RUT: mismo resultado, sin consultar la BD
+    assert _get(client, url, rut="16.293.109-1") == (datos, 0)
+
+
+@pytest.mark.django_db
+def test_guardar_persona_invalida_el_cache(client, paciente):
+    url = reverse("gestion:buscar_persona_api")
+    datos, _ = _get(client, url, rut="16293109-1")
+    assert datos["persona"]["nombre_completo"] == "Ana Silva Rivas"
+
+    persona = paciente.persona
+    persona.Nombre = "Antonia"
+    persona.save()
+    datos, consultas = _get(client, url, rut="16293109-1")
+    assert datos["persona"]["nombre_completo"] == "Antonia Silva Rivas"
+    assert consultas == 1
+
+
+@pytest.mark.django_db
+def test_buscar_ficha(client, ficha):
+    datos, _ = _get(client, reverse("partos:api_buscar_ficha"), q="  Ana ")
+    assert [f["id"] for f in datos["fichas"]] == [ficha.pk]
+    assert _get(client, reverse("partos:api_buscar_ficha"), q="An") == ({"fichas": []}, 0)
+
+
+def test_consultas_identicas_en_curso_se_comparten():
+    llamadas = []
+
+    async def consulta(clave):
+        llamadas.append(clave)
+        await asyncio.sleep(0.01)
+        return {"clave": clave}
+
+    autocompletado = Autocompletado("prueba", consulta)
+
+    async def simultaneas():
+        return await asyncio.gather(*(autocompletado.resolver(c) for c in ["a", "a", "b", "a"]))
+
+    assert asyncio.run(simultaneas()) == [b'{"clave":"a"}', b'{"clave":"a"}', b'{"clave":"b"}', b'{"clave":"a"}']
+    assert llamadas == ["a", "b"]
+    # Ya en caché: no se vuelve a consultar
+    asyncio.run(autocompletado.resolver("a"))
+    assert llamadas == ["a", "b"]
+
+
+def test_cache_lru_descarta_el_menos_usado_y_los_vencidos():
+    cache = CacheLRU(maximo=2)
+    cache.guardar("a", 1, ttl=60)
+    cache.guardar("b", 2, ttl=60)
+    assert cache.obtener("a") == 1
+    cache.guardar("c", 3, ttl=60)
+    assert cache.obtener("b") is _FALTA
+    assert (cache.obtener("a"), cache.obtener("c")) == (1, 3)
+
+    cache.guardar("d", 4, ttl=0)
+    assert cache.obtener("d") is _FALTA
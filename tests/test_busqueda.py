@@ -0,0 +1,91 @@
+import pytest
+from datetime import date
+from django.urls import reverse
+from gestionApp.models import Persona, Paciente, PersonaToken
+from gestionApp.busqueda import (
+    normalizar_texto, compactar_rut, es_consulta_rut, buscar_pacientes, buscar_personas,
+    construir_tokens, LIMITE_RESULTADOS, FACTOR_VENTANA,
+)
+from utilidad.rut_validator import calcular_dv
+
+
+def _crear_paciente(rut, nombre, ap_paterno, ap_materno):
+    persona = Persona.objects.create(
+        Rut=rut,
+        Nombre=nombre,
+        Apellido_Paterno=ap_paterno,
+        Apellido_Materno=ap_materno,
+        Sexo="Femenino",
+        Fecha_nacimiento=date(1990, 1, 1),
+    )
+    return Paciente.objects.create(persona=persona, Estado_civil="SOLTERA", Previcion="FONASA_A")
+
+
+def test_normalizacion():
+    assert normalizar_texto("Muñoz-Díaz") == "munoz diaz"
+    assert compactar_rut("16.293.109-1") == "162931091"
+    assert es_consulta_rut("16.293")
+    assert es_consulta_rut("16293109-k")
+    assert not es_consulta_rut("Ana")
+
+
+@pytest.mark.django_db
+def test_tokens_se_sincronizan_al_guardar():
+    paciente = _crear_paciente("16293109-1", "Ana María", "Muñoz", "Díaz")
+    persona = paciente.persona
+    assert persona.Rut_busqueda == "162931091"
+    assert set(persona.tokens_busqueda.values_list("token", flat=True)) == {"ana", "maria", "munoz", "diaz"}
+
+    persona.Apellido_Paterno = "Rojas"
+    persona.save()
+    assert set(PersonaToken.objects.filter(persona=persona).values_list("token", flat=True)) == {"ana", "maria", "rojas", "diaz"}
+
+
+@pytest.mark.django_db
+def test_busqueda_por_rut_y_nombre_con_ranking():
+    ana = _crear_paciente("16293109-1", "Ana", "Muñoz", "Díaz")
+    anabel = _crear_paciente("12345678-5", "Anabel", "Muñoz", "Soto")
+    _crear_paciente("18901234-9", "Carolina", "Rojas", "Pino")
+
+    assert list(buscar_pacientes("16.293")) == [ana]
+    assert list(buscar_pacientes("munoz")) == [ana, anabel]
+    # 'ana' coincide exacto con Ana y como prefijo con Anabel: Ana primero
+    assert list(buscar_pacientes("ana MUÑOZ")) == [ana, anabel]
+    assert list(buscar_pacientes("ana", limite=1)) == [ana]
+    assert list(buscar_pacientes("xyz")) == []
+    assert list(buscar_personas("carol"))[0].Nombre == "Carolina"
+
+
+@pytest.mark.django_db
+def test_candidatos_descartados_por_el_llamador_no_ocultan_coincidencias():
+    # Más personas 'Maria' (no pacientes) que la ventana de candidatos, antes que la paciente
+    personas = Persona.objects.bulk_create([
+        Persona(
+            Rut=f"{11_000_000 + i}-{calcular_dv(str(11_000_000 + i))}", Nombre="Maria", Apellido_Paterno="Rojas",
+            Apellido_Materno="Mariano", Sexo="Femenino", Fecha_nacimiento=date(1990, 1, 1),
+        )
+        for i in range(LIMITE_RESULTADOS * FACTOR_VENTANA + 20)
+    ])
+    PersonaToken.objects.bulk_create(construir_tokens(personas))
+    paciente = _crear_paciente("16293109-1", "Maria", "Soto", "Lagos")
+
+    assert buscar_pacientes("maria") == [paciente]
+    assert buscar_pacientes("maria soto") == [paciente]
+    assert len(buscar_personas("mari")) == LIMITE_RESULTADOS
+
+
+@pytest.mark.django_db
+def test_vista_buscar_paciente_usa_motor(client):
+    _crear_paciente("16293109-1", "Ana", "Muñoz", "Díaz")
+    r = client.get(reverse("matrona:seleccionar_paciente_ficha"), {"q": "munoz"})
+    assert r.status_code == 200
+    assert [p.persona.Rut for p in r.context["pacientes"]] == ["16293109-1"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("vista", ["matrona:api_buscar_paciente", "tens:api_buscar_paciente"])
+def test_api_buscar_paciente_por_rut(client, paciente, vista):
+    r = client.get(reverse(vista), {"rut": paciente.persona.Rut})
+    assert r.status_code == 200
+    datos = r.json()
+    assert datos["encontrado"] and datos["paciente"]["edad"] == paciente.edad
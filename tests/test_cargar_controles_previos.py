@@ -0,0 +1,56 @@
+import json
+import pytest
+from django.core.management import call_command
+from legacyApp.models import ControlesPrevios
+
+
+def _control(rut, i):
+    return {
+        "paciente_rut": rut, "fecha_control": f"2024-01-{i % 28 + 1:02d}", "semanas_gestacion": 20 + i % 20,
+        "presion_sistolica": 110, "presion_diastolica": 70, "peso_kg": "67.40", "proteinuria": "negativo",
+    }
+
+
+@pytest.mark.django_db(databases=["default", "legacy"])
+def test_carga_jsonl_valida_ruts_y_reanuda(tabla_controles_previos, tmp_path):
+    archivo = tmp_path / "controles.jsonl"
+    lineas = [json.dumps(_control("16.293.109-1", i)) for i in range(250)]
+    lineas[10] = json.dumps(_control("16293109-2", 10))   # DV incorrecto
+    lineas[20] = "{no es json"
+    archivo.write_text("\n".join(lineas), encoding="utf-8")
+
+    checkpoint = tmp_path / "controles.jsonl.checkpoint.json"
+    call_command("cargar_controles_previos", str(archivo), lote=100)
+    assert not checkpoint.exists()
+    assert ControlesPrevios.objects.using("legacy").count() == 248
+    assert ControlesPrevios.objects.using("legacy").filter(paciente_rut="16293109-1").count() == 248
+
+    # Simula una carga interrumpida tras confirmar los primeros 100 registros
+    ControlesPrevios.objects.using("legacy").all().delete()
+    checkpoint.write_text(json.dumps({
+        "origen": str(archivo), "procesados": 100, "insertados": 98, "rechazados": 2,
+    }))
+    call_command("cargar_controles_previos", str(archivo), lote=100)
+    assert ControlesPrevios.objects.using("legacy").count() == 150
+
+    errores = (tmp_path / "controles.jsonl.errores.csv").read_text(encoding="utf-8").splitlines()
+    assert errores[0] == "registro,motivo"
+
+
+@pytest.mark.django_db(databases=["default", "legacy"])
+def test_carga_csv_rechaza_valores_invalidos(tabla_controles_previos, tmp_path):
+    archivo = tmp_path / "controles.csv"
+    archivo.write_text(
+        "paciente_rut,fecha_control,semanas_gestacion,peso_kg,observaciones\n"
+        "16293109-1,2024-02-01,24,67.4,ok\n"
+        "16293109-1,2024-02-31,24,67.4,fecha inválida\n"
+        "16293109-1,2024-03-01,veinte,67.4,semanas inválidas\n"
+        "16293109-1,2024-03-01,,,sin mediciones\n",
+        encoding="utf-8",
+    )
+    call_command("cargar_controles_previos", str(archivo))
+
+    controles = ControlesPrevios.objects.using("legacy").order_by("fecha_control")
+    assert [c.observaciones for c in controles] == ["ok", "sin mediciones"]
+    errores = (tmp_path / "controles.csv.errores.csv").read_text(encoding="utf-8").splitlines()
+    assert [linea.split(",")[0] for linea in errores[1:]] == ["2", "3"]
@@ -0,0 +1,71 @@
+import pytest
+from datetime import date, timedelta
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from gestionApp.models import Persona, Paciente
+from matronaApp.models import FichaObstetrica, MedicamentoFicha, AdministracionMedicamento
+from tensApp.censo import censo_sala
+from tensApp.models import RegistroTens
+
+
+@pytest.fixture(autouse=True)
+def _cache_limpio():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _ficha_completa(matrona, tens, rut, critica="NINGUNA"):
+    persona = Persona.objects.create(
+        Rut=rut, Nombre="Paciente", Apellido_Paterno=rut[:4], Apellido_Materno="X",
+        Sexo="Femenino", Fecha_nacimiento=date(1991, 1, 1),
+    )
+    paciente = Paciente.objects.create(persona=persona, Estado_civil="SOLTERA", Previcion="FONASA_A")
+    ficha = FichaObstetrica.objects.create(paciente=paciente, matrona_responsable=matrona, patologias_criticas=critica)
+    hoy = timezone.localdate()
+    for dia, fc in ((hoy - timedelta(days=1), 80), (hoy, 125)):
+        RegistroTens.objects.create(ficha=ficha, fecha=dia, turno="manana", frecuencia_cardiaca=fc,
+                                    presion_arterial="120/80", temperatura="37.4")
+    medicamento = MedicamentoFicha.objects.create(
+        ficha=ficha, nombre_medicamento="Nifedipino", dosis="10 mg", via_administracion="oral",
+        frecuencia="Cada_8_horas", fecha_inicio=hoy - timedelta(days=1), fecha_termino=hoy + timedelta(days=1),
+    )
+    MedicamentoFicha.objects.create(
+        ficha=ficha, nombre_medicamento="Paracetamol", dosis="1 g", via_administracion="oral",
+        frecuencia="SOS", fecha_inicio=hoy, fecha_termino=hoy, activo=False,
+    )
+    AdministracionMedicamento.objects.create(medicamento_ficha=medicamento, tens=tens)
+    return ficha
+
+
+@pytest.mark.django_db
+def test_censo_con_consultas_constantes(matrona, tens, django_assert_num_queries):
+    primera = _ficha_completa(matrona, tens, "11222333-9", critica="PREECLAMPSIA_SEVERA")
+    censo_sala()  # calienta la cola de dosis del turno
+
+    with django_assert_num_queries(1):
+        censo = censo_sala()
+    assert len(censo) == 1
+    fila = censo[0]
+    assert fila["ficha_id"] == primera.pk and fila["critica"]
+    assert fila["ultimo_registro"]["frecuencia_cardiaca"] == 125
+    assert fila["ultimo_registro"]["temperatura"] == 37.4
+    assert fila["medicamentos_activos"] == 1
+    assert fila["ultima_administracion"]["medicamento"] == "Nifedipino"
+    assert fila["ultima_administracion"]["tens"] == "Luis Muñoz"
+    assert fila["meows"] == 2
+
+    for rut in ("5126663-3", "7654321-6"):
+        _ficha_completa(matrona, tens, rut)
+    censo_sala()
+    with django_assert_num_queries(1):
+        assert len(censo_sala()) == 3
+
+
+@pytest.mark.django_db
+def test_api_censo(client, ficha):
+    datos = client.get(reverse("tens:censo_sala")).json()
+    assert datos["total_fichas"] == 1
+    assert datos["fichas"][0]["ultimo_registro"] is None
+    assert datos["fichas"][0]["medicamentos_activos"] == 0
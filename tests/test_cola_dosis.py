@@ -0,0 +1,103 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from datetime import date, datetime, timedelta
+from django.core.cache import cache
+from django.core.cache.backends import locmem
+from django.urls import reverse
+from django.utils import timezone
+from matronaApp.models import MedicamentoFicha, AdministracionMedicamento
+from tensApp.dosis import cola_dosis, conciliar, expandir_horario, inicio_turno
+
+
+def _local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+@pytest.fixture(autouse=True)
+def _cache_limpio():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _prescripcion(ficha, frecuencia, inicio, termino):
+    return MedicamentoFicha.objects.create(
+        ficha=ficha, nombre_medicamento="Cefazolina", dosis="1 g", via_administracion="endovenosa",
+        frecuencia=frecuencia, fecha_inicio=inicio, fecha_termino=termino,
+    )
+
+
+def test_expansion_respeta_vigencia():
+    horario = expandir_horario("3_veces_dia", date(2026, 10, 5), date(2026, 10, 5),
+                               _local(2026, 10, 4), _local(2026, 10, 7))
+    assert [m.hour for m in horario] == [8, 14, 20]
+    assert expandir_horario("SOS", date(2026, 10, 5), date(2026, 10, 6), _local(2026, 10, 4), _local(2026, 10, 7)) == []
+
+
+def test_conciliacion_por_ventana():
+    programadas = [_local(2026, 10, 5, 6), _local(2026, 10, 5, 14), _local(2026, 10, 5, 22)]
+    administraciones = [
+        (_local(2026, 10, 5, 5, 30), True),    # adelantada: cubre las 06:00
+        (_local(2026, 10, 5, 16, 0), False),   # atrasada y no administrada: 14:00
+    ]
+    estados = [estado for _, estado in conciliar(programadas, administraciones)]
+    assert estados == ["administrada", "no_administrada", None]
+
+
+def test_turnos():
+    assert inicio_turno(_local(2026, 10, 5, 10)) == _local(2026, 10, 5, 8)
+    assert inicio_turno(_local(2026, 10, 5, 3)) == _local(2026, 10, 4, 20)
+
+
+@pytest.mark.django_db
+def test_cola_en_bloque_y_cacheada(ficha, tens, django_assert_num_queries):
+    medicamento = _prescripcion(ficha, "Cada_8_horas", date(2026, 10, 4), date(2026, 10, 10))
+    AdministracionMedicamento.objects.create(
+        medicamento_ficha=medicamento, tens=tens, fecha_hora_administracion=_local(2026, 10, 5, 5, 30),
+    )
+    ahora = _local(2026, 10, 5, 10)
+
+    with django_assert_num_queries(2):
+        cola = cola_dosis(5, ahora=ahora)
+    assert [(d["programada"], d["estado"]) for d in cola] == [
+        (_local(2026, 10, 4, 22), "vencida"),
+        (_local(2026, 10, 5, 14), "pendiente"),
+    ]
+    with django_assert_num_queries(0):
+        cola_dosis(5, ahora=ahora)
+
+
+@pytest.mark.django_db
+def test_administrar_invalida_la_cola(client, ficha, tens):
+    hoy = timezone.localdate()
+    medicamento = _prescripcion(ficha, "Cada_8_horas", hoy - timedelta(days=1), hoy + timedelta(days=1))
+    vencidas = [d for d in cola_dosis(12) if d["estado"] == "vencida"]
+    assert vencidas
+
+    for dosis in vencidas:
+        AdministracionMedicamento.objects.create(
+            medicamento_ficha=medicamento, tens=tens, fecha_hora_administracion=dosis["programada"],
+        )
+    datos = client.get(reverse("tens:api_cola_dosis"), {"horas": 12}).json()
+    assert all(d["estado"] == "pendiente" for d in datos["dosis"])
+    assert client.get(reverse("tens:cola_dosis")).status_code == 200
+
+
+@pytest.mark.django_db
+def test_administracion_de_otro_proceso_aparece_al_vencer_el_ttl(ficha, tens, settings, monkeypatch):
+    settings.TENS_COLA_DOSIS_TTL = 30
+    hoy = timezone.localdate()
+    medicamento = _prescripcion(ficha, "Cada_8_horas", hoy - timedelta(days=1), hoy + timedelta(days=1))
+    vencidas = [d for d in cola_dosis(12) if d["estado"] == "vencida"]
+    assert vencidas
+
+    # bulk_create no emite post_save: como si otro worker registrara la administración
+    AdministracionMedicamento.objects.bulk_create([
+        AdministracionMedicamento(medicamento_ficha=medicamento, tens=tens, fecha_hora_administracion=d["programada"])
+        for d in vencidas
+    ])
+    inicio = time.time()
+    monkeypatch.setattr(locmem, "time", SimpleNamespace(time=lambda: inicio + settings.TENS_COLA_DOSIS_TTL + 1))
+    assert all(d["estado"] == "pendiente" for d in cola_dosis(12))
@@ -0,0 +1,166 @@
+"""
+Regresión de consultas N+1 en listados y detalles
+Se siembra una sala con más filas que cualquier presupuesto y se visita cada
+vista: en modo estricto (conftest) MedicionMiddleware falla el request si la
+vista supera su PRESUPUESTO_CONSULTAS, p. ej. cuando un template empieza a
+cargar FKs de forma perezosa (__str__ que recorren ficha.paciente.persona).
+"""
+import pytest
+from datetime import date, timedelta
+from django.conf import settings
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from gestionApp.models import Persona, Paciente
+from matronaApp.models import FichaObstetrica, MedicamentoFicha, AdministracionMedicamento
+from medicoApp.models import Patologias
+from obstetric_care.instrumentacion import PresupuestoExcedido
+from partosApp.models import RegistroParto, RegistroRecienNacido, DocumentosParto
+from tensApp.models import RegistroTens, Tratamiento_aplicado
+from tensApp import views as tens_views
+from utilidad.rut_validator import calcular_dv
+
+FILAS = 25
+
+# Los templates de partosApp no están en el repositorio: se usan versiones mínimas
+# que recorren el mismo contexto y llaman a los mismos __str__
+PLANTILLAS_PARTOS = {
+    "Partos/Data/listar_partos.html": (
+        "{% for parto in partos %}{{ parto }} {{ parto.ficha.numero_ficha }} "
+        "{{ parto.ficha.paciente.persona.Rut }} {{ parto.get_tipo_parto_display }}{% endfor %}"
+        "{% include 'Shared/paginacion_keyset.html' %}"
+    ),
+    "Partos/Data/detalle_parto.html": (
+        "{{ parto }} {{ ficha.matrona_responsable.persona.Nombre }} {{ paciente.persona.Rut }} "
+        "{{ documentos }} {% for rn in recien_nacidos %}{{ rn }}{% endfor %}"
+    ),
+    "Partos/Data/detalle_rn.html": "{{ rn }} {{ parto }} {{ paciente.persona.Nombre }}",
+}
+
+
+@pytest.fixture
+def plantillas_partos(settings):
+    motor = {**settings.TEMPLATES[0], "APP_DIRS": False}
+    motor["OPTIONS"] = {**motor["OPTIONS"], "loaders": [
+        ("django.template.loaders.locmem.Loader", PLANTILLAS_PARTOS),
+        "django.template.loaders.filesystem.Loader",
+        "django.template.loaders.app_directories.Loader",
+    ]}
+    settings.TEMPLATES = [motor]
+
+
+def _persona(i):
+    cuerpo = str(20000000 + i)
+    return Persona.objects.create(
+        Rut=f"{cuerpo}-{calcular_dv(cuerpo)}", Nombre=f"Paciente{i}", Apellido_Paterno="Sala",
+        Apellido_Materno="Prueba", Sexo="Femenino", Fecha_nacimiento=date(1990, 1, 1),
+    )
+
+
+def _hijos(ficha, tens, i):
+    """Una fila de cada relación que muestran los listados"""
+    hoy = timezone.localdate()
+    ahora = timezone.now()
+    ficha.patologias.add(Patologias.objects.create(nombre=f"Patología {i}", codigo_cie_10="O14", nivel_de_riesgo="Alto"))
+    medicamento = MedicamentoFicha.objects.create(
+        ficha=ficha, nombre_medicamento=f"Medicamento {i}", dosis="10 mg", via_administracion="oral",
+        frecuencia="Cada_8_horas", fecha_inicio=hoy, fecha_termino=hoy,
+    )
+    AdministracionMedicamento.objects.create(medicamento_ficha=medicamento, tens=tens)
+    RegistroTens.objects.create(ficha=ficha, tens_responsable=tens, fecha=hoy - timedelta(days=i),
+                                turno="manana", frecuencia_cardiaca=80)
+    Tratamiento_aplicado.objects.create(
+        tens=tens, paciente=ficha.paciente, ficha=ficha, medicamento_ficha=medicamento,
+        nombre_medicamento=f"Medicamento {i}", via_administracion="VO",
+    )
+    parto = RegistroParto.objects.create(
+        ficha=ficha, tipo_parto="EUTOCICO", fecha_hora_admision=ahora - timedelta(hours=i),
+        edad_gestacional_semanas=39, tipo_regimen="CERO", clasificacion_robson="GRUPO_1",
+    )
+    RegistroRecienNacido.objects.create(
+        registro_parto=parto, sexo="FEMENINO", peso=3000 + i, talla=50,
+        apgar_1_minuto=8, apgar_5_minutos=9, fecha_nacimiento=ahora,
+    )
+    return parto
+
+
+@pytest.fixture
+def sala(matrona, tens):
+    """FILAS pacientes con su ficha, y una ficha principal con FILAS filas de cada relación"""
+    fichas = []
+    for i in range(FILAS):
+        paciente = Paciente.objects.create(persona=_persona(i), Estado_civil="SOLTERA", Previcion="FONASA_A")
+        ficha = FichaObstetrica.objects.create(paciente=paciente, matrona_responsable=matrona)
+        _hijos(ficha, tens, i)
+        fichas.append(ficha)
+
+    principal = fichas[0]
+    for i in range(FILAS):
+        _hijos(principal, tens, FILAS + i)
+        FichaObstetrica.objects.create(paciente=principal.paciente, matrona_responsable=matrona, activa=False)
+
+    parto = RegistroParto.objects.filter(ficha=principal).first()
+    for i in range(FILAS):
+        RegistroRecienNacido.objects.create(
+            registro_parto=parto, sexo="MASCULINO", peso=2500 + i, talla=48,
+            apgar_1_minuto=8, apgar_5_minutos=9, fecha_nacimiento=timezone.now(),
+        )
+    DocumentosParto.objects.create(registro_parto=parto, folio_valido="F-1")
+    return {"ficha": principal, "paciente": principal.paciente, "parto": parto,
+            "rn": parto.recien_nacidos.first(), "patologia": principal.patologias.first()}
+
+
+VISTAS = [
+    ("matrona:todas_fichas", None),
+    ("matrona:lista_pacientes", None),
+    ("matrona:detalle_paciente", "paciente"),
+    ("matrona:lista_fichas_paciente", "paciente"),
+    ("matrona:detalle_ficha", "ficha"),
+    ("medico:listar_patologias", None),
+    ("medico:detalle_patologia", "patologia"),
+    ("medico:historial_clinico", "paciente"),
+    ("gestion:lista_personas", None),
+    ("gestion:detalle_persona", "paciente"),
+    ("gestion:gestionar_roles", "paciente"),
+    ("tens:listar_tratamientos", None),
+    ("tens:listar_tratamientos_activos", None),
+    ("tens:listar_tratamientos_inactivos", None),
+    ("tens:listar_tratamientos_ficha", "ficha"),
+    ("tens:ver_fichas_paciente", "paciente"),
+    ("tens:detalle_ficha", "ficha"),
+    ("tens:alertas_meows", None),
+    ("tens:censo_sala", None),
+    ("partos:listar_partos", None),
+    ("partos:detalle_parto", "parto"),
+    ("partos:detalle_rn", "rn"),
+]
+
+
+@pytest.mark.django_db(databases=["default", "legacy"])
+def test_consultas_acotadas(client, sala, plantillas_partos):
+    """Una sola siembra para todas las vistas; se informan todas las que fallen"""
+    fallas = []
+    for vista, objeto in VISTAS:
+        presupuesto = settings.PRESUPUESTO_CONSULTAS.get(vista)
+        if presupuesto is None or presupuesto >= FILAS:
+            fallas.append(f"{vista}: sin PRESUPUESTO_CONSULTAS menor que {FILAS}")
+            continue
+        args = [sala[objeto].pk] if objeto else []
+        try:
+            respuesta = client.get(reverse(vista, args=args))
+        except PresupuestoExcedido as error:
+            fallas.append(str(error))
+            continue
+        if respuesta.status_code != 200:
+            fallas.append(f"{vista}: HTTP {respuesta.status_code}")
+    assert not fallas, "\n".join(fallas)
+
+
+@pytest.mark.django_db
+def test_historial_administraciones(sala, django_assert_max_num_queries):
+    """Sin URL publicada (tensApp/urls.py): se llama a la vista directamente"""
+    request = RequestFactory().get("/")
+    with django_assert_max_num_queries(3):
+        respuesta = tens_views.historial_administraciones(request, sala["ficha"].pk)
+    assert respuesta.status_code == 200
+    assert respuesta.content.count(b"Medicamento ") >= FILAS
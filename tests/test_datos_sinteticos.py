@@ -0,0 +1,85 @@
+"""
+Generador de datos sintéticos (gestionApp.sinteticos / generar_datos_sinteticos)
+"""
+import pytest
+from datetime import date
+from django.core.management import call_command
+from django.db import transaction
+from gestionApp.models import Persona, PersonaToken, Paciente
+from gestionApp.sinteticos import GeneradorSintetico
+from matronaApp.models import FichaObstetrica
+from partosApp.models import RegistroParto
+from tensApp.models import EstadoMeowsFicha
+from utilidad.rut_validator import calcular_dv
+
+REFERENCIA = date(2025, 6, 30)
+
+
+def _generar(semilla):
+    generador = GeneradorSintetico(semilla=semilla, dias=60, proporcion_activas=0.2,
+                                   tamano_lote=15, fecha_referencia=REFERENCIA)
+    generador.preparar_catalogo()
+    generador.generar_personal(matronas=2, tens=2, medicos=1)
+    generador.generar_pacientes(40)
+    generador.finalizar()
+    return generador
+
+
+def _instantanea():
+    return (
+        list(Persona.objects.order_by("id").values_list("Rut", "Nombre", "Fecha_nacimiento")),
+        list(FichaObstetrica.objects.order_by("id").values_list("numero_ficha", "activa", "patologias_criticas")),
+        list(RegistroParto.objects.order_by("id").values_list("numero_registro", "tipo_parto")),
+    )
+
+
+@pytest.mark.django_db
+def test_datos_consistentes():
+    generador = _generar(semilla=3)
+
+    assert Paciente.objects.count() == 40
+    assert sum(generador.filas.values()) > 40
+    assert generador.filas["matronaApp.FichaObstetrica"] == FichaObstetrica.objects.count()
+
+    ruts = list(Persona.objects.values_list("Rut", "Rut_busqueda"))
+    assert all(calcular_dv(rut.split("-")[0].replace(".", "")) == rut[-1] for rut, _ in ruts)
+    assert len({compacto for _, compacto in ruts}) == len(ruts)
+    assert PersonaToken.objects.values("persona").distinct().count() == len(ruts)
+
+    numeros = list(FichaObstetrica.objects.values_list("numero_ficha", flat=True))
+    assert len(set(numeros)) == len(numeros) and all(n.startswith("FO-") for n in numeros)
+    partos = list(RegistroParto.objects.values_list("numero_registro", flat=True))
+    assert len(set(partos)) == len(partos) and all(n.startswith("PARTO-") for n in partos)
+
+    # Los números siguientes salen de la Secuencia, sin chocar con los generados
+    ficha = FichaObstetrica.objects.filter(activa=True).first()
+    nueva = FichaObstetrica.objects.create(paciente=ficha.paciente, matrona_responsable=ficha.matrona_responsable)
+    assert nueva.numero_ficha not in numeros
+
+    assert EstadoMeowsFicha.objects.count() == FichaObstetrica.objects.filter(registros_tens__isnull=False).distinct().count()
+
+
+class _Revertir(Exception):
+    pass
+
+
+@pytest.mark.django_db
+def test_misma_semilla_mismos_datos():
+    instantaneas = []
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                _generar(semilla=11)
+                instantaneas.append(_instantanea())
+                raise _Revertir
+        except _Revertir:
+            pass
+    assert instantaneas[0] == instantaneas[1]
+    assert instantaneas[0][0]
+
+
+@pytest.mark.django_db
+def test_comando(capsys):
+    call_command("generar_datos_sinteticos", pacientes=10, semilla=1, dias=30, fecha_referencia=REFERENCIA)
+    assert Paciente.objects.count() == 10
+    assert "COMPLETADO" in capsys.readouterr().out
@@ -0,0 +1,111 @@
+import csv
+import gzip
+import io
+import zipfile
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from partosApp.exportacion import columnas_exportacion, exportar_partos, filas_exportacion, partos_para_exportar
+from partosApp.models import RegistroParto, RegistroRecienNacido, DocumentosParto
+
+
+def _parto(ficha, tipo_parto, admision):
+    return RegistroParto.objects.create(
+        ficha=ficha, tipo_parto=tipo_parto, fecha_hora_admision=admision,
+        edad_gestacional_semanas=39, tipo_regimen="CERO", clasificacion_robson="GRUPO_1",
+    )
+
+
+def _rn(parto, peso):
+    return RegistroRecienNacido.objects.create(
+        registro_parto=parto, sexo="FEMENINO", peso=peso, talla=50,
+        apgar_1_minuto=8, apgar_5_minutos=9, fecha_nacimiento=parto.fecha_hora_admision,
+    )
+
+
+@pytest.fixture
+def partos(ficha):
+    hoy = timezone.localtime().replace(hour=10, minute=0, second=0, microsecond=0)
+    gemelar = _parto(ficha, "CESAREA_URGENCIA", hoy)
+    _rn(gemelar, 2400)
+    _rn(gemelar, 2600)
+    DocumentosParto.objects.create(registro_parto=gemelar, folio_valido="F-100")
+    sin_rn = _parto(ficha, "EUTOCICO", hoy - timedelta(days=3))
+    return gemelar, sin_rn
+
+
+def _leer_csv(datos):
+    return list(csv.DictReader(io.StringIO(datos.decode("utf-8-sig"))))
+
+
+@pytest.mark.django_db
+def test_csv_una_fila_por_rn_en_una_consulta(partos, django_assert_num_queries):
+    gemelar, sin_rn = partos
+    bloques, tipo, extension = exportar_partos()
+    with django_assert_num_queries(1):
+        filas = _leer_csv(b"".join(bloques))
+
+    assert (tipo, extension) == ("text/csv; charset=utf-8", "csv")
+    assert [f["numero_registro"] for f in filas] == [sin_rn.numero_registro] + [gemelar.numero_registro] * 2
+    assert filas[0]["rn_peso"] == "" and filas[0]["doc_folio_valido"] == ""
+    assert [f["rn_peso"] for f in filas[1:]] == ["2400", "2600"]
+    assert filas[1]["doc_folio_valido"] == "F-100"
+    assert filas[1]["rut_paciente"] == "16293109-1"
+
+
+@pytest.mark.django_db
+def test_filtros_y_gzip(partos):
+    gemelar, _ = partos
+    hoy = timezone.localdate()
+    bloques, tipo, extension = exportar_partos(comprimir=True, desde=hoy, hasta=hoy)
+    filas = _leer_csv(gzip.decompress(b"".join(bloques)))
+    assert extension == "csv.gz"
+    assert {f["numero_registro"] for f in filas} == {gemelar.numero_registro}
+
+    bloques, _, _ = exportar_partos(tipo_parto="EUTOCICO")
+    assert len(_leer_csv(b"".join(bloques))) == 1
+
+
+@pytest.mark.django_db
+def test_xlsx_valido(partos):
+    bloques, _, extension = exportar_partos(formato="xlsx")
+    libro = zipfile.ZipFile(io.BytesIO(b"".join(bloques)))
+    assert extension == "xlsx"
+    assert libro.testzip() is None
+    hoja = libro.read("xl/worksheets/sheet1.xml").decode()
+    assert hoja.count("<row>") == 4
+    assert "<v>2400</v>" in hoja
+
+
+@pytest.mark.django_db
+def test_vista_en_streaming(client, partos):
+    respuesta = client.get(reverse("partos:exportar_partos"), {"formato": "csv", "gzip": "1"})
+    assert respuesta.status_code == 200
+    assert respuesta.streaming
+    assert respuesta["Content-Disposition"].endswith('.csv.gz"')
+    assert len(_leer_csv(gzip.decompress(b"".join(respuesta.streaming_content)))) == 3
+
+    respuesta = client.get(reverse("partos:exportar_partos"), {"desde": "ayer"})
+    assert respuesta.status_code == 302
+
+
+@pytest.mark.django_db
+def test_comando(partos, tmp_path):
+    salida = tmp_path / "partos.csv"
+    call_command("exportar_partos", "--salida", str(salida), "--tipo-parto", "CESAREA_URGENCIA", stdout=io.StringIO())
+    assert len(_leer_csv(salida.read_bytes())) == 2
+
+
+@pytest.mark.django_db
+def test_tramos_keyset_no_repiten_ni_pierden_filas(partos, ficha):
+    gemelar, sin_rn = partos
+    misma_hora = _parto(ficha, "EUTOCICO", gemelar.fecha_hora_admision)
+    _rn(misma_hora, 3100)
+    columnas = columnas_exportacion()
+    todas = list(filas_exportacion(partos_para_exportar(), columnas, tamano_lote=10_000))
+    assert len(todas) == 4
+
+    for lote in (1, 2, 3):
+        assert list(filas_exportacion(partos_para_exportar(), columnas, tamano_lote=lote)) == todas
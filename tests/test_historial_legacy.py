@@ -0,0 +1,73 @@
+import time
+import pytest
+from datetime import date
+from django.core.cache import cache
+from django.db import OperationalError, connections
+from django.urls import reverse
+from legacyApp.circuito import Circuito, CircuitoAbierto, circuito_legacy
+from legacyApp.models import ControlesPrevios
+
+
+@pytest.fixture(autouse=True)
+def _estado_limpio():
+    cache.clear()
+    circuito_legacy.reiniciar()
+    yield
+    cache.clear()
+    circuito_legacy.reiniciar()
+
+
+@pytest.mark.django_db(databases=["default", "legacy"])
+def test_panel_legacy_cacheado_y_detalle_bajo_demanda(client, paciente, tabla_controles_previos, django_assert_num_queries):
+    legacy = ControlesPrevios.objects.using("legacy")
+    antiguo = legacy.create(paciente_rut="16293109-1", fecha_control=date(2021, 9, 10), observaciones="Primer control")
+    reciente = legacy.create(paciente_rut="16293109-1", fecha_control=date(2025, 5, 14), observaciones="Glucosa normal")
+    legacy.create(paciente_rut="11111111-1", fecha_control=date(2025, 1, 1))
+    url = reverse("matrona:detalle_paciente", args=[paciente.pk])
+
+    # Primera visita: listado + control más reciente
+    with django_assert_num_queries(2, connection=connections["legacy"]):
+        respuesta = client.get(url)
+    assert [c["id"] for c in respuesta.context["legacy_controles"]] == [reciente.id, antiguo.id]
+    assert respuesta.context["legacy_selected"].observaciones == "Glucosa normal"
+
+    # Cambiar de control solo lee ese control; volver a uno visto no consulta legacy
+    with django_assert_num_queries(1, connection=connections["legacy"]):
+        respuesta = client.get(url, {"ctrl": antiguo.id})
+    assert respuesta.context["legacy_selected"].observaciones == "Primer control"
+    with django_assert_num_queries(0, connection=connections["legacy"]):
+        client.get(url, {"ctrl": reciente.id})
+
+
+@pytest.mark.django_db(databases=["default", "legacy"])
+def test_circuito_abierto_no_bloquea_el_detalle(client, paciente, tabla_controles_previos, settings):
+    settings.LEGACY_CIRCUITO_FALLOS = 1
+    settings.LEGACY_CIRCUITO_ESPERA = 60
+    with pytest.raises(OperationalError), circuito_legacy.proteger():
+        raise OperationalError("timeout")
+
+    respuesta = client.get(reverse("matrona:detalle_paciente", args=[paciente.pk]))
+    assert respuesta.status_code == 200
+    assert respuesta.context["legacy_error"] is True
+
+
+def test_circuito_semiabierto_reintenta_una_vez():
+    circuito = Circuito("prueba", fallos_maximos=2, espera=0.05)
+    for _ in range(2):
+        with pytest.raises(OperationalError), circuito.proteger():
+            raise OperationalError("caído")
+    assert circuito.estado == "abierto"
+    assert circuito.permitir() is False
+
+    # Pasada la espera se deja pasar una sola consulta de prueba a la vez
+    time.sleep(0.06)
+    assert circuito.permitir() is True
+    assert circuito.permitir() is False
+    circuito.registrar_exito()
+    assert circuito.estado == "cerrado"
+
+    circuito = Circuito("prueba", fallos_maximos=1, espera=60)
+    with pytest.raises(OperationalError), circuito.proteger():
+        raise OperationalError("caído")
+    with pytest.raises(CircuitoAbierto), circuito.proteger():
+        pass
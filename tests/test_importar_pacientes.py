@@ -0,0 +1,59 @@
+import csv
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from gestionApp.models import Paciente, Persona, PersonaToken
+from utilidad.rut_validator import calcular_dv
+
+ENCABEZADO = "rut,nombre,apellido_paterno,apellido_materno,fecha_nacimiento,sexo,estado_civil,prevision,consultorio\n"
+
+
+def _fila(cuerpo, nombre="Josefa", nacimiento="14-02-1995", sexo="Femenino"):
+    rut = f"{cuerpo}-{calcular_dv(str(cuerpo))}"
+    return f"{rut},{nombre},Pérez,Lagos,{nacimiento},{sexo},SOLTERA,FONASA_B,CESFAM_LOS_VOLCANES\n"
+
+
+@pytest.mark.django_db
+def test_importa_pacientes_y_rechaza_filas_invalidas(paciente, matrona, tmp_path):
+    archivo = tmp_path / "derivaciones.csv"
+    archivo.write_text(
+        ENCABEZADO
+        + _fila(20000001)
+        + _fila(20000002, nombre="Maite")
+        + "20000003-0,Ana,Soto,Soto,1990-01-01,Femenino,SOLTERA,FONASA_A,\n"   # DV incorrecto
+        + _fila(20000001)                                                       # repetido en el archivo
+        + _fila(16293109)                                                       # ya es paciente
+        + _fila(12345678, nombre="Carla")                                      # persona existente (matrona)
+        + _fila(20000004, nacimiento="2020-01-01")                              # edad fuera de rango
+        + _fila(20000005, sexo="F"),                                            # opción inválida
+        encoding="utf-8",
+    )
+    call_command("importar_pacientes", str(archivo), lote=3)
+
+    assert Paciente.objects.filter(persona__Rut__in=["20000001-3", "20000002-1"]).count() == 2
+    assert Paciente.objects.filter(persona=matrona.persona).exists()
+    assert Persona.objects.count() == 4
+    nueva = Persona.objects.get(Rut="20000002-1")
+    assert nueva.Rut_busqueda == nueva.Rut.replace("-", "")
+    assert PersonaToken.objects.filter(persona=nueva, token="maite").exists()
+
+    with open(tmp_path / "derivaciones.csv.errores.csv", encoding="utf-8") as salida:
+        rechazos = list(csv.DictReader(salida))
+    assert [fila["registro"] for fila in rechazos] == ["3", "4", "5", "7", "8"]
+    assert "Dígito verificador" in rechazos[0]["motivo"]
+
+
+@pytest.mark.django_db
+def test_consultas_por_lote_no_dependen_de_las_filas(tmp_path):
+    archivo = tmp_path / "derivaciones.csv"
+    archivo.write_text(ENCABEZADO + "".join(_fila(21000000 + i) for i in range(200)), encoding="utf-8")
+
+    with CaptureQueriesContext(connection) as consultas:
+        call_command("importar_pacientes", str(archivo), lote=200)
+
+    assert Paciente.objects.count() == 200
+    # 1 IN de RUT existentes + INSERT de personas, tokens y pacientes (+ savepoints)
+    assert len(consultas.captured_queries) < 15
@@ -0,0 +1,52 @@
+import pytest
+from django.urls import reverse
+from obstetric_care.instrumentacion import PresupuestoExcedido, reiniciar_metricas
+
+
+@pytest.fixture(autouse=True)
+def _metricas_limpias():
+    reiniciar_metricas()
+    yield
+    reiniciar_metricas()
+
+
+@pytest.mark.django_db(databases=["default", "legacy"])
+def test_mide_consultas_por_vista_y_alias(client, ficha):
+    for _ in range(3):
+        assert client.get(reverse("tens:alertas_meows")).status_code == 200
+    client.get(reverse("salud_bd"))
+
+    vistas = client.get(reverse("metricas_vistas")).json()["vistas"]
+    alertas = vistas["tens:alertas_meows"]
+    assert alertas["requests"] == 3
+    assert alertas["consultas_por_alias"] == {"default": 3}
+    assert alertas["presupuesto"] == 2
+    assert alertas["excesos_presupuesto"] == 0
+    assert set(alertas["total_ms"]) == {"p50", "p95", "p99"}
+    assert alertas["consultas"]["p50"] == 1
+    assert vistas["salud_bd"]["requests"] == 1
+
+
+@pytest.mark.django_db
+def test_tiempo_de_plantilla(client, ficha):
+    client.get(reverse("tens:cola_dosis"))
+    vistas = client.get(reverse("metricas_vistas")).json()["vistas"]
+    assert vistas["tens:cola_dosis"]["plantilla_ms"]["p50"] > 0
+    assert vistas["tens:cola_dosis"]["consultas"]["p50"] <= 4
+
+
+@pytest.mark.django_db
+def test_presupuesto_excedido_falla_en_modo_estricto(client, ficha, settings):
+    settings.PRESUPUESTO_CONSULTAS = {"tens:alertas_meows": 0}
+    with pytest.raises(PresupuestoExcedido, match="tens:alertas_meows"):
+        client.get(reverse("tens:alertas_meows"))
+
+
+@pytest.mark.django_db
+def test_presupuesto_excedido_solo_registra_fuera_de_tests(client, ficha, settings, caplog):
+    settings.PRESUPUESTO_CONSULTAS = {"tens:alertas_meows": 0}
+    settings.PRESUPUESTO_CONSULTAS_ESTRICTO = False
+    assert client.get(reverse("tens:alertas_meows")).status_code == 200
+    assert "exceden el presupuesto de 0" in caplog.text
+    vistas = client.get(reverse("metricas_vistas")).json()["vistas"]
+    assert vistas["tens:alertas_meows"]["excesos_presupuesto"] == 1
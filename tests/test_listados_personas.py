@@ -0,0 +1,82 @@
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from gestionApp.models import Paciente, Persona
+from utilidad.rut_validator import calcular_dv
+
+
+def _sembrar(cantidad, inicio=0):
+    personas = Persona.objects.bulk_create([
+        Persona(
+            Rut=f"{15_000_000 + i}-{calcular_dv(str(15_000_000 + i))}", Nombre=f"N{i}",
+            Apellido_Paterno=f"A{i % 7}", Apellido_Materno="M", Sexo="Femenino", Fecha_nacimiento=date(1992, 1, 1),
+            Nacionalidad="Peru" if i % 3 == 0 else "Chile", Activo=i % 5 != 0,
+        )
+        for i in range(inicio, inicio + cantidad)
+    ])
+    Paciente.objects.bulk_create([
+        Paciente(persona=persona, Estado_civil="SOLTERA", Previcion="ISAPRE" if i % 2 else "FONASA_A",
+                 activo=persona.Activo)
+        for i, persona in enumerate(personas)
+    ])
+
+
+def _recorrer(client, url, parametros):
+    """Todas las páginas siguiendo el cursor 'Siguiente'; retorna [(pks, consultas)]"""
+    paginas = []
+    consulta = parametros
+    while True:
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = client.get(f"{url}?{consulta}")
+        assert respuesta.status_code == 200
+        pagina = respuesta.context["pagina"]
+        paginas.append(([objeto.pk for objeto in pagina], len(consultas.captured_queries)))
+        if not pagina.tiene_siguiente:
+            return paginas
+        consulta = pagina.parametros_siguiente
+
+
+@pytest.mark.django_db
+def test_lista_pacientes_filtrada_y_paginada(client):
+    _sembrar(60)
+    paginas = _recorrer(client, reverse("matrona:lista_pacientes"), "prevision=ISAPRE&orden=antiguos")
+
+    pks = [pk for pagina, _ in paginas for pk in pagina]
+    esperados = Paciente.objects.filter(activo=True, Previcion="ISAPRE").order_by("Fecha_y_Hora_Ingreso", "pk")
+    assert pks == list(esperados.values_list("pk", flat=True))
+    assert len(paginas) == 2
+    assert len({consultas for _, consultas in paginas}) == 1
+
+
+@pytest.mark.django_db
+def test_lista_personas_filtros_y_orden(client):
+    _sembrar(30)
+    url = reverse("gestion:lista_personas")
+
+    respuesta = client.get(url, {"nacionalidad": "Peru", "activo": "", "orden": "apellido"})
+    personas = list(respuesta.context["personas"])
+    assert {p.Nacionalidad for p in personas} == {"Peru"}
+    assert len(personas) == 10
+    assert [p.Apellido_Paterno for p in personas] == sorted(p.Apellido_Paterno for p in personas)
+
+    # Valores fuera de los choices se ignoran (se aplica solo el filtro por defecto: activas)
+    respuesta = client.get(url, {"nacionalidad": "Narnia", "orden": "x"})
+    assert respuesta.context["filtros"] == {"activo": "1"}
+    assert all(p.Activo for p in respuesta.context["personas"])
+
+
+@pytest.mark.django_db
+def test_consultas_constantes_al_crecer_el_registro(client):
+    url = reverse("matrona:lista_pacientes")
+    _sembrar(25)
+    with CaptureQueriesContext(connection) as pocas:
+        client.get(url)
+    _sembrar(200, inicio=25)
+    with CaptureQueriesContext(connection) as muchas:
+        respuesta = client.get(url)
+    assert len(respuesta.context["pacientes"]) == 20
+    assert len(pocas.captured_queries) == len(muchas.captured_queries)
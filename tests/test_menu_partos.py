@@ -0,0 +1,91 @@
+import pytest
+from datetime import timedelta
+from django.core.cache import cache
+from django.utils import timezone
+from partosApp.models import RegistroParto, RegistroRecienNacido
+from partosApp.estadisticas import resumen_menu, calcular_resumen_menu
+
+
+@pytest.fixture(autouse=True)
+def _cache_limpio():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _parto(ficha, tipo_parto, admision):
+    return RegistroParto.objects.create(
+        ficha=ficha, tipo_parto=tipo_parto, fecha_hora_admision=admision,
+        edad_gestacional_semanas=39, tipo_regimen="CERO", clasificacion_robson="GRUPO_1",
+    )
+
+
+@pytest.mark.django_db
+def test_resumen_con_rangos_semiabiertos(ficha, django_assert_num_queries):
+    ahora = timezone.localtime()
+    inicio_hoy = ahora.replace(hour=0, minute=0, second=0, microsecond=0)
+    parto = _parto(ficha, "EUTOCICO", inicio_hoy)
+    _parto(ficha, "CESAREA_URGENCIA", inicio_hoy - timedelta(microseconds=1))
+    _parto(ficha, "CESAREA_ELECTIVA", inicio_hoy - timedelta(days=400))
+    RegistroRecienNacido.objects.create(
+        registro_parto=parto, sexo="FEMENINO", peso=3200, talla=50,
+        apgar_1_minuto=8, apgar_5_minutos=9, fecha_nacimiento=ahora,
+    )
+
+    with django_assert_num_queries(2):
+        resumen = calcular_resumen_menu(timezone.localdate())
+
+    assert resumen["total_partos"] == 3
+    assert resumen["partos_hoy"] == 1
+    assert resumen["partos_eutocicos"] == 1
+    assert resumen["cesareas"] == 2
+    assert resumen["total_rn"] == 1
+    assert resumen["rn_hoy"] == 1
+
+
+@pytest.mark.django_db
+def test_cache_se_invalida_al_guardar(ficha, django_assert_num_queries):
+    assert resumen_menu()["total_partos"] == 0
+
+    with django_assert_num_queries(0):
+        resumen_menu()
+
+    _parto(ficha, "EUTOCICO", timezone.now())
+    assert resumen_menu()["partos_hoy"] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_estadistica_diaria_se_mantiene_con_senales(ficha):
+    from partosApp.estadisticas import estadisticas_rango, reconstruir
+    from partosApp.models import EstadisticaDiariaParto
+
+    hoy = timezone.localdate()
+    ayer = hoy - timedelta(days=1)
+    parto = _parto(ficha, "CESAREA_URGENCIA", timezone.now())
+    gemelar = _parto(ficha, "EUTOCICO", timezone.now())
+    for peso in (2100, 2600):
+        RegistroRecienNacido.objects.create(
+            registro_parto=gemelar, sexo="FEMENINO", peso=peso, talla=45,
+            apgar_1_minuto=8, apgar_5_minutos=9, fecha_nacimiento=timezone.now(),
+        )
+
+    resumen = estadisticas_rango(hoy, hoy)
+    assert resumen["total_partos"] == 2
+    assert resumen["por_tipo"] == {"CESAREA_URGENCIA": 1, "EUTOCICO": 1}
+    assert resumen["cesareas_por_robson"] == {"GRUPO_1": 1}
+    assert resumen["por_banda_peso"] == {"BAJO_PESO": 1, "ADECUADO": 1}
+
+    # Cambiar la fecha de admisión mueve el parto de día
+    parto.fecha_hora_admision = timezone.now() - timedelta(days=1)
+    parto.save()
+    assert estadisticas_rango(hoy, hoy)["total_partos"] == 1
+    assert estadisticas_rango(ayer, hoy)["total_partos"] == 2
+
+    gemelar.delete()
+    assert estadisticas_rango(ayer, hoy)["por_banda_peso"] == {}
+
+    # La reconstrucción produce las mismas celdas que el mantenimiento incremental
+    celdas = list(EstadisticaDiariaParto.objects.values_list("fecha", "tipo_parto", "partos"))
+    EstadisticaDiariaParto.objects.all().delete()
+    reconstruir(ayer, hoy)
+    assert list(EstadisticaDiariaParto.objects.values_list("fecha", "tipo_parto", "partos")) == celdas
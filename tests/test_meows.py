@@ -0,0 +1,68 @@
+import io
+import pytest
+from datetime import date
+from django.core.management import call_command
+from django.urls import reverse
+from tensApp.alertas import fichas_en_alerta, recalcular_meows
+from tensApp.meows import calcular_meows
+from tensApp.models import RegistroTens, EstadoMeowsFicha
+
+NORMALES = dict(temperatura="36.8", frecuencia_cardiaca=80, presion_arterial="115/75",
+                frecuencia_respiratoria=16, saturacion_oxigeno=98)
+GRAVES = dict(temperatura="39.2", frecuencia_cardiaca=125, presion_arterial="165/112",
+              frecuencia_respiratoria=26, saturacion_oxigeno=93)
+
+
+def _registro(ficha, dia, turno, signos):
+    return RegistroTens.objects.create(ficha=ficha, fecha=date(2026, 10, dia), turno=turno, **signos)
+
+
+@pytest.mark.parametrize("valores, esperado", [
+    ({"frecuencia_cardiaca": 80, "saturacion_oxigeno": 98}, (0, "normal")),
+    ({"frecuencia_cardiaca": 105}, (1, "bajo")),
+    ({"saturacion_oxigeno": 90}, (3, "medio")),
+    ({"temperatura": 39.0, "frecuencia_cardiaca": 130, "presion_sistolica": 160}, (9, "alto")),
+    ({}, (None, "")),
+])
+def test_calculo_por_bandas(valores, esperado):
+    assert calcular_meows(valores) == esperado
+
+
+@pytest.mark.django_db
+def test_estado_sigue_al_ultimo_registro(ficha):
+    _registro(ficha, 1, "manana", NORMALES)
+    grave = _registro(ficha, 1, "tarde", GRAVES)
+    assert (grave.puntaje_meows, grave.nivel_meows) == (15, "alto")
+    assert EstadoMeowsFicha.objects.get(ficha=ficha).registro_id == grave.pk
+
+    # Un registro de un turno anterior no reemplaza al más reciente
+    _registro(ficha, 1, "manana", NORMALES)
+    assert EstadoMeowsFicha.objects.get(ficha=ficha).puntaje == 15
+
+    grave.delete()
+    assert EstadoMeowsFicha.objects.get(ficha=ficha).puntaje == 0
+
+
+@pytest.mark.django_db
+def test_alertas_sobre_umbral(client, ficha, django_assert_num_queries):
+    _registro(ficha, 2, "manana", GRAVES)
+    with django_assert_num_queries(1):
+        alertas = list(fichas_en_alerta(5))
+    assert [a.ficha_id for a in alertas] == [ficha.pk]
+
+    datos = client.get(reverse("tens:alertas_meows"), {"umbral": 16}).json()
+    assert datos["total"] == 0
+    datos = client.get(reverse("tens:alertas_meows")).json()
+    assert datos["alertas"][0]["rut"] == "16293109-1"
+
+
+@pytest.mark.django_db
+def test_recalculo_por_lotes(ficha):
+    registros = [_registro(ficha, dia, "manana", GRAVES) for dia in (1, 2, 3)]
+    RegistroTens.objects.update(puntaje_meows=None, nivel_meows="")
+    EstadoMeowsFicha.objects.all().delete()
+
+    assert recalcular_meows(tamano_lote=2) == (3, 1)
+    assert EstadoMeowsFicha.objects.get(ficha=ficha).registro_id == registros[-1].pk
+    call_command("recalcular_meows", stdout=io.StringIO())
+    assert set(RegistroTens.objects.values_list("puntaje_meows", flat=True)) == {15}
@@ -0,0 +1,75 @@
+import pytest
+from datetime import timedelta
+from django.http import QueryDict
+from django.urls import reverse
+from django.utils import timezone
+from matronaApp.models import FichaObstetrica
+from utilidad.paginacion import paginar_keyset, contar_aproximado
+
+ORDEN = ('-fecha_creacion', '-id')
+
+
+@pytest.fixture
+def fichas(paciente, matrona):
+    """25 fichas; las 10 primeras comparten fecha_creacion para probar el desempate por id"""
+    base = timezone.now()
+    creadas = [
+        FichaObstetrica.objects.create(paciente=paciente, matrona_responsable=matrona)
+        for _ in range(25)
+    ]
+    for i, ficha in enumerate(creadas):
+        fecha = base if i < 10 else base - timedelta(minutes=i)
+        FichaObstetrica.objects.filter(pk=ficha.pk).update(fecha_creacion=fecha)
+    return list(FichaObstetrica.objects.order_by(*ORDEN))
+
+
+def _parametros(querystring):
+    return QueryDict(querystring)
+
+
+@pytest.mark.django_db
+def test_recorrido_completo_adelante_y_atras(fichas):
+    qs = FichaObstetrica.objects.all()
+    vistas, paginas, parametros = [], [], QueryDict()
+    while True:
+        pagina = paginar_keyset(qs, ORDEN, parametros, por_pagina=7)
+        paginas.append(pagina)
+        vistas.extend(f.pk for f in pagina)
+        if not pagina.tiene_siguiente:
+            break
+        parametros = _parametros(pagina.parametros_siguiente)
+
+    assert vistas == [f.pk for f in fichas]
+    assert [len(p) for p in paginas] == [7, 7, 7, 4]
+    assert not paginas[0].tiene_anterior and paginas[-1].tiene_anterior
+
+    # Volver desde la última página reproduce las anteriores
+    anterior = paginar_keyset(qs, ORDEN, _parametros(paginas[-1].parametros_anterior), por_pagina=7)
+    assert [f.pk for f in anterior] == [f.pk for f in paginas[-2]]
+    assert anterior.tiene_anterior and anterior.tiene_siguiente
+    primera = paginar_keyset(qs, ORDEN, _parametros(paginas[1].parametros_anterior), por_pagina=7)
+    assert [f.pk for f in primera] == [f.pk for f in paginas[0]]
+    assert not primera.tiene_anterior
+
+
+@pytest.mark.django_db
+def test_cursor_invalido_vuelve_a_la_primera_pagina(fichas):
+    pagina = paginar_keyset(FichaObstetrica.objects.all(), ORDEN, _parametros('despues=basura&activa=1'))
+    assert [f.pk for f in pagina] == [f.pk for f in fichas[:20]]
+    assert 'activa=1' in pagina.parametros_siguiente
+
+
+@pytest.mark.django_db
+def test_conteo_con_tope(fichas):
+    qs = FichaObstetrica.objects.all()
+    assert contar_aproximado(qs) == (25, True)
+    assert contar_aproximado(qs, tope=10) == (10, False)
+
+
+@pytest.mark.django_db
+def test_lista_todas_fichas_paginada(client, fichas, django_assert_max_num_queries):
+    with django_assert_max_num_queries(4):
+        respuesta = client.get(reverse('matrona:todas_fichas'))
+    assert respuesta.status_code == 200
+    assert len(respuesta.context['fichas']) == 20
+    assert respuesta.context['pagina'].tiene_siguiente
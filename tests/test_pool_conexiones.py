@@ -0,0 +1,88 @@
+import threading
+import time
+import pytest
+from obstetric_care.db.mysql_pool.pool import PoolConexiones, PoolAgotado
+
+
+class ConexionFalsa:
+    """Conexión mínima del driver: cuenta rollbacks y puede 'cortarse'"""
+    abiertas = 0
+
+    def __init__(self):
+        ConexionFalsa.abiertas += 1
+        self.cortada = False
+        self.cerrada = False
+        self.rollbacks = 0
+
+    def ping(self, reconnect=False):
+        if self.cortada:
+            raise ConnectionError("server has gone away")
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.cerrada = True
+
+
+def _pool(**opciones):
+    return PoolConexiones(crear=ConexionFalsa, error_conexion=ConnectionError, **opciones)
+
+
+def test_reutiliza_conexiones_y_respeta_el_tamano():
+    pool = _pool(tamano=2, espera=0.05)
+    a = pool.tomar()
+    pool.devolver(a, revertir=False)
+    assert pool.tomar() is a
+
+    b = pool.tomar()
+    with pytest.raises(PoolAgotado):
+        pool.tomar()
+    pool.devolver(b)
+    assert b.rollbacks == 1
+    assert pool.estadisticas() == {"tamano": 2, "abiertas": 2, "libres": 1, "prestadas": 1}
+
+
+def test_pre_ping_y_vida_maxima_descartan_conexiones():
+    pool = _pool(tamano=2, vida_maxima=0.01)
+    vieja = pool.tomar()
+    pool.devolver(vieja)
+    time.sleep(0.02)
+    assert pool.tomar() is not vieja and vieja.cerrada
+
+    pool = _pool(tamano=2)
+    cortada = pool.tomar()
+    pool.devolver(cortada)
+    cortada.cortada = True
+    assert pool.tomar() is not cortada and cortada.cerrada
+
+
+def test_descartar_cierra_y_libera_el_cupo():
+    pool = _pool(tamano=1, espera=0.05)
+    conexion = pool.tomar()
+    pool.devolver(conexion, descartar=True)
+    assert conexion.cerrada
+    assert pool.tomar() is not conexion
+
+
+def test_hilos_concurrentes_nunca_superan_el_tamano():
+    pool = _pool(tamano=3, espera=5)
+    prestadas, maximo, candado = [0], [0], threading.Lock()
+
+    def trabajar():
+        for _ in range(50):
+            conexion = pool.tomar()
+            with candado:
+                prestadas[0] += 1
+                maximo[0] = max(maximo[0], prestadas[0])
+            with candado:
+                prestadas[0] -= 1
+            pool.devolver(conexion, revertir=False)
+
+    hilos = [threading.Thread(target=trabajar) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert maximo[0] <= 3
+    assert pool.estadisticas()["abiertas"] <= 3
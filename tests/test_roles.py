@@ -0,0 +1,60 @@
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from gestionApp.models import Persona, Tens
+from gestionApp.roles import con_roles, nombres_roles, obtener_persona_con_roles, roles_persona, tiene_rol
+from utilidad.rut_validator import calcular_dv
+
+
+@pytest.mark.django_db
+def test_roles_en_una_consulta(paciente, matrona, tens):
+    Tens.objects.create(persona=matrona.persona, Nivel="Preparto", Años_experiencia=1, Turno="Noche")
+
+    with CaptureQueriesContext(connection) as consultas:
+        personas = {p.pk: p for p in con_roles()}
+        roles = {pk: nombres_roles(p) for pk, p in personas.items()}
+    assert len(consultas.captured_queries) == 1
+    assert roles == {
+        paciente.pk: ["Paciente"],
+        matrona.persona.pk: ["Matrona", "TENS"],
+        tens.persona.pk: ["TENS"],
+    }
+
+    with CaptureQueriesContext(connection) as consultas:
+        persona = obtener_persona_con_roles(matrona.persona.pk, cargar=True)
+        assert tiene_rol(persona, "matrona") and not tiene_rol(persona, "medico")
+        assert persona.matrona.Registro_medico == "MAT-001"
+    assert len(consultas.captured_queries) == 1
+
+    # Persona cargada sin con_roles(): los cuatro roles en una sola consulta
+    with CaptureQueriesContext(connection) as consultas:
+        sin_roles = Persona.objects.get(pk=paciente.pk)
+        assert roles_persona(sin_roles)["es_paciente"] is True
+        assert tiene_rol(sin_roles, "tens") is False
+    assert len(consultas.captured_queries) == 2
+
+
+@pytest.mark.django_db
+def test_lista_personas_badges_sin_consultas_por_fila(client):
+    Persona.objects.bulk_create([
+        Persona(
+            Rut=f"{10_000_000 + i}-{calcular_dv(str(10_000_000 + i))}", Nombre=f"P{i}", Apellido_Paterno="A",
+            Apellido_Materno="B", Sexo="Femenino", Fecha_nacimiento=date(1990, 1, 1),
+        )
+        for i in range(60)
+    ])
+    with CaptureQueriesContext(connection) as consultas:
+        respuesta = client.get(reverse("gestion:lista_personas"))
+    assert respuesta.status_code == 200
+    assert len(consultas.captured_queries) <= 4
+
+
+@pytest.mark.django_db
+def test_asignar_rol_existente_redirige(client, paciente):
+    respuesta = client.get(reverse("gestion:asignar_rol_paciente", args=[paciente.pk]))
+    assert respuesta.status_code == 302
+    assert respuesta.url == reverse("gestion:gestionar_roles", args=[paciente.pk])
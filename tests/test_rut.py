@@ -0,0 +1,43 @@
+import random
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from utilidad.rut_validator import (
+    RUT_DUPLICADO, RUT_DV, RUT_FORMATO, RUT_VACIO, calcular_dv, validar_rut, validar_ruts,
+)
+
+
+def _dv_por_caracter(cuerpo):
+    suma, mult = 0, 2
+    for c in reversed(cuerpo):
+        suma += int(c) * mult
+        mult = 2 if mult == 7 else mult + 1
+    res = 11 - suma % 11
+    return "0" if res == 11 else "K" if res == 10 else str(res)
+
+
+def test_calcular_dv_coincide_con_modulo_11():
+    azar = random.Random(7)
+    cuerpos = [str(azar.randint(1, 99_999_999)) for _ in range(5000)] + ["16293109", "1234567890"]
+    for cuerpo in cuerpos:
+        assert calcular_dv(cuerpo) == _dv_por_caracter(cuerpo)
+
+
+def test_validar_ruts_codigos_por_fila():
+    resultado = validar_ruts(
+        ["16.293.109-1", "16293109-2", "", None, "1629-1", "16293109-X", "16293109-1", " 5.126.663-3 "],
+        detectar_duplicados=True,
+    )
+    assert resultado.errores == [None, RUT_DV, RUT_VACIO, RUT_VACIO, RUT_FORMATO, RUT_FORMATO, RUT_DUPLICADO, None]
+    assert resultado.validos() == ["16293109-1", "5126663-3"]
+    assert resultado.mensaje(1) == "Dígito verificador incorrecto."
+
+
+@pytest.mark.parametrize("valor", ["16.293.109-1", "16293109-1", "12.345.678-5", "1234567-4", "16293109-2", "abc", ""])
+def test_validacion_individual_y_por_lote_coinciden(valor):
+    (rut,), (error,) = validar_ruts([valor])
+    try:
+        assert validar_rut(valor) == rut
+    except ValidationError:
+        assert error is not None
@@ -0,0 +1,47 @@
+import pytest
+from django.db import OperationalError, connections
+from django.urls import reverse
+from legacyApp.circuito import CircuitoAbierto, circuito_legacy
+from legacyApp.models import ControlesPrevios
+from legacyApp.salud import monitor
+
+
+@pytest.fixture(autouse=True)
+def _estado_limpio():
+    circuito_legacy.reiniciar()
+    monitor("default").reiniciar()
+    monitor("legacy").reiniciar()
+    yield
+    circuito_legacy.reiniciar()
+
+
+@pytest.mark.django_db(databases=["default", "legacy"])
+def test_fallos_de_consulta_abren_el_circuito_y_el_router_falla_rapido(settings, django_assert_num_queries):
+    settings.LEGACY_CIRCUITO_FALLOS = 2
+    for _ in range(2):
+        with pytest.raises(OperationalError), connections["legacy"].cursor() as cursor:
+            cursor.execute("SELECT * FROM tabla_que_no_existe")
+
+    assert monitor("legacy").fallos == 2
+    assert circuito_legacy.estado == "abierto"
+    with django_assert_num_queries(0, connection=connections["legacy"]):
+        with pytest.raises(CircuitoAbierto):
+            ControlesPrevios.objects.filter(paciente_rut="16293109-1").exists()
+
+
+@pytest.mark.django_db(databases=["default", "legacy"])
+def test_endpoint_salud_reporta_latencias_y_estado(client, settings):
+    respuesta = client.get(reverse("salud_bd"), {"sondeo": "1"})
+    datos = respuesta.json()
+    assert respuesta.status_code == 200
+    assert datos["estado"] == "ok"
+    assert set(datos["bases"]) == {"default", "legacy"}
+    assert set(datos["bases"]["legacy"]["latencia_ms"]) == {"p50", "p95", "p99"}
+    assert datos["bases"]["default"]["circuito"] is None
+
+    settings.LEGACY_CIRCUITO_FALLOS = 1
+    circuito_legacy.registrar_fallo()
+    datos = client.get(reverse("salud_bd"), {"sondeo": "1"}).json()
+    assert datos["estado"] == "degradado"
+    assert datos["bases"]["legacy"]["estado"] == "caida"
+    assert datos["bases"]["legacy"]["circuito"]["estado"] == "abierto"
@@ -0,0 +1,56 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from django.db import connection
+from gestionApp.models import Persona, Paciente, Secuencia
+from gestionApp.secuencias import siguiente_valor, siguiente_codigo, reiniciar_bloques
+from matronaApp.models import IngresoPaciente
+
+
+@pytest.fixture(autouse=True)
+def _bloques_limpios():
+    reiniciar_bloques()
+    yield
+    reiniciar_bloques()
+
+
+def _paciente():
+    persona = Persona.objects.create(
+        Rut="16293109-1", Nombre="Ana", Apellido_Paterno="Silva", Apellido_Materno="Rivas",
+        Sexo="Femenino", Fecha_nacimiento=date(1990, 1, 1),
+    )
+    return Paciente.objects.create(persona=persona, Estado_civil="SOLTERA", Previcion="FONASA_A")
+
+
+@pytest.mark.django_db
+def test_secuencia_correlativa_y_valor_inicial():
+    assert [siguiente_valor("prueba") for _ in range(3)] == [1, 2, 3]
+    assert siguiente_codigo("otra", "FO", 5, inicial=lambda: 41) == "FO-00042"
+    assert Secuencia.objects.get(nombre="otra").valor == 42
+
+
+@pytest.mark.django_db
+def test_ingreso_continua_numeracion_existente():
+    paciente = _paciente()
+    IngresoPaciente.objects.create(paciente=paciente, motivo_consulta="Control", numero_ficha="ING-00041")
+    nuevo = IngresoPaciente.objects.create(paciente=paciente, motivo_consulta="Contracciones")
+    assert nuevo.numero_ficha == "ING-00042"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asignacion_concurrente_sin_duplicados(settings):
+    settings.SECUENCIAS_TAMANO_BLOQUE = 7
+
+    def tomar(_):
+        try:
+            return siguiente_valor("concurrente")
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        valores = list(pool.map(tomar, range(300)))
+
+    assert len(set(valores)) == 300
+    # Un solo proceso: sin saltos; el contador queda al final del último bloque de 7
+    assert sorted(valores) == list(range(1, 301))
+    assert Secuencia.objects.get(nombre="concurrente").valor == 301
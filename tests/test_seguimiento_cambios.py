@@ -0,0 +1,72 @@
+"""
+SeguimientoCambiosMixin (utilidad/cambios.py): los save() escriben y validan
+solo las columnas modificadas
+"""
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from gestionApp.models import Persona, PersonaToken
+from matronaApp.models import FichaObstetrica
+
+
+def _sql(consultas, prefijo):
+    return [q["sql"] for q in consultas.captured_queries if q["sql"].startswith(prefijo)]
+
+
+def _columnas(update):
+    return update.split(" SET ")[1].split(" WHERE ")[0]
+
+
+@pytest.mark.django_db
+def test_persona_actualiza_solo_lo_modificado(paciente):
+    persona = Persona.objects.get(pk=paciente.persona.pk)
+    persona.Nombre = "Antonia"
+    with CaptureQueriesContext(connection) as consultas:
+        persona.save()
+
+    updates = _sql(consultas, 'UPDATE "gestionApp_persona"')
+    assert len(updates) == 1
+    assert [c.split(" = ")[0] for c in _columnas(updates[0]).split(", ")] == ['"Nombre"']
+    # Sin consulta de unicidad del Rut (no cambió)
+    assert not [q for q in _sql(consultas, "SELECT") if '"gestionApp_persona"."Rut" =' in q]
+    assert PersonaToken.objects.filter(persona=persona, token="antonia").exists()
+
+
+@pytest.mark.django_db
+def test_guardar_sin_cambios_no_consulta(paciente):
+    persona = Persona.objects.get(pk=paciente.persona.pk)
+    with CaptureQueriesContext(connection) as consultas:
+        persona.save()
+        paciente.save()
+    assert consultas.captured_queries == []
+
+
+@pytest.mark.django_db
+def test_rut_modificado_se_valida(paciente, matrona):
+    persona = Persona.objects.get(pk=paciente.persona.pk)
+    persona.Rut = matrona.persona.Rut
+    with pytest.raises(ValidationError) as error:
+        persona.save()
+    assert "Rut" in error.value.message_dict
+
+
+@pytest.mark.django_db
+def test_campo_diferido(paciente):
+    persona = Persona.objects.only("Nombre").get(pk=paciente.persona.pk)
+    persona.Apellido_Materno = "Pérez"
+    persona.save()
+    persona = Persona.objects.get(pk=persona.pk)
+    assert (persona.Nombre, persona.Apellido_Materno) == ("Ana", "Pérez")
+
+
+@pytest.mark.django_db
+def test_desactivar_ficha_escribe_solo_activa(client, ficha):
+    with CaptureQueriesContext(connection) as consultas:
+        respuesta = client.post(reverse("matrona:toggle_ficha", args=[ficha.pk]))
+    assert respuesta.status_code == 302
+    updates = _sql(consultas, 'UPDATE "matronaApp_fichaobstetrica"')
+    assert len(updates) == 1
+    assert sorted(c.split(" = ")[0] for c in _columnas(updates[0]).split(", ")) == ['"activa"', '"fecha_modificacion"']
+    assert not FichaObstetrica.objects.get(pk=ficha.pk).activa
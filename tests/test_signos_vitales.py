@@ -0,0 +1,71 @@
+import io
+import pytest
+from datetime import date
+from django.core.management import call_command
+from django.urls import reverse
+from gestionApp.forms.tens_forms import RegistroTensForm
+from tensApp.models import RegistroTens
+from tensApp.signos_vitales import serie_signos, tendencia_signos
+
+
+@pytest.fixture
+def registros(ficha):
+    datos = [
+        (date(2026, 10, 1), "manana", "120/80", 80, "36.5"),
+        (date(2026, 10, 1), "tarde", "130 / 90 mmHg", 90, "37.1"),
+        (date(2026, 10, 2), "manana", "110/70", 70, "36.9"),
+    ]
+    return [
+        RegistroTens.objects.create(
+            ficha=ficha, fecha=fecha, turno=turno, presion_arterial=presion,
+            frecuencia_cardiaca=fc, temperatura=temperatura, saturacion_oxigeno=98,
+        )
+        for fecha, turno, presion, fc, temperatura in datos
+    ]
+
+
+@pytest.mark.django_db
+def test_presion_se_descompone_al_guardar(registros):
+    registro = RegistroTens.objects.get(pk=registros[1].pk)
+    assert (registro.presion_sistolica, registro.presion_diastolica) == (130, 90)
+    assert registro.presion_arterial == "130/90"
+
+
+@pytest.mark.django_db
+def test_tendencia_por_dia_en_una_consulta(ficha, registros, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        tendencia = tendencia_signos(ficha.pk, por="dia")
+    assert tendencia["fechas"] == ["2026-10-01", "2026-10-02"]
+    assert tendencia["mediciones"] == [2, 1]
+    sistolica = tendencia["series"]["presion_sistolica"]
+    assert sistolica == {"min": [120, 110], "max": [130, 110], "media": [125.0, 110.0]}
+    assert tendencia["series"]["temperatura"]["max"] == [37.1, 36.9]
+
+
+@pytest.mark.django_db
+def test_serie_y_filtro_por_fecha(ficha, registros):
+    serie = serie_signos(ficha.pk, desde=date(2026, 10, 2))
+    assert serie["fechas"] == ["2026-10-02"]
+    assert serie["frecuencia_cardiaca"] == [70]
+
+
+@pytest.mark.django_db
+def test_api_tendencia_por_turno(client, ficha, registros):
+    url = reverse("tens:tendencia_signos", args=[ficha.pk])
+    datos = client.get(url, {"por": "turno"}).json()
+    assert datos["turnos"] == ["manana", "tarde", "manana"]
+    assert client.get(url, {"por": "semana"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_completar_presiones_de_registros_antiguos(registros):
+    RegistroTens.objects.update(presion_sistolica=None, presion_diastolica=None)
+    call_command("completar_presion_tens", "--lote", "2", stdout=io.StringIO())
+    assert list(RegistroTens.objects.order_by("id").values_list("presion_sistolica", flat=True)) == [120, 130, 110]
+
+
+@pytest.mark.parametrize("presion, valida", [("120/80", True), ("80/120", False), ("12080", False)])
+def test_formulario_valida_presion(presion, valida):
+    form = RegistroTensForm(data={"presion_arterial": presion})
+    form.is_valid()
+    assert ("presion_arterial" not in form.errors) is valida
@@ -0,0 +1,137 @@
+# utilidad/autocompletar.py
+"""
+Respuestas de autocompletado (APIs JSON consultadas al escribir)
+- Caché LRU + TTL en memoria del proceso, por endpoint y consulta normalizada.
+  Se guarda el JSON ya codificado: un acierto no vuelve a serializar nada.
+- Coalescencia: si llega la misma consulta mientras otra idéntica está en curso
+  (mismo event loop), espera ese resultado en vez de lanzar otra consulta a la BD.
+- invalidar_autocompletado() vacía todos los cachés del proceso (señales de
+  gestionApp al guardar Persona / Paciente / FichaObstetrica); el TTL
+  (AUTOCOMPLETAR_CACHE_TTL) acota la desactualización entre procesos.
+
+Uso en una vista async:
+    async def _buscar(rut):            # consulta con el ORM async, retorna un dict
+        ...
+    BUSCADOR = Autocompletado('tens:paciente', _buscar)
+
+    async def api(request):
+        return respuesta_json(await BUSCADOR.resolver(normalizar(request.GET['rut'])))
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.http import HttpResponse
+
+
+TTL_DEFECTO = 10
+MAXIMO_DEFECTO = 1024
+
+_FALTA = object()
+
+
+class CacheLRU:
+    """Diccionario acotado: descarta el menos usado al llenarse y las entradas vencidas al leerlas"""
+
+    def __init__(self, maximo=MAXIMO_DEFECTO):
+        self.maximo = maximo
+        self._datos = OrderedDict()
+        # Los requests de WSGI (y los hilos de sync_to_async) comparten la instancia
+        self._bloqueo = threading.Lock()
+
+    def obtener(self, clave):
+        """Valor guardado, o _FALTA si no existe o venció"""
+        with self._bloqueo:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return _FALTA
+            vence, valor = entrada
+            if vence <= time.monotonic():
+                del self._datos[clave]
+                return _FALTA
+            self._datos.move_to_end(clave)
+            return valor
+
+    def guardar(self, clave, valor, ttl):
+        with self._bloqueo:
+            self._datos[clave] = (time.monotonic() + ttl, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maximo:
+                self._datos.popitem(last=False)
+
+    def limpiar(self):
+        with self._bloqueo:
+            self._datos.clear()
+
+    def __len__(self):
+        return len(self._datos)
+
+
+_registrados = []
+# Cambia en cada invalidación: un resultado consultado antes no se guarda después
+_generacion = 0
+
+
+class Autocompletado:
+    """
+    Resultados cacheados y coalescidos de una consulta async.
+
+    Args:
+        nombre (str): Identifica el endpoint (solo para depurar)
+        consulta: async def consulta(clave) -> dict serializable a JSON
+    """
+
+    def __init__(self, nombre, consulta):
+        self.nombre = nombre
+        self.consulta = consulta
+        self.cache = CacheLRU(getattr(settings, 'AUTOCOMPLETAR_CACHE_MAXIMO', MAXIMO_DEFECTO))
+        self._en_curso = {}
+        _registrados.append(self)
+
+    async def resolver(self, clave):
+        """JSON (bytes) del resultado para `clave` ya normalizada"""
+        cuerpo = self.cache.obtener(clave)
+        if cuerpo is not _FALTA:
+            return cuerpo
+
+        loop = asyncio.get_running_loop()
+        tarea = self._en_curso.get(clave)
+        if tarea is None or tarea.get_loop() is not loop:
+            # Tarea propia (no ligada a este request): si el cliente se desconecta,
+            # los demás que la esperan igual reciben el resultado
+            tarea = loop.create_task(self._consultar(clave))
+            self._en_curso[clave] = tarea
+            tarea.add_done_callback(lambda _, clave=clave, tarea=tarea: self._terminar(clave, tarea))
+        return await asyncio.shield(tarea)
+
+    async def _consultar(self, clave):
+        generacion = _generacion
+        cuerpo = codificar(await self.consulta(clave))
+        if generacion == _generacion:
+            self.cache.guardar(clave, cuerpo, getattr(settings, 'AUTOCOMPLETAR_CACHE_TTL', TTL_DEFECTO))
+        return cuerpo
+
+    def _terminar(self, clave, tarea):
+        if self._en_curso.get(clave) is tarea:
+            del self._en_curso[clave]
+
+
+def codificar(datos):
+    """JSON compacto en UTF-8"""
+    return json.dumps(datos, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def respuesta_json(cuerpo, status=200):
+    """HttpResponse con JSON ya codificado (sin pasar por JsonResponse/DjangoJSONEncoder)"""
+    return HttpResponse(cuerpo, content_type='application/json', status=status)
+
+
+def invalidar_autocompletado():
+    """Vacía el caché de todos los endpoints de autocompletado del proceso"""
+    global _generacion
+    _generacion += 1
+    for autocompletado in _registrados:
+        autocompletado.cache.limpiar()
@@ -0,0 +1,117 @@
+# utilidad/cambios.py
+"""
+Seguimiento de campos modificados para los modelos anchos
+(Persona, Paciente, FichaObstetrica, RegistroParto, Patologias)
+
+- Al cargar una instancia desde la BD se guardan sus valores originales.
+- save() sin update_fields escribe solo las columnas que cambiaron (más las
+  auto_now); si no cambió nada no se ejecuta ningún UPDATE. Las instancias
+  nuevas se insertan completas, como siempre.
+- validar_cambios() reemplaza a full_clean() en los save(): valida solo los
+  campos modificados, por lo que las consultas de unicidad (ej. Rut) corren
+  solo si ese campo cambió. El clean() del modelo corre siempre, salvo que el
+  modelo declare en CAMPOS_CLEAN de qué campos depende.
+"""
+import copy
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+
+
+class SeguimientoCambiosMixin:
+    """Debe ir antes de models.Model: class Persona(SeguimientoCambiosMixin, models.Model)"""
+
+    # Campos que revisa clean(); None = clean() corre en cada validación
+    CAMPOS_CLEAN = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        instancia._recordar_originales()
+        return instancia
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        # También se llama al leer un campo diferido (.only() / .defer())
+        self._recordar_originales(None if fields is None else self._attnames(fields))
+
+    def _attnames(self, nombres):
+        attnames = set()
+        for nombre in nombres:
+            try:
+                attnames.add(self._meta.get_field(nombre).attname)
+            except (FieldDoesNotExist, AttributeError):
+                attnames.add(nombre)
+        return attnames
+
+    def _recordar_originales(self, attnames=None):
+        originales = getattr(self, '_originales', {}) if attnames is not None else {}
+        for campo in self._meta.concrete_fields:
+            if campo.attname not in self.__dict__ or (attnames is not None and campo.attname not in attnames):
+                continue
+            valor = self.__dict__[campo.attname]
+            originales[campo.attname] = copy.deepcopy(valor) if isinstance(valor, (dict, list)) else valor
+        self._originales = originales
+
+    def campos_modificados(self):
+        """
+        Nombres de los campos cuyo valor difiere del cargado desde la BD.
+
+        Returns:
+            list: Campos modificados ([] si no hay cambios)
+            None: La instancia no se cargó desde la BD (no hay con qué comparar)
+        """
+        originales = getattr(self, '_originales', None)
+        if originales is None or self._state.adding:
+            return None
+        return [
+            campo.name
+            for campo in self._meta.concrete_fields
+            if not campo.primary_key
+            and campo.attname in self.__dict__
+            and (campo.attname not in originales or self.__dict__[campo.attname] != originales[campo.attname])
+        ]
+
+    def campos_a_guardar(self, update_fields=None):
+        """update_fields que usará save(): los explícitos, los modificados, o None (fila completa)"""
+        if update_fields is not None:
+            return update_fields
+        modificados = self.campos_modificados()
+        if not modificados:
+            # None: insertar / guardar completo; []: nada que escribir
+            return modificados
+        return modificados + [
+            campo.name
+            for campo in self._meta.concrete_fields
+            if getattr(campo, 'auto_now', False) and campo.name not in modificados
+        ]
+
+    def validar_cambios(self):
+        """full_clean() limitado a los campos modificados (completo si la instancia es nueva)"""
+        modificados = self.campos_modificados()
+        if modificados is None:
+            self.full_clean()
+            return
+
+        excluir = {campo.name for campo in self._meta.fields if campo.name not in modificados}
+        pasos = [self.clean_fields]
+        if self.CAMPOS_CLEAN is None or not set(self.CAMPOS_CLEAN).isdisjoint(modificados):
+            pasos.append(lambda exclude: self.clean())
+        pasos += [self.validate_unique, self.validate_constraints]
+
+        # Mismo orden y acumulación de errores que Model.full_clean()
+        errores = {}
+        for paso in pasos:
+            try:
+                paso(exclude=excluir)
+            except ValidationError as error:
+                errores = error.update_error_dict(errores)
+        if errores:
+            raise ValidationError(errores)
+
+    def save(self, *args, **kwargs):
+        if not kwargs.get('force_insert'):
+            kwargs['update_fields'] = self.campos_a_guardar(kwargs.get('update_fields'))
+        super().save(*args, **kwargs)
+        # Solo las columnas escritas quedan como nuevos valores originales
+        guardados = kwargs.get('update_fields')
+        self._recordar_originales(None if guardados is None else self._attnames(guardados))
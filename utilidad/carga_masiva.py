@@ -0,0 +1,127 @@
+# utilidad/carga_masiva.py
+"""
+Utilidades para cargas masivas desde archivos (CSV / JSONL, opcionalmente .gz)
+- Lectura en streaming: nunca se carga el archivo completo en memoria.
+- Agrupación en lotes.
+- Punto de control (checkpoint) en JSON para reanudar una carga interrumpida.
+- Medición de rendimiento (filas/seg).
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import time
+from itertools import islice
+
+
+FORMATOS = ('csv', 'jsonl')
+
+
+def detectar_formato(ruta):
+    """'csv' o 'jsonl' según la extensión (ignorando .gz)"""
+    nombre = ruta[:-3] if ruta.endswith('.gz') else ruta
+    extension = os.path.splitext(nombre)[1].lower().lstrip('.')
+    if extension in ('jsonl', 'ndjson', 'json'):
+        return 'jsonl'
+    return 'csv'
+
+
+def _abrir(ruta):
+    if ruta.endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(ruta, 'rb'), encoding='utf-8-sig', newline='')
+    return open(ruta, encoding='utf-8-sig', newline='')
+
+
+def leer_registros(ruta, formato=None, omitir=0):
+    """
+    Genera (numero, registro) para cada registro del archivo.
+
+    Args:
+        ruta (str): Archivo CSV (con encabezado) o JSONL; admite .gz
+        formato (str): 'csv' | 'jsonl' (default: según extensión)
+        omitir (int): Registros iniciales a saltar (reanudación)
+
+    `numero` es la posición del registro (1 = primer registro de datos).
+    En JSONL una línea que no es JSON produce registro=None.
+    """
+    formato = formato or detectar_formato(ruta)
+    with _abrir(ruta) as archivo:
+        if formato == 'csv':
+            registros = csv.DictReader(archivo)
+        else:
+            registros = (_json_o_none(linea) for linea in archivo if linea.strip())
+        yield from islice(enumerate(registros, start=1), omitir, None)
+
+
+def _json_o_none(linea):
+    try:
+        registro = json.loads(linea)
+    except ValueError:
+        return None
+    return registro if isinstance(registro, dict) else None
+
+
+def en_lotes(iterable, tamano):
+    """Divide un iterable en listas de a lo más `tamano` elementos"""
+    iterador = iter(iterable)
+    while True:
+        lote = list(islice(iterador, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+class Checkpoint:
+    """
+    Progreso de una carga persistido en JSON. Se escribe de forma atómica
+    (archivo temporal + os.replace) después de confirmar cada lote.
+    """
+
+    def __init__(self, ruta, origen):
+        self.ruta = ruta
+        self.origen = os.path.abspath(origen)
+        self.datos = {'origen': self.origen, 'procesados': 0, 'insertados': 0, 'rechazados': 0}
+
+    def cargar(self):
+        """Lee el checkpoint existente; retorna la cantidad de registros ya procesados"""
+        if not self.ruta or not os.path.exists(self.ruta):
+            return 0
+        with open(self.ruta, encoding='utf-8') as archivo:
+            datos = json.load(archivo)
+        if datos.get('origen') != self.origen:
+            raise ValueError(f"El checkpoint {self.ruta} corresponde a otro archivo: {datos.get('origen')}")
+        self.datos.update(datos)
+        return self.datos['procesados']
+
+    def guardar(self, **valores):
+        self.datos.update(valores)
+        if not self.ruta:
+            return
+        temporal = f'{self.ruta}.tmp'
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(self.datos, archivo)
+        os.replace(temporal, self.ruta)
+
+    def eliminar(self):
+        if self.ruta and os.path.exists(self.ruta):
+            os.remove(self.ruta)
+
+
+class Medidor:
+    """Cuenta filas y calcula el rendimiento (filas/seg) desde su creación"""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.filas = 0
+
+    def sumar(self, filas):
+        self.filas += filas
+
+    @property
+    def segundos(self):
+        return time.perf_counter() - self.inicio
+
+    @property
+    def filas_por_segundo(self):
+        return self.filas / self.segundos if self.segundos else 0.0
@@ -0,0 +1,196 @@
+# utilidad/exportacion.py
+"""
+Escritores en streaming para exportaciones (CSV, CSV.gz y XLSX)
+Cada generador recibe los encabezados y un iterable de filas y entrega bloques
+de bytes a medida que se producen: sirven tanto para un StreamingHttpResponse
+como para escribir a un archivo, y la memoria no crece con la cantidad de filas.
+
+El XLSX se escribe con zipfile (sin dependencias externas) usando inline
+strings, de modo que no requiere tabla de strings compartidos en memoria.
+"""
+import csv
+import re
+import zipfile
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import chain
+from xml.sax.saxutils import escape
+
+from django.utils import timezone
+
+
+FILAS_POR_BLOQUE = 500
+
+TIPOS_CONTENIDO = {
+    'csv': 'text/csv; charset=utf-8',
+    'csv.gz': 'application/gzip',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def valor_texto(valor):
+    """Representación de un valor para CSV / celda de texto"""
+    if valor is None:
+        return ''
+    if isinstance(valor, bool):
+        return 'Sí' if valor else 'No'
+    if isinstance(valor, datetime):
+        if timezone.is_aware(valor):
+            valor = timezone.localtime(valor)
+        return valor.strftime('%Y-%m-%d %H:%M')
+    if isinstance(valor, date):
+        return valor.isoformat()
+    return str(valor)
+
+
+# ============================================
+# CSV
+# ============================================
+
+class _Eco:
+    """Pseudo-archivo: csv.writer retorna la línea escrita en vez de guardarla"""
+
+    def write(self, valor):
+        return valor
+
+
+def generar_csv(encabezados, filas, comprimir=False, filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    Bloques de bytes de un CSV UTF-8 (con BOM, para que Excel respete los acentos).
+    Con comprimir=True la salida es un gzip válido (.csv.gz).
+    """
+    escritor = csv.writer(_Eco())
+    compresor = zlib.compressobj(wbits=31) if comprimir else None
+
+    def codificar(lineas):
+        datos = ''.join(lineas).encode('utf-8')
+        return compresor.compress(datos) if compresor else datos
+
+    bloque = ['\ufeff', escritor.writerow(encabezados)]
+    for fila in filas:
+        bloque.append(escritor.writerow([valor_texto(valor) for valor in fila]))
+        if len(bloque) >= filas_por_bloque:
+            datos = codificar(bloque)
+            bloque = []
+            if datos:
+                yield datos
+
+    datos = codificar(bloque)
+    if compresor:
+        datos += compresor.flush()
+    if datos:
+        yield datos
+
+
+# ============================================
+# XLSX
+# ============================================
+
+_XLSX_FIJOS = (
+    ('[Content_Types].xml',
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+     '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+     '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+     '<Default Extension="xml" ContentType="application/xml"/>'
+     '<Override PartName="/xl/workbook.xml" '
+     'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+     '<Override PartName="/xl/worksheets/sheet1.xml" '
+     'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+     '</Types>'),
+    ('_rels/.rels',
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+     '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+     '<Relationship Id="rId1" '
+     'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+     'Target="xl/workbook.xml"/>'
+     '</Relationships>'),
+    ('xl/_rels/workbook.xml.rels',
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+     '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+     '<Relationship Id="rId1" '
+     'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+     'Target="worksheets/sheet1.xml"/>'
+     '</Relationships>'),
+)
+
+_XLSX_LIBRO = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{hoja}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_XLSX_INICIO_HOJA = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_XLSX_FIN_HOJA = b'</sheetData></worksheet>'
+
+# Caracteres de control no permitidos en XML 1.0
+_NO_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+class _Tubo:
+    """Destino no posicionable para zipfile: acumula bytes hasta que se vacían"""
+
+    def __init__(self):
+        self._partes = []
+        self._posicion = 0
+
+    def write(self, datos):
+        self._partes.append(bytes(datos))
+        self._posicion += len(datos)
+        return len(datos)
+
+    def tell(self):
+        return self._posicion
+
+    def flush(self):
+        pass
+
+    def vaciar(self):
+        datos = b''.join(self._partes)
+        self._partes = []
+        return datos
+
+
+def _celda_xlsx(valor):
+    if isinstance(valor, (int, float, Decimal)) and not isinstance(valor, bool):
+        return f'<c><v>{valor}</v></c>'
+    texto = escape(_NO_XML.sub('', valor_texto(valor)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{texto}</t></is></c>'
+
+
+def _fila_xlsx(fila):
+    return ('<row>' + ''.join(_celda_xlsx(valor) for valor in fila) + '</row>').encode('utf-8')
+
+
+def generar_xlsx(encabezados, filas, hoja='Datos', filas_por_bloque=FILAS_POR_BLOQUE):
+    """Bloques de bytes de un libro XLSX de una hoja (máximo 1.048.576 filas por hoja en Excel)"""
+    tubo = _Tubo()
+    with zipfile.ZipFile(tubo, 'w', zipfile.ZIP_DEFLATED) as libro:
+        for nombre, contenido in _XLSX_FIJOS:
+            libro.writestr(nombre, contenido)
+        libro.writestr('xl/workbook.xml', _XLSX_LIBRO.format(hoja=escape(hoja)))
+
+        with libro.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as hoja_xml:
+            hoja_xml.write(_XLSX_INICIO_HOJA)
+            for numero, fila in enumerate(chain([encabezados], filas), start=1):
+                hoja_xml.write(_fila_xlsx(fila))
+                if numero % filas_por_bloque == 0:
+                    datos = tubo.vaciar()
+                    if datos:
+                        yield datos
+            hoja_xml.write(_XLSX_FIN_HOJA)
+    yield tubo.vaciar()
+
+
+def generar_exportacion(formato, encabezados, filas, comprimir=False):
+    """Despacha a generar_csv / generar_xlsx; retorna (bloques, tipo de contenido, extensión)"""
+    if formato == 'xlsx':
+        # El XLSX ya es un zip: no se vuelve a comprimir
+        return generar_xlsx(encabezados, filas), TIPOS_CONTENIDO['xlsx'], 'xlsx'
+    extension = 'csv.gz' if comprimir else 'csv'
+    return generar_csv(encabezados, filas, comprimir=comprimir), TIPOS_CONTENIDO[extension], extension
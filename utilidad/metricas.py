@@ -0,0 +1,21 @@
+# utilidad/metricas.py
+"""
+Métricas simples de latencia compartidas por el monitoreo y los benchmarks
+"""
+
+
+def percentil(valores, p):
+    """Percentil p (0-100) por interpolación lineal"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    k = (len(ordenados) - 1) * p / 100
+    inferior = int(k)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (k - inferior)
+
+
+def percentiles(valores, ps=(50, 95, 99)):
+    """{'p50': ..., 'p95': ..., 'p99': ...} redondeados a 2 decimales"""
+    ordenados = sorted(valores)
+    return {f'p{p}': round(percentil(ordenados, p), 2) for p in ps}
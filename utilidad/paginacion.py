@@ -0,0 +1,215 @@
+# utilidad/paginacion.py
+"""
+Paginación por cursor (keyset / seek)
+En lugar de OFFSET (que recorre y descarta todas las filas anteriores), cada
+página continúa desde la clave de la última fila mostrada:
+
+    WHERE (fecha_creacion, id) < (:fecha, :id) ORDER BY fecha_creacion DESC, id DESC LIMIT 20
+
+El índice del orden resuelve cualquier página con el mismo costo que la primera.
+El orden debe terminar en una columna única (normalmente 'id' / '-id').
+
+Uso en una vista:
+    pagina = paginar_keyset(queryset, ('-fecha_creacion', '-id'), request.GET)
+    render(..., {'fichas': pagina, 'pagina': pagina})
+y en el template: {% include 'Shared/paginacion_keyset.html' %}
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from django.utils.http import urlencode
+
+
+POR_PAGINA = 20
+TOPE_CONTEO = 1000
+
+
+# ============================================
+# CURSORES
+# ============================================
+
+def _campos(modelo, orden):
+    """[(nombre, descendente, field)] para cada elemento del orden"""
+    resultado = []
+    for elemento in orden:
+        nombre = elemento.lstrip('-')
+        campo = modelo._meta.pk if nombre == 'pk' else modelo._meta.get_field(nombre)
+        resultado.append((campo.attname, elemento.startswith('-'), campo))
+    return resultado
+
+
+def codificar_cursor(objeto, campos):
+    valores = [campo.value_to_string(objeto) for _, _, campo in campos]
+    return base64.urlsafe_b64encode(json.dumps(valores).encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor, campos):
+    """Valores Python de un cursor, o None si está corrupto o no corresponde al orden"""
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if len(valores) != len(campos):
+            return None
+        return [campo.to_python(valor) for (_, _, campo), valor in zip(campos, valores)]
+    except (ValueError, TypeError, ValidationError):
+        return None
+
+
+def filtro_despues_de(campos, valores, invertir=False):
+    """
+    Q de las filas que van después de `valores` en el orden (antes, con invertir=True).
+    Comparación lexicográfica: (a > x) OR (a = x AND b > y) OR ...
+    """
+    filtro = Q()
+    for i, (nombre, descendente, _) in enumerate(campos):
+        hacia_menores = descendente != invertir
+        condicion = Q(**{f"{nombre}__{'lt' if hacia_menores else 'gt'}": valores[i]})
+        for j, (nombre_previo, _, _) in enumerate(campos[:i]):
+            condicion &= Q(**{nombre_previo: valores[j]})
+        filtro |= condicion
+    return filtro
+
+
+# ============================================
+# CONTEO APROXIMADO
+# ============================================
+
+def contar_aproximado(queryset, tope=TOPE_CONTEO):
+    """
+    (cantidad, exacto). Cuenta a lo más `tope` filas (COUNT sobre un LIMIT),
+    así el costo no crece con la tabla; si hay más, retorna (tope, False).
+    En MySQL, sin filtros, usa la estimación de information_schema.
+    """
+    conexion = connections[queryset.db]
+    if conexion.vendor == 'mysql' and not queryset.query.where:
+        with conexion.cursor() as cursor:
+            cursor.execute(
+                'SELECT TABLE_ROWS FROM information_schema.TABLES '
+                'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s',
+                [queryset.model._meta.db_table],
+            )
+            fila = cursor.fetchone()
+        if fila and fila[0] is not None:
+            return int(fila[0]), False
+
+    cantidad = queryset.order_by()[:tope + 1].count()
+    if cantidad > tope:
+        return tope, False
+    return cantidad, True
+
+
+# ============================================
+# PÁGINA
+# ============================================
+
+class PaginaKeyset:
+    """Página de resultados iterable, con enlaces (querystrings) a la siguiente y la anterior"""
+
+    def __init__(self, objetos, tiene_siguiente, tiene_anterior, cursor_siguiente, cursor_anterior,
+                 parametros, total=None, total_exacto=True):
+        self.objetos = objetos
+        self.tiene_siguiente = tiene_siguiente
+        self.tiene_anterior = tiene_anterior
+        self.total = total
+        self.total_exacto = total_exacto
+
+        base = {k: v for k, v in parametros.items() if k not in ('despues', 'antes', 'page')}
+        self.parametros_siguiente = urlencode({**base, 'despues': cursor_siguiente}) if tiene_siguiente else ''
+        self.parametros_anterior = urlencode({**base, 'antes': cursor_anterior}) if tiene_anterior else ''
+        self.parametros_primera = urlencode(base)
+
+    def __iter__(self):
+        return iter(self.objetos)
+
+    def __len__(self):
+        return len(self.objetos)
+
+    def __bool__(self):
+        return bool(self.objetos)
+
+    def __getitem__(self, indice):
+        return self.objetos[indice]
+
+    @property
+    def es_paginada(self):
+        return self.tiene_siguiente or self.tiene_anterior
+
+
+def paginar_keyset(queryset, orden, parametros, por_pagina=POR_PAGINA, contar=False):
+    """
+    Página de `queryset` según los cursores 'despues' / 'antes' de `parametros` (request.GET).
+
+    Args:
+        orden (tuple): Campos del orden, ej. ('-fecha_creacion', '-id'); el último debe ser único
+        contar (bool): Agrega total aproximado (ver contar_aproximado)
+    """
+    campos = _campos(queryset.model, orden)
+    despues = parametros.get('despues')
+    antes = parametros.get('antes')
+    valores_despues = decodificar_cursor(despues, campos) if despues else None
+    valores_antes = decodificar_cursor(antes, campos) if antes and not valores_despues else None
+
+    if valores_antes:
+        # Página anterior: se recorre en orden inverso y se da vuelta el resultado
+        invertido = [e[1:] if e.startswith('-') else f'-{e}' for e in orden]
+        filas = list(queryset.filter(filtro_despues_de(campos, valores_antes, invertir=True))
+                     .order_by(*invertido)[:por_pagina + 1])
+        tiene_anterior = len(filas) > por_pagina
+        objetos = list(reversed(filas[:por_pagina]))
+        tiene_siguiente = True
+    else:
+        consulta = queryset.order_by(*orden)
+        if valores_despues:
+            consulta = consulta.filter(filtro_despues_de(campos, valores_despues))
+        filas = list(consulta[:por_pagina + 1])
+        tiene_siguiente = len(filas) > por_pagina
+        objetos = filas[:por_pagina]
+        tiene_anterior = bool(valores_despues)
+
+    total, total_exacto = contar_aproximado(queryset) if contar else (None, True)
+    return PaginaKeyset(
+        objetos,
+        tiene_siguiente=tiene_siguiente and bool(objetos),
+        tiene_anterior=tiene_anterior and bool(objetos),
+        cursor_siguiente=codificar_cursor(objetos[-1], campos) if objetos else None,
+        cursor_anterior=codificar_cursor(objetos[0], campos) if objetos else None,
+        parametros=parametros,
+        total=total,
+        total_exacto=total_exacto,
+    )
+
+
+# ============================================
+# FILTROS DESDE LA URL
+# ============================================
+
+def opciones(choices):
+    """{valor: valor} de los choices de un campo, para filtros_desde_parametros"""
+    return {valor: valor for valor, _ in choices}
+
+
+ACTIVO = {'1': True, '0': False}
+
+
+def filtros_desde_parametros(parametros, filtros):
+    """
+    Filtros de un listado tomados de `parametros` (request.GET); los valores no
+    permitidos se ignoran, así un parámetro manipulado no llega a la consulta.
+
+    Args:
+        filtros (dict): {parametro: (lookup, {texto: valor permitido}, texto por defecto)}
+            ej. {'activo': ('activo', ACTIVO, '1'), 'prevision': ('Previcion', opciones(...), None)}
+
+    Returns:
+        tuple: ({lookup: valor} para .filter(), {parametro: texto} aplicados para el template)
+    """
+    lookups, aplicados = {}, {}
+    for parametro, (lookup, permitidos, defecto) in filtros.items():
+        texto = parametros.get(parametro, defecto)
+        if texto in permitidos:
+            lookups[lookup] = permitidos[texto]
+            aplicados[parametro] = texto
+    return lookups, aplicados
@@ -1,6 +1,55 @@
-import re
+"""
+Validación y normalización de RUT chileno (único módulo: utilidad.validators
+solo reexporta estas funciones).
+
+- validar_rut() / validar_rut_chileno(): un valor, lanza ValidationError.
+- validar_ruts(): lotes completos (cargas masivas), sin excepciones; devuelve
+  el RUT normalizado y un código de error por fila.
+
+El dígito verificador se calcula con tablas de sumas ponderadas precalculadas
+para bloques de 4 dígitos: dos búsquedas por RUT en vez de un bucle por carácter.
+"""
+from functools import cache
+from typing import NamedTuple
+
 from django.core.exceptions import ValidationError
 
+
+# ============================================
+# CÓDIGOS DE ERROR (validar_ruts)
+# ============================================
+RUT_VACIO = 'vacio'
+RUT_FORMATO = 'formato'
+RUT_DV = 'dv'
+RUT_DUPLICADO = 'duplicado'
+
+MENSAJES_ERROR_RUT = {
+    RUT_VACIO: "RUT vacío.",
+    RUT_FORMATO: "Formato RUT inválido. Ej: 12345678-9",
+    RUT_DV: "Dígito verificador incorrecto.",
+    RUT_DUPLICADO: "RUT repetido en el lote.",
+}
+
+# Dígito verificador según suma ponderada % 11
+_DV_POR_RESTO = tuple("0" if 11 - r == 11 else "K" if 11 - r == 10 else str(11 - r) for r in range(11))
+
+
+@cache
+def _tablas():
+    """
+    Sumas ponderadas (módulo 11) de cada bloque '0000'..'9999':
+    bloque bajo = 4 últimos dígitos del cuerpo (pesos 5,4,3,2),
+    bloque alto = 4 primeros de un cuerpo de 8 (pesos 3,2,7,6).
+    """
+    baja, alta = {}, {}
+    for n in range(10000):
+        bloque = f"{n:04d}"
+        d = [ord(c) - 48 for c in bloque]
+        baja[bloque] = d[0] * 5 + d[1] * 4 + d[2] * 3 + d[3] * 2
+        alta[bloque] = d[0] * 3 + d[1] * 2 + d[2] * 7 + d[3] * 6
+    return baja, alta
+
+
 def normalizar_rut(rut: str) -> str:
     """
     Limpia puntos y espacios, pasa a mayúsculas.
@@ -8,22 +57,17 @@ def normalizar_rut(rut: str) -> str:
     """
     return rut.replace(".", "").replace(" ", "").upper()
 
-def _validar_rut(value: str) -> str:
+
+def calcular_dv(cuerpo: str) -> str:
     """
-    Función interna que valida el RUT chileno (formato y dígito verificador).
-    Lanza ValidationError si no es válido.
-    Retorna el RUT normalizado.
+    Calcula el dígito verificador (módulo 11) del cuerpo de un RUT.
+    Ej: '16293109' -> '1'
     """
-    rut = normalizar_rut(value)
-
-    # Validar formato: 7 u 8 dígitos + guion + dígito verificador
-    if not re.match(r"^\d{7,8}-[\dkK]$", rut):
-        raise ValidationError("Formato RUT inválido. Ej: 12345678-9")
-
-    cuerpo, dv = rut.split("-")
-    dv = dv.upper()
+    if len(cuerpo) <= 8:
+        baja, alta = _tablas()
+        cuerpo = cuerpo.rjust(8, "0")
+        return _DV_POR_RESTO[(baja[cuerpo[4:]] + alta[cuerpo[:4]]) % 11]
 
-    # Calcular dígito verificador
     suma = 0
     multiplicador = 2
     for c in reversed(cuerpo):
@@ -33,13 +77,85 @@ def _validar_rut(value: str) -> str:
             multiplicador = 2
 
     res = 11 - (suma % 11)
-    dv_calc = "0" if res == 11 else "K" if res == 10 else str(res)
+    return "0" if res == 11 else "K" if res == 10 else str(res)
 
-    if dv != dv_calc:
-        raise ValidationError("Dígito verificador incorrecto.")
 
+def _error_rut(rut, baja, alta):
+    """Código de error de un RUT ya normalizado, o None si es válido"""
+    # Formato: 7 u 8 dígitos + guion + dígito verificador
+    cuerpo, guion, dv = rut.rpartition("-")
+    if (not guion or len(dv) != 1 or dv not in "0123456789K"
+            or not 7 <= len(cuerpo) <= 8 or not (cuerpo.isascii() and cuerpo.isdigit())):
+        return RUT_FORMATO
+    if len(cuerpo) == 7:
+        cuerpo = "0" + cuerpo
+    if _DV_POR_RESTO[(baja[cuerpo[4:]] + alta[cuerpo[:4]]) % 11] != dv:
+        return RUT_DV
+    return None
+
+
+def _validar_rut(value: str) -> str:
+    """
+    Función interna que valida el RUT chileno (formato y dígito verificador).
+    Lanza ValidationError si no es válido.
+    Retorna el RUT normalizado.
+    """
+    rut = normalizar_rut(value)
+    error = _error_rut(rut, *_tablas())
+    if error:
+        raise ValidationError(MENSAJES_ERROR_RUT[error])
     return rut
 
 # Alias público para mantener compatibilidad
 validar_rut = _validar_rut
 validar_rut_chileno = _validar_rut
+
+
+# ============================================
+# VALIDACIÓN POR LOTES
+# ============================================
+class ResultadoRuts(NamedTuple):
+    """Resultado de validar_ruts(), una posición por valor de entrada"""
+    ruts: list      # RUT normalizado, o None si la fila tiene error
+    errores: list   # Código de error (RUT_*), o None si es válido
+
+    def validos(self):
+        """RUT normalizados válidos, en orden"""
+        return [rut for rut in self.ruts if rut is not None]
+
+    def mensaje(self, indice):
+        """Mensaje legible del error de la fila `indice` (None si es válida)"""
+        error = self.errores[indice]
+        return MENSAJES_ERROR_RUT[error] if error else None
+
+
+def validar_ruts(valores, detectar_duplicados=False) -> ResultadoRuts:
+    """
+    Valida y normaliza un lote de RUT en una sola pasada, sin lanzar excepciones.
+
+    Args:
+        valores (iterable): RUT en cualquier formato ('12.345.678-k', '12345678-K'...);
+            None / '' se reportan como RUT_VACIO
+        detectar_duplicados (bool): Marca RUT_DUPLICADO en cada repetición
+            (ya normalizada) de un RUT válido; la primera aparición queda válida
+
+    Returns:
+        ResultadoRuts: listas paralelas `ruts` y `errores`
+    """
+    baja, alta = _tablas()
+    vistos = set()
+    ruts, errores = [], []
+    for valor in valores:
+        rut = normalizar_rut(valor if isinstance(valor, str) else str(valor)) if valor is not None else ""
+        if not rut:
+            error = RUT_VACIO
+        else:
+            error = _error_rut(rut, baja, alta)
+            if error is None and detectar_duplicados:
+                if rut in vistos:
+                    error = RUT_DUPLICADO
+                else:
+                    vistos.add(rut)
+        ruts.append(None if error else rut)
+        errores.append(error)
+    return ResultadoRuts(ruts, errores)